@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import bisect
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+LOW_STOCK_QTY = 5
+EXPIRY_DAYS = 3
+DROP_PCT = 8.0
+CRITICAL_DROP_PCT = 20.0
+HISTORY_DAYS = 14  # daily totals the week-over-week drop compares
+
+
+@dataclass(frozen=True)
+class Alert:
+    kind: str  # "low_stock" | "expiry" | "sales_drop"
+    severity: str  # "warning" | "critical"
+    message: str
+    skus: Tuple[str, ...] = field(default_factory=tuple)
+
+
+def weekly_drop_pct(daily_revenue: Sequence[float]) -> float | None:
+    """Percent drop of the last 7 values vs the 7 before (chronological input)."""
+    values = np.asarray(daily_revenue, dtype=float)
+    last_7 = values[-7:]
+    prev_7 = values[-14:][:7]
+    if last_7.size == 0 or prev_7.size == 0:
+        return None
+    prev_avg = prev_7.mean()
+    if prev_avg == 0:
+        return None
+    return float((1 - last_7.mean() / prev_avg) * 100)
+
+
+def low_stock_alert(skus: Sequence[str], names: Sequence[str], qtys: Sequence[int]) -> Alert | None:
+    if len(skus) == 0:
+        return None
+    items = ", ".join(f"{name} ({int(qty)})" for name, qty in zip(names, qtys))
+    severity = "critical" if min(qtys) <= 0 else "warning"
+    return Alert("low_stock", severity, f"Low stock: {items}", tuple(skus))
+
+
+def expiry_alert(skus: Sequence[str], names: Sequence[str], days: Sequence[int]) -> Alert | None:
+    if len(skus) == 0:
+        return None
+    items = "; ".join(f"{name} in {int(d)}d" for name, d in zip(names, days))
+    severity = "critical" if min(days) <= 0 else "warning"
+    return Alert("expiry", severity, f"Expiry soon: {items}", tuple(skus))
+
+
+def sales_drop_alert(drop_pct: float | None) -> Alert | None:
+    if drop_pct is None or drop_pct <= DROP_PCT:
+        return None
+    severity = "critical" if drop_pct > CRITICAL_DROP_PCT else "warning"
+    return Alert("sales_drop", severity, f"Sales dropped {drop_pct:.1f}% vs previous week")
+
+
+def evaluate(inventory: pd.DataFrame, sales: pd.DataFrame, today: pd.Timestamp | None = None) -> List[Alert]:
+    """Stateless, vectorized alert pass over full inventory and sales frames."""
+    today = pd.Timestamp.today().normalize() if today is None else today
+    qty = inventory["qty"].to_numpy()
+    low = qty <= LOW_STOCK_QTY
+    days = (pd.to_datetime(inventory["expiry"]) - today).dt.days.to_numpy()
+    near = days <= EXPIRY_DAYS
+    revenue = sales.sort_values("date")["revenue"].to_numpy()
+    found = [
+        low_stock_alert(inventory["sku"].to_numpy()[low], inventory["name"].to_numpy()[low], qty[low]),
+        expiry_alert(inventory["sku"].to_numpy()[near], inventory["name"].to_numpy()[near], days[near]),
+        sales_drop_alert(weekly_drop_pct(revenue)),
+    ]
+    return [a for a in found if a is not None]
+
+
+class AlertEngine:
+    """Alert state kept up to date from batches of stock and sales changes.
+
+    Holds per-SKU quantity, a low-stock set, an expiry index sorted by date and daily
+    revenue totals for the last ``HISTORY_DAYS`` days with sales, so each ``apply_*``
+    call costs O(batch) (plus O(log n) index updates) and ``alerts()`` costs
+    O(alerts), independent of table size. Updates and queries may come from different
+    threads (a ledger notifies on the thread that records).
+    """
+
+    def __init__(self, low_stock_qty: int = LOW_STOCK_QTY, expiry_days: int = EXPIRY_DAYS):
+        self.low_stock_qty = low_stock_qty
+        self.expiry_days = expiry_days
+        self._items: Dict[str, list] = {}  # sku -> [position, name, qty, expiry day ordinal | None]
+        self._low: Dict[str, None] = {}
+        self._by_expiry: List[Tuple[int, int, str]] = []  # sorted (expiry ordinal, position, sku)
+        self._daily: Dict[int, float] = {}
+        self._days: List[int] = []  # sorted day ordinals present in _daily
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_frames(cls, inventory: pd.DataFrame, sales: pd.DataFrame, **kwargs) -> "AlertEngine":
+        engine = cls(**kwargs)
+        engine.upsert_items(inventory)
+        engine.apply_sales(sales)
+        return engine
+
+    # Updates
+
+    def upsert_items(self, inventory: pd.DataFrame) -> None:
+        """Add or replace SKUs (``sku``, ``name``, ``qty``, ``expiry`` columns)."""
+        expiry = pd.to_datetime(inventory["expiry"])
+        with self._lock:
+            for sku, name, qty, exp in zip(inventory["sku"], inventory["name"], inventory["qty"], expiry):
+                self._set_item(sku, name, int(qty), None if pd.isna(exp) else exp.toordinal())
+
+    def apply_stock(self, movements: pd.DataFrame) -> None:
+        """Apply signed quantity changes (``sku``, ``delta`` columns) to known SKUs."""
+        totals = movements.groupby("sku", sort=False, observed=True)["delta"].sum()
+        with self._lock:
+            for sku, delta in totals.items():
+                item = self._items.get(sku)
+                if item is None:
+                    raise KeyError(f"Unknown SKU {sku!r}; add it with upsert_items first")
+                self._set_qty(sku, item, item[2] + int(delta))
+
+    def track(self, ledger) -> None:
+        """Follow a ``ledger.StockLedger``: each movement updates that SKU's qty and expiry."""
+        ledger.subscribe(self._on_stock)
+
+    def untrack(self, ledger) -> None:
+        ledger.unsubscribe(self._on_stock)
+
+    def _on_stock(self, sku: str, qty: int, expiry: int | None) -> None:
+        with self._lock:
+            item = self._items.get(sku)
+            if item is not None:
+                self._set_item(sku, item[1], qty, expiry)
+
+    @property
+    def last_day(self) -> pd.Timestamp | None:
+        """The latest day with sales, which may still have been open when it was applied."""
+        return pd.Timestamp.fromordinal(self._days[-1]) if self._days else None
+
+    def apply_sales(self, sales: pd.DataFrame, replace: bool = False) -> None:
+        """Add a batch of sales (``date``, ``revenue``) to the daily revenue totals.
+
+        With ``replace`` the days present in ``sales`` are set from it rather than added
+        to, so re-reading a day that was still open is safe. Only the latest
+        ``HISTORY_DAYS`` days are kept.
+        """
+        if sales.empty:
+            return
+        days = pd.to_datetime(sales["date"]).dt.normalize()
+        totals = sales["revenue"].groupby(days.to_numpy()).sum()
+        with self._lock:
+            for day, revenue in totals.items():
+                ordinal = pd.Timestamp(day).toordinal()
+                if ordinal not in self._daily:
+                    self._daily[ordinal] = 0.0
+                    if not self._days or ordinal > self._days[-1]:
+                        self._days.append(ordinal)
+                    else:
+                        bisect.insort(self._days, ordinal)
+                elif replace:
+                    self._daily[ordinal] = 0.0
+                self._daily[ordinal] += float(revenue)
+            self._prune()
+
+    def _prune(self) -> None:
+        if len(self._days) > HISTORY_DAYS:
+            for day in self._days[:-HISTORY_DAYS]:
+                del self._daily[day]
+            del self._days[:-HISTORY_DAYS]
+
+    def _set_item(self, sku: str, name: str, qty: int, expiry: int | None) -> None:
+        item = self._items.get(sku)
+        if item is None:
+            item = [len(self._items), name, qty, None]
+            self._items[sku] = item
+        item[1] = name
+        if item[3] != expiry:
+            if item[3] is not None:
+                del self._by_expiry[bisect.bisect_left(self._by_expiry, (item[3], item[0], sku))]
+            if expiry is not None:
+                bisect.insort(self._by_expiry, (expiry, item[0], sku))
+            item[3] = expiry
+        self._set_qty(sku, item, qty)
+
+    def _set_qty(self, sku: str, item: list, qty: int) -> None:
+        item[2] = qty
+        if qty <= self.low_stock_qty:
+            self._low[sku] = None
+        else:
+            self._low.pop(sku, None)
+
+    # Queries
+
+    def alerts(self, today: pd.Timestamp | None = None) -> List[Alert]:
+        today = pd.Timestamp.today().normalize() if today is None else today
+        today_ord = today.toordinal()
+
+        with self._lock:
+            low = sorted(self._low, key=lambda s: self._items[s][0])
+            cutoff = bisect.bisect_right(self._by_expiry, (today_ord + self.expiry_days, float("inf"), ""))
+            near = sorted(self._by_expiry[:cutoff], key=lambda e: e[1])
+            recent = [self._daily[d] for d in self._days]
+            low_items = [(self._items[s][1], self._items[s][2]) for s in low]
+            near_names = [self._items[s][1] for _, _, s in near]
+        found = [
+            low_stock_alert(low, [name for name, _ in low_items], [qty for _, qty in low_items]),
+            expiry_alert([s for _, _, s in near], near_names, [e - today_ord for e, _, _ in near]),
+            sales_drop_alert(weekly_drop_pct(recent)),
+        ]
+        return [a for a in found if a is not None]
+
+    # Persistence
+
+    def save(self, path: str) -> None:
+        with self._lock:
+            self._save(path)
+
+    def _save(self, path: str) -> None:
+        state = {
+            "low_stock_qty": self.low_stock_qty,
+            "expiry_days": self.expiry_days,
+            "items": self._items,
+            "daily": {str(d): v for d, v in self._daily.items()},
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+
+    @classmethod
+    def load(cls, path: str) -> "AlertEngine":
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        engine = cls(state["low_stock_qty"], state["expiry_days"])
+        for sku, (_, name, qty, expiry) in sorted(state["items"].items(), key=lambda kv: kv[1][0]):
+            engine._set_item(sku, name, qty, expiry)
+        engine._daily = {int(d): v for d, v in state["daily"].items()}
+        engine._days = sorted(engine._daily)
+        engine._prune()
+        return engine
+
+
+def alert_messages(alerts: Iterable[Alert]) -> List[str]:
+    messages = [a.message for a in alerts]
+    return messages or ["No active alerts"]
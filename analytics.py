@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable, Dict, List, Sequence
+import numpy as np
+import pandas as pd
+
+from perf import timed
+from utils import WEEKDAY_ORDER
+
+OTHER = "Other"  # category for SKUs missing from the catalogue
+
+
+class SalesCube:
+    """Sales aggregated to (day x SKU) and (day x hour x category) cells.
+
+    Queries for any trailing window (by weekday, hour, ISO week, category or SKU) read
+    only the cells in the window, so their cost depends on catalogue size and window
+    length, never on the number of sales lines. ``update`` folds in new lines as days
+    close; it and the queries may run on different threads. With ``max_days`` only the
+    latest ``max_days`` days are kept, older days dropping off the front as it slides.
+    """
+
+    def __init__(self, catalogue: pd.DataFrame, max_days: int | None = None):
+        # catalogue: ``sku`` and ``category`` columns (e.g. the inventory)
+        if max_days is not None and max_days < 1:
+            raise ValueError(f"max_days must be at least 1, got {max_days}")
+        self.max_days = max_days
+        self._lock = threading.RLock()
+        self.skus: List[str] = []
+        self.categories: List[str] = []
+        self._sku_pos: Dict[str, int] = {}
+        self._cat_pos: Dict[str, int] = {}
+        self._sku_cat = np.zeros(0, dtype=np.int64)
+        self._category_of = dict(zip(catalogue["sku"].astype(str), catalogue["category"].astype(object).fillna(OTHER).astype(str)))
+        self._add_skus(list(self._category_of))
+        self.start: pd.Timestamp | None = None
+        self.n_days = 0
+        self.has_hours = False  # daily-grain sources leave every line at hour 0
+        self._revenue = np.zeros((0, len(self.skus)))
+        self._units = np.zeros((0, len(self.skus)))
+        self._hourly = np.zeros((0, 24, len(self.categories)))
+
+    @property
+    def last_day(self) -> pd.Timestamp | None:
+        return None if self.start is None else self.start + pd.Timedelta(days=self.n_days - 1)
+
+    def _add_skus(self, skus: Sequence[str]) -> None:
+        new = [s for s in dict.fromkeys(skus) if s not in self._sku_pos]
+        for sku in new:
+            category = self._category_of.get(sku, OTHER)
+            if category not in self._cat_pos:
+                self._cat_pos[category] = len(self.categories)
+                self.categories.append(category)
+            self._sku_pos[sku] = len(self.skus)
+            self.skus.append(sku)
+        if new:
+            self._sku_cat = np.array([self._cat_pos[self._category_of.get(s, OTHER)] for s in self.skus])
+
+    def _resize(self, first_day: pd.Timestamp, n_days: int) -> None:
+        # Room for n_days from first_day and the current SKU/category lists; cells kept,
+        # except days before first_day when the cube slides forward
+        shift = 0 if self.start is None else (self.start - first_day).days
+        old_skus = self._revenue.shape[1]
+        drop = max(-shift, 0)
+        kept = max(min(self.n_days - drop, n_days - shift - drop), 0)
+        src, dst = slice(drop, drop + kept), slice(shift + drop, shift + drop + kept)
+        revenue = np.zeros((n_days, len(self.skus)))
+        units = np.zeros_like(revenue)
+        hourly = np.zeros((n_days, 24, len(self.categories)))
+        revenue[dst, :old_skus] = self._revenue[src]
+        units[dst, :old_skus] = self._units[src]
+        hourly[dst, :, : self._hourly.shape[2]] = self._hourly[src]
+        self._revenue, self._units, self._hourly = revenue, units, hourly
+        self.start = first_day
+
+    @timed("analytics.SalesCube.update")
+    def update(self, lines: pd.DataFrame, replace: bool = True) -> None:
+        """Add ``date``, ``sku``, ``units``, ``revenue`` lines (``date`` may carry the hour).
+
+        With ``replace`` the days present in ``lines`` are rebuilt from them rather than
+        added to, so re-reading a day that was still open is safe. Lines older than the
+        ``max_days`` window are ignored.
+        """
+        if lines.empty:
+            return
+        stamps = pd.to_datetime(lines["date"])
+        days = stamps.dt.normalize()
+        with self._lock:
+            first = days.min() if self.start is None else min(days.min(), self.start)
+            last = days.max() if self.last_day is None else max(days.max(), self.last_day)
+            if self.max_days is not None and (last - first).days >= self.max_days:
+                first = last - pd.Timedelta(days=self.max_days - 1)
+                recent = (days >= first).to_numpy()
+                if not recent.any():
+                    return
+                lines, stamps, days = lines[recent], stamps[recent], days[recent]
+            skus = lines["sku"].astype(str)
+            self._add_skus(skus.unique().tolist())
+            n_days = (last - first).days + 1
+            capacity = len(self._revenue)
+            if n_days > capacity:
+                capacity = max(n_days, 2 * capacity)  # geometric growth: daily appends stay cheap
+                if self.max_days is not None:
+                    capacity = min(capacity, self.max_days)
+            grown = len(self.skus) > self._revenue.shape[1] or len(self.categories) > self._hourly.shape[2]
+            if first != self.start or capacity != len(self._revenue) or grown:
+                self._resize(first, capacity)
+            self.n_days = n_days
+
+            day = (days - self.start).dt.days.to_numpy()
+            lo, hi = int(day.min()), int(day.max()) + 1
+            local = day - lo
+            sku = skus.map(self._sku_pos).to_numpy(dtype=np.int64)
+            hour = stamps.dt.hour.to_numpy()
+            self.has_hours = self.has_hours or bool(hour.any())
+            n_skus, n_cats = len(self.skus), len(self.categories)
+            revenue = lines["revenue"].to_numpy(dtype=float)
+            cells = local * n_skus + sku
+            block_revenue = np.bincount(cells, weights=revenue, minlength=(hi - lo) * n_skus).reshape(hi - lo, n_skus)
+            block_units = np.bincount(cells, weights=lines["units"].to_numpy(dtype=float), minlength=(hi - lo) * n_skus)
+            hourly_cells = (local * 24 + hour) * n_cats + self._sku_cat[sku]
+            block_hourly = np.bincount(hourly_cells, weights=revenue, minlength=(hi - lo) * 24 * n_cats).reshape(hi - lo, 24, n_cats)
+            if replace:
+                touched = np.zeros(hi - lo, dtype=bool)
+                touched[local] = True
+                rows = np.flatnonzero(touched) + lo
+                self._revenue[rows, :n_skus] = 0
+                self._units[rows, :n_skus] = 0
+                self._hourly[rows] = 0
+            self._revenue[lo:hi, :n_skus] += block_revenue
+            self._units[lo:hi, :n_skus] += block_units.reshape(hi - lo, n_skus)
+            self._hourly[lo:hi, :, :n_cats] += block_hourly
+
+    # Queries over the trailing ``days`` (all history when None)
+
+    def _window(self, days: int | None) -> slice:
+        days = self.n_days if days is None else min(days, self.n_days)
+        return slice(self.n_days - days, self.n_days)
+
+    def _dates(self, window: slice) -> pd.DatetimeIndex:
+        return pd.date_range(self.start + pd.Timedelta(days=window.start), periods=window.stop - window.start, freq="D")
+
+    def _category(self, category: str) -> int:
+        if category not in self._cat_pos:
+            raise ValueError(f"Unknown category {category!r}; choose from {self.categories}")
+        return self._cat_pos[category]
+
+    def _columns(self, category: str | None, sku: str | None) -> np.ndarray:
+        if sku is not None:
+            if sku not in self._sku_pos:
+                raise ValueError(f"Unknown SKU {sku!r}")
+            return np.array([self._sku_pos[sku]])
+        if category is not None:
+            return np.flatnonzero(self._sku_cat == self._category(category))
+        return np.arange(len(self.skus))
+
+    def daily(self, days: int | None = None, category: str | None = None, sku: str | None = None) -> pd.DataFrame:
+        """Revenue and units per day for the chain, one category or one SKU."""
+        with self._lock:
+            if self.start is None:
+                return pd.DataFrame({"date": pd.DatetimeIndex([]), "revenue": [], "units": []})
+            window = self._window(days)
+            cols = self._columns(category, sku)
+            revenue = self._revenue[window][:, cols].sum(axis=1)
+            units = self._units[window][:, cols].sum(axis=1)
+            return pd.DataFrame({"date": self._dates(window), "revenue": revenue, "units": units})
+
+    def by_weekday(self, days: int | None = None, category: str | None = None, sku: str | None = None) -> pd.DataFrame:
+        """Average daily revenue and units per weekday, Monday first (days without sales count)."""
+        daily = self.daily(days, category, sku)
+        weekday = pd.Categorical(daily["date"].dt.day_name(), categories=WEEKDAY_ORDER, ordered=True)
+        return daily.assign(weekday=weekday).groupby("weekday", as_index=False, observed=False)[["revenue", "units"]].mean()
+
+    def by_week(self, days: int | None = None, category: str | None = None, sku: str | None = None) -> pd.DataFrame:
+        """Revenue and units per ISO week (``week`` is the Monday it starts on)."""
+        daily = self.daily(days, category, sku)
+        week = daily["date"] - pd.to_timedelta(daily["date"].dt.weekday, unit="D")
+        out = daily.assign(week=week).groupby("week", as_index=False)[["revenue", "units"]].sum()
+        return out.assign(week_of_year=out["week"].dt.isocalendar().week.to_numpy())
+
+    def by_hour(self, days: int | None = None, category: str | None = None) -> pd.DataFrame:
+        """Average revenue per hour of day (needs hourly lines; see ``has_hours``)."""
+        with self._lock:
+            window = self._window(days)
+            cats = slice(None) if category is None else [self._category(category)]
+            hourly = self._hourly[window][:, :, cats].sum(axis=2)
+            n = max(window.stop - window.start, 1)
+            return pd.DataFrame({"hour": np.arange(24), "revenue": hourly.sum(axis=0) / n})
+
+    def by_category(self, days: int | None = None) -> pd.DataFrame:
+        """Revenue, units and revenue share per category, largest first."""
+        skus = self.by_sku(days)
+        out = skus.groupby("category", as_index=False)[["revenue", "units"]].sum()
+        total = out["revenue"].sum()
+        out["share"] = out["revenue"] / total if total else 0.0
+        return out.sort_values("revenue", ascending=False, ignore_index=True)
+
+    def by_sku(self, days: int | None = None, category: str | None = None) -> pd.DataFrame:
+        """Revenue and units per SKU (optionally within one category), largest first."""
+        with self._lock:
+            window = self._window(days)
+            cols = self._columns(category, None)
+            out = pd.DataFrame(
+                {
+                    "sku": np.array(self.skus, dtype=object)[cols],
+                    "category": np.array(self.categories, dtype=object)[self._sku_cat[cols]],
+                    "revenue": self._revenue[window][:, cols].sum(axis=0),
+                    "units": self._units[window][:, cols].sum(axis=0),
+                }
+            )
+        return out.sort_values("revenue", ascending=False, ignore_index=True)
+
+
+class CubeRefresher:
+    """Fold newly closed days into a ``SalesCube`` from a daemon thread.
+
+    Every ``interval`` seconds ``fetch(since)`` is asked for the lines from the cube's
+    last day on (``since`` is None for a cube that is still empty); that day is rebuilt,
+    as it may have been read before it closed, and later days are appended.
+    """
+
+    def __init__(self, cube: SalesCube, fetch: Callable[[pd.Timestamp | None], pd.DataFrame], interval: float = 300):
+        self.cube = cube
+        self.fetch = fetch
+        self.interval = interval
+        self.error: Exception | None = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sales-cube-refresh", daemon=True)
+
+    def refresh(self) -> None:
+        self.cube.update(self.fetch(self.cube.last_day), replace=True)
+
+    def start(self) -> "CubeRefresher":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+                self.error = None
+            except Exception as exc:  # keep serving the last good cube; retry next interval
+                self.error = exc
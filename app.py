@@ -1,24 +1,29 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
 
-from data import (
-    get_sales_by_day,
+from loaders import (
+    branch_sales,
+    kpi_cube,
     get_top_sellers,
-    get_inventory,
     get_suppliers,
-    get_expenses,
     get_orders,
+    query_inventory,
+    kpis as load_kpis,
+    forecast,
+    alerts,
+    pricing,
 )
-from utils import (
-    compute_kpis,
-    simple_forecast_next_7_days,
-    build_alerts,
-    dynamic_pricing_recommendations,
-    apply_brand_theme,
-)
+from charts import prepare_series, scatter_trace, top_n_with_other, RESAMPLE_FREQS
+from cache import cached
+from export import frame_chunks
+from perf import timed
+from ui import apply_brand_theme, begin_profile, debug_panel, export_button, fragment, paged, shillings, show_chart, show_dataframe
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 
 st.set_page_config(
@@ -49,11 +54,22 @@ st.markdown(
 )
 
 
-def sales_chart(actual: pd.DataFrame, forecast: pd.DataFrame) -> go.Figure:
+@timed("app.sales_chart")
+def sales_chart(actual: pd.DataFrame, forecast: pd.DataFrame, granularity: str = "Auto") -> go.Figure:
+    import plotly.graph_objects as go
+
+    # Aggregate/downsample server-side so the payload stays bounded however long the history.
+    # Weeks and months show the average day, on the same scale as the daily forecast.
+    actual = prepare_series(actual, "date", "revenue", granularity, how="mean")
+    label = "Avg daily revenue" if granularity in ("Week", "Month") else "Revenue"
     fig = go.Figure()
     fig.add_trace(
-        go.Scatter(
-            x=actual["date"], y=actual["revenue"], name="Revenue", mode="lines+markers", line=dict(color="#0f766e")
+        scatter_trace(
+            actual["date"],
+            actual["revenue"],
+            name=label,
+            mode="lines+markers" if len(actual) <= 120 else "lines",
+            line=dict(color="#0f766e"),
         )
     )
     fig.add_trace(
@@ -61,12 +77,28 @@ def sales_chart(actual: pd.DataFrame, forecast: pd.DataFrame) -> go.Figure:
             x=forecast["date"], y=forecast["predicted"], name="Predicted (7d)", mode="lines", line=dict(dash="dash", color="#6b7280")
         )
     )
-    fig.update_layout(height=320, margin=dict(l=10, r=10, t=10, b=10))
+    if "upper" in forecast:
+        fig.add_trace(
+            go.Scatter(
+                x=list(forecast["date"]) + list(forecast["date"][::-1]),
+                y=list(forecast["upper"]) + list(forecast["lower"][::-1]),
+                name="90% interval",
+                fill="toself",
+                fillcolor="rgba(107,114,128,0.15)",
+                line=dict(width=0),
+                hoverinfo="skip",
+            )
+        )
+    fig.update_layout(height=320, margin=dict(l=10, r=10, t=10, b=10), yaxis_title=label)
     return fig
 
 
+@timed("app.top_sellers_bar")
 def top_sellers_bar(df: pd.DataFrame) -> go.Figure:
+    import plotly.graph_objects as go
+
     fig = go.Figure()
+    df = top_n_with_other(df, "name", "sold")
     fig.add_bar(x=df["name"], y=df["sold"], marker_color="#0f766e")
     fig.update_layout(height=300, margin=dict(l=10, r=10, t=10, b=10), yaxis_title="Units Sold")
     return fig
@@ -100,77 +132,112 @@ def inventory_table(df: pd.DataFrame) -> pd.io.formats.style.Styler:
     return display.style
 
 
-def main():
-    st.sidebar.title("Baraka Supermarket")
-    st.sidebar.caption("Investor Demo – Streamlit")
-    # Global controls
-    days_window = st.sidebar.slider("Days window", min_value=7, max_value=90, value=30, step=1)
-    currency_symbol = st.sidebar.selectbox("Currency", ["KSh", "$", "€", "£"], index=0)
+@cached(ttl=600)
+def sales_figure(days_window: int, scope: str, granularity: str) -> go.Figure:
+    # Shared figures are only read by st.plotly_chart, never mutated
+    actual = shillings(branch_sales(days_window, scope), ["revenue"])
+    return sales_chart(actual, shillings(forecast(days_window, scope), ["predicted", "lower", "upper"]), granularity)
 
-    # Load data
-    sales = get_sales_by_day(days_window)
-    top = get_top_sellers()
-    inv = get_inventory()
-    sups = get_suppliers()
-    exps = get_expenses()
-    ords = get_orders()
-
-    # KPIs
-    kpis = compute_kpis(sales, exps)
-    c1, c2, c3 = st.columns([1, 1, 1], gap="small")
+
+# Each section reruns on its own when one of its widgets changes; its data comes from the
+# cached loaders, so a section only recomputes what its own inputs invalidate.
+
+
+@fragment("Dashboard", "overview")
+def overview() -> None:
+    """Window/branch/currency controls with the KPIs, sales chart and branch rollups."""
+    cube = kpi_cube()
+    c1, c2, c3, c4 = st.columns([2, 1, 1, 1], gap="small")
     with c1:
-        with st.container(border=True):
-            st.metric(f"Revenue ({days_window} days)", f"{currency_symbol} {kpis['revenue']:,.0f}")
+        days_window = st.slider("Days window", min_value=7, max_value=90, value=30, step=1)
     with c2:
-        with st.container(border=True):
-            st.metric("Expenses", f"{currency_symbol} {kpis['expenses']:,.0f}")
+        scope = st.selectbox("Branch / region", cube.scopes(), index=0)
     with c3:
+        currency_symbol = st.selectbox("Currency", ["KSh", "$", "€", "£"], index=0)
+    with c4:
+        granularity = st.selectbox("Chart granularity", ["Auto"] + list(RESAMPLE_FREQS), index=0)
+
+    # KPIs: range sums over the cube, so only the formatting is redone on a currency change
+    kpis = load_kpis(days_window, scope)
+    k1, k2, k3 = st.columns([1, 1, 1], gap="small")
+    with k1:
+        with st.container(border=True):
+            st.metric(f"Revenue ({days_window} days)", f"{currency_symbol} {shillings(kpis['revenue']):,.0f}")
+    with k2:
+        with st.container(border=True):
+            st.metric("Expenses", f"{currency_symbol} {shillings(kpis['expenses']):,.0f}")
+    with k3:
         with st.container(border=True):
-            st.metric("Profit", f"{currency_symbol} {kpis['profit']:,.0f}")
+            st.metric("Profit", f"{currency_symbol} {shillings(kpis['profit']):,.0f}")
 
-    # Sales + forecast and Top sellers
     col1, col2 = st.columns([2, 1], gap="large")
     with col1:
-        st.markdown("<h3 class='title'>Sales (last 30 days) & Forecast</h3>", unsafe_allow_html=True)
-        fc = simple_forecast_next_7_days(sales)
-        st.plotly_chart(sales_chart(sales, fc), use_container_width=True, theme="streamlit")
+        st.markdown(f"<h3 class='title'>Sales (last {days_window} days) & Forecast</h3>", unsafe_allow_html=True)
+        show_chart(sales_figure(days_window, scope, granularity), "sales_chart", use_container_width=True, theme="streamlit")
+        export_button("Download sales", lambda: frame_chunks(shillings(branch_sales(days_window, scope), ["revenue"])), "sales", key="sales_export")
     with col2:
+        # Branch and region rollups for the same window
+        st.markdown("<h3 class='title'>Branch Performance</h3>", unsafe_allow_html=True)
+        for by in ("region", "branch"):
+            rollup = shillings(cube.rollup(days_window, by), ["revenue", "expenses", "profit"])
+            show_dataframe(rollup, f"{by}_rollup", use_container_width=True, hide_index=True)
+
+
+@fragment("Dashboard", "inventory_snapshot")
+def inventory_snapshot() -> None:
+    st.markdown("<h3 class='title'>Inventory Snapshot</h3>", unsafe_allow_html=True)
+    snapshot = paged(lambda page, size: query_inventory(sort_by=("name",), page=page, page_size=size), key="snapshot_page", page_size=25)
+    show_dataframe(shillings(snapshot, ["cost", "price"]), "inventory_snapshot", use_container_width=True, height=340)
+
+
+def main():
+    begin_profile("Dashboard")
+    st.sidebar.title("Baraka Supermarket")
+    st.sidebar.caption("Investor Demo – Streamlit")
+
+    overview()
+
+    # Sections without widgets only change on a full rerun (page load or data refresh)
+    top = get_top_sellers()
+    col1, col2 = st.columns([1, 1], gap="large")
+    with col1:
         st.markdown("<h3 class='title'>Top Sellers</h3>", unsafe_allow_html=True)
-        st.plotly_chart(top_sellers_bar(top), use_container_width=True, theme="streamlit")
-        st.dataframe(
-            top.assign(margin_pct=(top["margin"] * 100).round(0)).drop(columns=["margin"]).rename(columns={"margin_pct": "margin %"}),
+        show_chart(top_sellers_bar(top), "top_sellers_bar", use_container_width=True, theme="streamlit")
+        show_dataframe(
+            shillings(top, ["revenue"])
+            .assign(margin_pct=(top["margin"] * 100).round(0))
+            .drop(columns=["margin"])
+            .rename(columns={"margin_pct": "margin %"}),
+            "top_sellers",
             use_container_width=True,
             height=240,
         )
-
-    # Alerts and Dynamic pricing
-    col3, col4 = st.columns([1, 1], gap="large")
-    with col3:
+    with col2:
+        # Alerts and Dynamic pricing
         st.markdown("<h3 class='title'>Alerts</h3>", unsafe_allow_html=True)
-        for a in build_alerts(inv, sales):
-            st.warning(a)
-    with col4:
+        # Fixed lookback: the week-over-week sales check doesn't follow the display window
+        active = alerts()
+        for a in active:
+            (st.error if a.severity == "critical" else st.warning)(a.message)
+        if not active:
+            st.success("No active alerts")
         st.markdown("<h3 class='title'>Dynamic Pricing Suggestions</h3>", unsafe_allow_html=True)
-        st.dataframe(dynamic_pricing_recommendations(inv), use_container_width=True, height=260)
+        show_dataframe(pricing(), "pricing", use_container_width=True, height=260)
 
-    # Inventory preview
-    st.markdown("<h3 class='title'>Inventory Snapshot</h3>", unsafe_allow_html=True)
-    st.dataframe(inv.sort_values("name"), use_container_width=True, height=340)
-    st.download_button("Download sales CSV", sales.to_csv(index=False).encode("utf-8"), "sales.csv", "text/csv")
+    inventory_snapshot()
 
     # Suppliers and Orders
     col5, col6 = st.columns([1, 1], gap="large")
     with col5:
         st.markdown("<h3 class='title'>Suppliers</h3>", unsafe_allow_html=True)
-        st.dataframe(sups, use_container_width=True, height=320)
+        show_dataframe(shillings(get_suppliers(), ["lastPrice"]), "suppliers", use_container_width=True, height=320)
     with col6:
         st.markdown("<h3 class='title'>Recent Orders</h3>", unsafe_allow_html=True)
-        st.dataframe(ords, use_container_width=True, height=320)
+        show_dataframe(shillings(get_orders(), ["total"]), "orders", use_container_width=True, height=320)
 
     st.caption("Tip: Add to Home Screen on mobile for an app-like experience.")
+    debug_panel()
 
 
 if __name__ == "__main__":
     main()
-
-
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Sequence
+import numpy as np
+import pandas as pd
+
+# Pair (a, b) with a < b is packed into one int64 as a << 32 | b, so codes stay valid as
+# the item vocabulary grows between updates.
+_SHIFT = np.int64(32)
+_MASK = np.int64(0xFFFFFFFF)
+
+
+def _basket_pairs(basket_codes: np.ndarray, item_codes: np.ndarray) -> np.ndarray:
+    """Packed codes of every unordered item pair co-occurring in a basket.
+
+    Rows must be sorted by (0-based, dense) basket code with duplicate (basket, item)
+    rows removed. Pairs are generated by comparing each row with the row ``d`` positions
+    later, for d up to the largest basket size, so the work is vectorized per offset
+    rather than per basket.
+    """
+    out = []
+    n = len(basket_codes)
+    if n < 2:
+        return np.empty(0, dtype=np.int64)
+    max_size = int(np.bincount(basket_codes).max())
+    for d in range(1, max_size):
+        same = basket_codes[:-d] == basket_codes[d:]
+        if not same.any():
+            break
+        a = item_codes[:-d][same]
+        b = item_codes[d:][same]
+        lo, hi = np.minimum(a, b), np.maximum(a, b)
+        out.append((lo.astype(np.int64) << _SHIFT) | hi.astype(np.int64))
+    return np.concatenate(out) if out else np.empty(0, dtype=np.int64)
+
+
+def _popcount(bits: np.ndarray) -> int:
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(bits).sum())
+    return int(np.unpackbits(bits).sum())
+
+
+class BasketMiner:
+    """Incremental item and pair counts for association rules over shopping baskets.
+
+    Feed it ``(basket_id, sku)`` rows with ``update``; each batch must contain whole
+    baskets. Item counts live in a dense array and pair counts in sorted packed-code
+    arrays, so memory scales with the number of distinct co-occurring pairs, not with
+    baskets or SKUs squared.
+    """
+
+    def __init__(self):
+        self.n_baskets = 0
+        self.items: List[str] = []
+        self._index: Dict[str, int] = {}
+        self.item_counts = np.zeros(0, dtype=np.int64)
+        self.pair_codes = np.empty(0, dtype=np.int64)
+        self.pair_counts = np.empty(0, dtype=np.int64)
+
+    def _encode(self, skus: Sequence) -> np.ndarray:
+        inverse, uniques = pd.factorize(np.asarray(skus), sort=False)
+        mapping = np.empty(len(uniques), dtype=np.int64)
+        for i, sku in enumerate(uniques):
+            code = self._index.get(sku)
+            if code is None:
+                code = self._index[sku] = len(self.items)
+                self.items.append(sku)
+            mapping[i] = code
+        if len(self.items) > len(self.item_counts):
+            self.item_counts = np.concatenate([self.item_counts, np.zeros(len(self.items) - len(self.item_counts), dtype=np.int64)])
+        return mapping[inverse]
+
+    def update(self, basket_ids: Sequence, skus: Sequence) -> "BasketMiner":
+        """Add a batch of baskets given as parallel arrays of basket ids and SKUs."""
+        if len(basket_ids) == 0:
+            return self
+        baskets = pd.factorize(np.asarray(basket_ids))[0].astype(np.int64)
+        items = self._encode(skus)
+        # Sort by basket then item and drop repeat scans of the same item
+        order = np.lexsort((items, baskets))
+        baskets, items = baskets[order], items[order]
+        keep = np.ones(len(items), dtype=bool)
+        keep[1:] = (baskets[1:] != baskets[:-1]) | (items[1:] != items[:-1])
+        baskets, items = baskets[keep], items[keep]
+
+        self.n_baskets += int(baskets.max()) + 1
+        self.item_counts += np.bincount(items, minlength=len(self.item_counts))
+        codes, counts = np.unique(_basket_pairs(baskets, items), return_counts=True)
+        self._merge_pairs(codes, counts)
+        return self
+
+    def _merge_pairs(self, codes: np.ndarray, counts: np.ndarray) -> None:
+        if not len(self.pair_codes):
+            self.pair_codes, self.pair_counts = codes, counts
+            return
+        pos = np.searchsorted(self.pair_codes, codes)
+        pos_clipped = np.minimum(pos, len(self.pair_codes) - 1)
+        known = self.pair_codes[pos_clipped] == codes
+        np.add.at(self.pair_counts, pos_clipped[known], counts[known])
+        if (~known).any():
+            merged_codes = np.concatenate([self.pair_codes, codes[~known]])
+            merged_counts = np.concatenate([self.pair_counts, counts[~known]])
+            order = np.argsort(merged_codes, kind="stable")
+            self.pair_codes, self.pair_counts = merged_codes[order], merged_counts[order]
+
+    def pairs(self, min_count: int = 1) -> pd.DataFrame:
+        """Pair counts with support, confidence (both directions) and lift."""
+        keep = self.pair_counts >= min_count
+        codes, counts = self.pair_codes[keep], self.pair_counts[keep]
+        a = (codes >> _SHIFT).astype(np.int64)
+        b = (codes & _MASK).astype(np.int64)
+        n = max(self.n_baskets, 1)
+        count_a, count_b = self.item_counts[a], self.item_counts[b]
+        items = np.asarray(self.items, dtype=object)
+        return pd.DataFrame(
+            {
+                "item_a": items[a],
+                "item_b": items[b],
+                "count": counts,
+                "support": counts / n,
+                "confidence_a_b": counts / count_a,
+                "confidence_b_a": counts / count_b,
+                "lift": counts * n / (count_a * count_b),
+            }
+        )
+
+    def bundles(self, top: int = 10, min_count: int = 20, min_lift: float = 1.0) -> pd.DataFrame:
+        """Bundle suggestions: frequent pairs bought together more than chance, best lift first."""
+        pairs = self.pairs(min_count)
+        pairs = pairs[pairs["lift"] >= min_lift]
+        return pairs.nlargest(top, ["lift", "count"]).reset_index(drop=True)
+
+
+def mine(transactions: pd.DataFrame, basket: str = "basket_id", item: str = "sku") -> BasketMiner:
+    return BasketMiner().update(transactions[basket].to_numpy(), transactions[item].to_numpy())
+
+
+def mine_chunks(chunks: Iterable[pd.DataFrame], basket: str = "basket_id", item: str = "sku") -> BasketMiner:
+    """Mine a stream of row chunks ordered by basket (e.g. a chunked SQL query).
+
+    The last basket of each chunk is held back and prepended to the next one, so
+    baskets split across chunk boundaries are counted once, whole.
+    """
+    miner = BasketMiner()
+    carry = None
+    for chunk in chunks:
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        if chunk.empty:
+            continue
+        last = chunk[basket].iloc[-1]
+        tail = (chunk[basket] == last).to_numpy()
+        carry = chunk[tail]
+        body = chunk[~tail]
+        miner.update(body[basket].to_numpy(), body[item].to_numpy())
+    if carry is not None and not carry.empty:
+        miner.update(carry[basket].to_numpy(), carry[item].to_numpy())
+    return miner
+
+
+def frequent_triples(
+    transactions: pd.DataFrame, min_support: float = 0.01, basket: str = "basket_id", item: str = "sku", top: int = 20
+) -> pd.DataFrame:
+    """Itemsets of three with support >= ``min_support``, counted with packed bitsets.
+
+    Each frequent item gets one bit per basket; a candidate triple's count is the
+    popcount of three ANDed bitsets, and candidates are only built from frequent pairs.
+    """
+    miner = mine(transactions, basket, item)
+    n = miner.n_baskets
+    min_count = max(int(np.ceil(min_support * n)), 1)
+    pairs = miner.pairs(min_count)
+    if pairs.empty:
+        return pd.DataFrame(columns=["item_a", "item_b", "item_c", "count", "support"])
+
+    frequent = sorted(set(pairs["item_a"]) | set(pairs["item_b"]))
+    baskets = pd.factorize(transactions[basket].to_numpy())[0]
+    skus = transactions[item].to_numpy()
+    bits = {}
+    for sku in frequent:
+        member = np.zeros(n, dtype=bool)
+        member[baskets[skus == sku]] = True
+        bits[sku] = np.packbits(member)
+
+    neighbours: Dict[str, set] = {}
+    for a, b in zip(pairs["item_a"], pairs["item_b"]):
+        neighbours.setdefault(a, set()).add(b)
+        neighbours.setdefault(b, set()).add(a)
+    rows, seen = [], set()
+    for a, b in zip(pairs["item_a"], pairs["item_b"]):
+        ab = bits[a] & bits[b]
+        for c in neighbours[a] & neighbours[b]:
+            key = tuple(sorted((a, b, c)))
+            if key in seen:
+                continue
+            seen.add(key)
+            count = _popcount(ab & bits[c])
+            if count >= min_count:
+                rows.append({"item_a": key[0], "item_b": key[1], "item_c": key[2], "count": count, "support": count / n})
+    if not rows:
+        return pd.DataFrame(columns=["item_a", "item_b", "item_c", "count", "support"])
+    return pd.DataFrame(rows).nlargest(top, "count").reset_index(drop=True)
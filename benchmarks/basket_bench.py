@@ -0,0 +1,58 @@
+"""Market-basket mining at scale.
+
+    python -m benchmarks.basket_bench [--baskets 2000000] [--skus 20000]
+
+Generates synthetic baskets over a large catalogue, mines item/pair counts, ranks
+bundles, and times an incremental update with a further batch of baskets.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+import data
+from basket import BasketMiner
+from schema import MINOR_UNITS
+
+
+def catalogue(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    # Heavy-tailed prices give a heavy-tailed popularity in data.get_baskets
+    return pd.DataFrame({"sku": [f"SKU-{i:06d}" for i in range(n)], "price": (rng.lognormal(5, 1.2, n) * MINOR_UNITS).round()})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baskets", type=int, default=2_000_000)
+    parser.add_argument("--skus", type=int, default=20_000)
+    parser.add_argument("--update", type=int, default=100_000, help="baskets in the incremental batch")
+    args = parser.parse_args()
+
+    skus = catalogue(args.skus)
+    # Plant a few co-purchases among mid-popularity SKUs for the miner to find
+    picks = skus["sku"].sample(8, random_state=0).tolist()
+    affinities = [(picks[i], picks[i + 1], 0.4) for i in range(0, 8, 2)]
+    start = time.perf_counter()
+    tx = data.get_baskets(args.baskets, skus=skus, affinities=affinities)
+    print(f"generate   {time.perf_counter() - start:7.2f} s  {len(tx):,} lines, {args.baskets:,} baskets, {args.skus:,} SKUs")
+
+    start = time.perf_counter()
+    miner = BasketMiner().update(tx["basket_id"].to_numpy(), tx["sku"].to_numpy())
+    print(f"mine       {time.perf_counter() - start:7.2f} s  {len(miner.pair_codes):,} distinct pairs")
+
+    start = time.perf_counter()
+    bundles = miner.bundles(10, min_count=50)
+    print(f"bundles    {time.perf_counter() - start:7.2f} s")
+
+    batch = data.get_baskets(args.update, skus=skus, seed=1, affinities=affinities)
+    start = time.perf_counter()
+    miner.update(batch["basket_id"].to_numpy(), batch["sku"].to_numpy())
+    print(f"update     {time.perf_counter() - start:7.2f} s  +{args.update:,} baskets")
+    print()
+    print(bundles[["item_a", "item_b", "count", "lift"]].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""Scaling benchmarks for the data generators, utils and page data paths.
+
+Run from the repo root:
+
+    python -m benchmarks.bench                        # 1e3..1e6 rows, compare to baseline
+    python -m benchmarks.bench --sizes 1e3,1e7        # pick sizes
+    python -m benchmarks.bench --save-baseline        # record a new baseline
+
+Each case is timed (best of ``--repeat`` runs) and run once more under tracemalloc
+for peak memory. Results are written as JSON; a case is flagged as a regression when
+it is more than ``--tolerance`` slower or larger than the stored baseline and the
+difference is beyond noise: at least ``MIN_SECONDS``/``MIN_BYTES`` and, for time,
+``NOISE_SPREADS`` times the run-to-run spread (median minus best) of either run.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+import data
+import markdown
+from analytics import SalesCube
+import replenishment
+import utils
+from rollup import KpiCube
+from store import paginate_frame
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+# Differences below these are noise, whatever the ratio
+MIN_SECONDS = 0.002
+MIN_BYTES = 256 * 1024
+# A slowdown must also exceed this many times the run-to-run spread of either run
+NOISE_SPREADS = 3
+
+# name -> (setup(n) -> args, fn(*args), max supported n or None)
+CASES: Dict[str, Tuple[Callable[[int], tuple], Callable, int | None]] = {}
+
+
+def case(name: str, setup: Callable[[int], tuple], max_n: int | None = None):
+    def register(fn: Callable) -> Callable:
+        CASES[name] = (setup, fn, max_n)
+        return fn
+
+    return register
+
+
+# Synthetic inputs of n rows
+
+
+def sales_frame(n: int) -> pd.DataFrame:
+    """n daily-revenue rows; dates wrap every 10 years so any n fits in datetime64."""
+    rng = np.random.default_rng(0)
+    end = pd.Timestamp.today().normalize()
+    offsets = (np.arange(n)[::-1] % 3650).astype("timedelta64[D]")
+    return pd.DataFrame({"date": end - offsets, "revenue": rng.integers(100, 1000, n)})
+
+
+def inventory_frame(n: int) -> pd.DataFrame:
+    base = data.get_inventory()
+    reps = -(-n // len(base))
+    inv = pd.concat([base] * reps, ignore_index=True).head(n)
+    inv["sku"] = inv["sku"].astype(str) + "-" + pd.Series(np.arange(n)).astype(str)
+    return inv
+
+
+def sales_lines_frame(n: int) -> pd.DataFrame:
+    """n hourly (date, sku, units, revenue) lines over the demo SKUs, newest last."""
+    rng = np.random.default_rng(0)
+    inv = data.get_inventory()
+    per_day = 24 * len(inv)
+    end = pd.Timestamp.today().normalize()
+    pos = np.arange(n)[::-1]
+    stamps = end - (pos // per_day % 3650).astype("timedelta64[D]") + (pos // len(inv) % 24).astype("timedelta64[h]")
+    units = rng.integers(0, 6, n)
+    return pd.DataFrame(
+        {
+            "date": stamps,
+            "sku": inv["sku"].to_numpy()[pos % len(inv)],
+            "units": units,
+            "revenue": units * inv["price"].to_numpy()[pos % len(inv)],
+        }
+    )
+
+
+def _built_cube(n: int) -> SalesCube:
+    cube = SalesCube(data.get_inventory())
+    cube.update(sales_lines_frame(n))
+    return cube
+
+
+def branch_sales_frame(n: int) -> pd.DataFrame:
+    """n (date, store, revenue) rows spread over the demo branches."""
+    stores = data.get_branches()["store"].to_numpy()
+    sales = sales_frame(n)
+    return sales.assign(store=stores[np.arange(n) % len(stores)])[["date", "store", "revenue"]]
+
+
+def _sales_args(n: int) -> tuple:
+    return (sales_frame(n),)
+
+
+def _inventory_args(n: int) -> tuple:
+    return (inventory_frame(n),)
+
+
+case("get_sales_by_day", lambda n: (n,), max_n=100_000)(data.get_sales_by_day)
+case("compute_kpis", lambda n: (sales_frame(n), data.get_expenses()))(utils.compute_kpis)
+case("kpi_cube_build", lambda n: (branch_sales_frame(n), data.get_branches(), data.get_expenses()))(KpiCube.build)
+case(
+    "kpi_cube_window",
+    lambda n: (KpiCube.build(branch_sales_frame(n), data.get_branches(), data.get_expenses()),),
+)(lambda cube: [cube.window(days, scope) for days in (7, 30, 90) for scope in cube.scopes()])
+case("sales_drop_alert", _sales_args)(utils.sales_drop_alert)
+case("build_alerts", lambda n: (inventory_frame(n), sales_frame(min(n, 1_000))))(utils.build_alerts)
+case("dynamic_pricing_recommendations", _inventory_args)(utils.dynamic_pricing_recommendations)
+case("analytics_weekday_groupby", _sales_args)(utils.sales_by_weekday)
+case("analytics_cube_update", lambda n: (data.get_inventory(), sales_lines_frame(n)))(
+    lambda inventory, lines: SalesCube(inventory).update(lines)
+)
+case("analytics_cube_query", lambda n: (_built_cube(n),))(
+    lambda cube: (cube.by_weekday(91), cube.by_hour(91), cube.by_week(91), cube.by_category(91))
+)
+
+
+def _replenishment_args(n: int) -> tuple:
+    # n sales rows: 28 days of history for n / 28 SKUs
+    inv = inventory_frame(max(n // 28, 1))
+    return inv, data.get_suppliers(), data.get_sales_detail(28, skus=inv)
+
+
+case("replenishment_plan", _replenishment_args)(replenishment.plan)
+
+
+def _markdown_args(n: int) -> tuple:
+    """n lot-scenarios: n / SCENARIOS perishable lots, each simulated SCENARIOS times."""
+    lots = max(1, n // markdown.SCENARIOS)
+    rng = np.random.default_rng(0)
+    skus = [f"SKU-{i:06d}" for i in range(lots)]
+    inv = pd.DataFrame(
+        {
+            "sku": skus,
+            "name": skus,
+            "qty": rng.integers(5, 300, lots),
+            "expiry": pd.NaT,
+            "cost": 50.0,
+            "price": 80.0,
+            "days_to_expiry": rng.integers(1, markdown.HORIZON_DAYS + 1, lots),
+            "ahead": 0,
+        }
+    )
+    demand = pd.DataFrame({"sku": skus, "daily_demand": rng.gamma(2.0, 10.0, lots), "demand_std": rng.gamma(2.0, 5.0, lots)})
+    return inv, demand
+
+
+case("markdown_simulate", _markdown_args, max_n=10_000_000)(markdown.simulate)
+
+
+def _inventory_page(inv: pd.DataFrame):
+    # The Inventory page's table: filter, sort by days to expiry and slice one page
+    days = (pd.to_datetime(inv["expiry"]) - pd.Timestamp.today().normalize()).dt.days.to_numpy()
+    return paginate_frame(inv, days <= 30, ["days_to_expiry", "name"], 0, 50, extra={"days_to_expiry": days})
+
+
+case("inventory_page", _inventory_args)(_inventory_page)
+
+
+def measure(fn: Callable, args: tuple, repeat: int) -> Dict[str, float]:
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # Spread: how far the median run is from the best one (0 for a single run)
+    return {"seconds": times[0], "spread": times[len(times) // 2] - times[0], "peak_bytes": peak}
+
+
+def run(names: List[str], sizes: List[int], repeat: int) -> Dict[str, Dict[str, Dict[str, float]]]:
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for name in names:
+        setup, fn, max_n = CASES[name]
+        for n in sizes:
+            if max_n is not None and n > max_n:
+                continue
+            args = setup(n)
+            result = measure(fn, args, repeat if n < 1_000_000 else 1)
+            results.setdefault(name, {})[str(n)] = result
+            print(f"{name:<34} n={n:<10,} {result['seconds'] * 1000:>10.2f} ms {result['peak_bytes'] / 2**20:>9.1f} MiB")
+            del args
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    regressions = []
+    for name, by_size in results.items():
+        for n, now in by_size.items():
+            before = baseline.get(name, {}).get(n)
+            if before is None:
+                continue
+            noise = NOISE_SPREADS * max(now.get("spread", 0.0), before.get("spread", 0.0))
+            for metric, floor in (("seconds", max(MIN_SECONDS, noise)), ("peak_bytes", MIN_BYTES)):
+                if now[metric] > before[metric] * (1 + tolerance) and now[metric] - before[metric] > floor:
+                    regressions.append(f"{name} n={n}: {metric} {before[metric]:.4g} -> {now[metric]:.4g}")
+    return regressions
+
+
+def _parse_sizes(text: str) -> List[int]:
+    return [int(float(s)) for s in text.split(",") if s]
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=_parse_sizes, default=DEFAULT_SIZES, help="comma-separated row counts, e.g. 1e3,1e5")
+    parser.add_argument("--cases", default="", help="comma-separated case names (default: all)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", default="bench_results.json", help="where to write this run's results")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write this run to --baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown/growth ratio")
+    args = parser.parse_args(argv)
+
+    names = [c for c in args.cases.split(",") if c] or list(CASES)
+    unknown = sorted(set(names) - set(CASES))
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)}; available: {', '.join(CASES)}")
+
+    results = run(names, args.sizes, args.repeat)
+    report = {
+        "meta": {
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "timestamp": pd.Timestamp.now().isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+    target = args.baseline if args.save_baseline else args.out
+    with open(target, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {target}")
+    if args.save_baseline:
+        return 0
+
+    try:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print("No regressions against baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
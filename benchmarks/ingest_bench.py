@@ -0,0 +1,103 @@
+"""Order-event ingestion throughput into a SQLite store.
+
+    python -m benchmarks.ingest_bench [--events 200000] [--batch-size 2000]
+
+Streams synthetic order/status events through each source kind (in-process queue,
+JSON-lines file, TCP socket) into a fresh SQLite file and reports events per second.
+The last row feeds a sink that stalls 50 ms per batch to show back-pressure: the
+queue stops at its limit instead of buffering the whole stream.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import List, Sequence
+
+import ingest
+from store import SQLiteSource
+
+
+class SlowSink:
+    def __init__(self, sink: SQLiteSource, delay: float):
+        self.sink = sink
+        self.delay = delay
+
+    def write_orders(self, orders: Sequence[tuple], status_changes: Sequence[tuple]) -> int:
+        time.sleep(self.delay)
+        return self.sink.write_orders(orders, status_changes)
+
+
+async def from_queue(ingestor: ingest.OrderIngestor, events: List[dict]) -> None:
+    queue: asyncio.Queue = asyncio.Queue(1000)
+
+    async def produce() -> None:
+        for event in events:
+            await queue.put(event)
+        await queue.put(None)
+
+    producer = asyncio.create_task(produce())
+    await ingestor.run(ingest.queue_source(queue))
+    await producer
+
+
+async def from_socket(ingestor: ingest.OrderIngestor, lines: List[bytes], port: int) -> None:
+    started = asyncio.Event()
+    task = asyncio.create_task(ingestor.run(ingest.socket_source(port=port, started=started)))
+    await started.wait()
+    _, writer = await asyncio.open_connection("127.0.0.1", port)
+    for line in lines:
+        writer.write(line)
+        await writer.drain()
+    writer.close()
+    while ingestor.stats.received < len(lines):
+        await asyncio.sleep(0.01)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--max-pending", type=int, default=20_000)
+    parser.add_argument("--port", type=int, default=9109)
+    args = parser.parse_args()
+
+    events = list(ingest.demo_events(args.events))
+    lines = [(json.dumps(e) + "\n").encode() for e in events]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "events.jsonl")
+        with open(path, "wb") as f:
+            f.writelines(lines)
+
+        def ingestor(run: int, slow: float = 0.0) -> ingest.OrderIngestor:
+            store = SQLiteSource(os.path.join(tmp, f"run{run}.db"))
+            sink = SlowSink(store, slow) if slow else store
+            return ingest.OrderIngestor(sink, args.batch_size, max_pending=args.max_pending)
+
+        runs = [
+            ("queue", lambda i: from_queue(i, events)),
+            ("file tail", lambda i: i.run(ingest.tail_source(path, follow=False))),
+            ("socket", lambda i: from_socket(i, lines, args.port)),
+        ]
+        print(f"{'source':<22} {'events/s':>10} {'batches':>8} {'max queued':>11}")
+        for n, (name, run) in enumerate(runs):
+            ing = ingestor(n)
+            asyncio.run(run(ing))
+            s = ing.stats
+            print(f"{name:<22} {s.rate:>10,.0f} {s.batches:>8,} {s.max_pending:>11,}")
+        ing = ingestor(len(runs), slow=0.05)
+        asyncio.run(ing.run(ingest.tail_source(path, follow=False)))
+        s = ing.stats
+        print(f"{'file tail, slow store':<22} {s.rate:>10,.0f} {s.batches:>8,} {s.max_pending:>11,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Server-side time of a dashboard rerun: whole script vs a single fragment.
+
+    python -m benchmarks.rerun_latency [repeat]
+
+"Full script run" is this tree's ``app.py`` run end to end: what a widget change costs
+when it is not inside a fragment. It is not the app from before the fragment split;
+check out that commit to time it. The fragment rows are what the window/branch/currency
+controls (overview) and the page picker (inventory snapshot) re-run instead. Timings are
+taken with the loader cache warm, as in a live session, and outside ``streamlit run``
+(where elements are built and serialized but not sent). The "new window" row moves the
+Days slider to a value not seen before, so the figure is rebuilt rather than served
+from cache.
+"""
+from __future__ import annotations
+
+import sys
+import time
+import warnings
+from typing import Callable
+
+from streamlit import logger
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(repeat: int = 20) -> None:
+    logger.set_log_level("error")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        import app
+
+    # Outside a script run fragments are no-ops, so call their bodies directly
+    overview = app.overview.__wrapped__
+    snapshot = app.inventory_snapshot.__wrapped__
+
+    def full_script_run():
+        app.main()
+        overview()
+        snapshot()
+
+    full_script_run()  # warm the loader cache
+    windows = iter(range(7, 91))
+    new_window = lambda: app.sales_figure(next(windows), "All branches", "Auto")  # noqa: E731
+
+    rows = [
+        ("full script run (this tree)", best_of(full_script_run, repeat)),
+        ("overview fragment (slider/currency)", best_of(overview, repeat)),
+        ("  + chart for a new window", best_of(new_window, min(repeat, 80))),
+        ("inventory snapshot fragment (page)", best_of(snapshot, repeat)),
+    ]
+    for name, seconds in rows:
+        print(f"{name:<40} {seconds * 1000:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,72 @@
+"""Memory and query speed of raw vs schema-conformed sales lines.
+
+    python -m benchmarks.schema_bench [--rows 1000000]
+
+Builds multi-store sales lines the way a CSV or SQL load delivers them (object
+strings, int64/float64, datetime64[ns]), conforms them with ``schema.conform``, and
+compares bytes held plus a few dashboard-style queries on each.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, Dict
+import numpy as np
+import pandas as pd
+
+import data
+from schema import conform, memory_usage
+
+
+def raw_sales(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    inv = data.get_inventory.__wrapped__()
+    stores = data.get_branches()["store"].astype(str).to_numpy()
+    pick = rng.integers(0, len(inv), n)
+    units = rng.integers(1, 6, n)
+    return pd.DataFrame(
+        {
+            "date": pd.Timestamp.today().normalize() - pd.to_timedelta(rng.integers(0, 365, n), unit="D"),
+            "store": stores[rng.integers(0, len(stores), n)],
+            "sku": inv["sku"].to_numpy()[pick],
+            "units": units,
+            "revenue": (units * inv["price"].to_numpy()[pick]).astype(float),
+        }
+    )
+
+
+def best_of(fn: Callable[[], object], repeat: int = 5) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def queries(df: pd.DataFrame) -> Dict[str, Callable[[], object]]:
+    return {
+        "revenue by store": lambda: df.groupby("store", observed=True)["revenue"].sum(),
+        "units by store x sku": lambda: df.groupby(["store", "sku"], observed=True)["units"].sum(),
+        "filter one sku": lambda: df[df["sku"] == "MILK-1L"],
+        "sort by sku": lambda: df.sort_values("sku"),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    raw = raw_sales(args.rows)
+    start = time.perf_counter()
+    compact = conform("sales_detail", raw)
+    print(f"conform {args.rows:,} rows: {(time.perf_counter() - start) * 1000:.0f} ms")
+    print(f"{'':<24} {'raw':>13} {'conformed':>13}")
+    print(f"{'memory':<24} {memory_usage(raw) / 2**20:>9.1f} MiB {memory_usage(compact) / 2**20:>9.1f} MiB")
+    for (name, before), after in zip(queries(raw).items(), queries(compact).values()):
+        print(f"{name:<24} {best_of(before) * 1000:>9.1f} ms  {best_of(after) * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Cold-start cost: import times, time to first render and server readiness.
+
+    python -m benchmarks.startup [--repeat 3] [--pages app.py,pages/1_Analytics.py] [--no-server]
+
+Every measurement runs in a fresh interpreter, as after a spin-up on the free Render
+plan. "Imports" is the time to import each module and whether it drags in the UI
+stack (the compute modules must not). "First render" is the server-side time of a
+page's first run (``AppTest``, Streamlit already imported as it is once the server is
+up), cold and after ``charts.warm_up`` + ``loaders.warm_up`` as run by ``serve.py``.
+"Server" is the time from launch until ``/_stcore/health`` answers.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ["data", "utils", "loaders", "charts", "streamlit", "plotly.express", "ui"]
+UI_FREE = ("data", "utils", "loaders", "charts")
+HEAVY = ("streamlit", "plotly.express", "plotly.graph_objs")
+PAGES = ["app.py", "pages/1_Analytics.py", "pages/2_Inventory.py", "pages/3_Suppliers.py", "pages/4_Orders.py", "pages/5_Expenses.py"]
+
+IMPORT_CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - start, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+RENDER_CHILD = """
+import json, time, warnings
+warnings.simplefilter("ignore")
+from streamlit import logger
+from streamlit.testing.v1 import AppTest
+logger.set_log_level("error")
+warm = 0.0
+if {warm!r}:
+    import charts, loaders
+    start = time.perf_counter()
+    charts.warm_up()
+    loaders.warm_up()
+    warm = time.perf_counter() - start
+at = AppTest.from_file({page!r}, default_timeout=120)
+start = time.perf_counter()
+at.run()
+print(json.dumps({{"seconds": time.perf_counter() - start, "warm_up": warm, "errors": [str(e.value) for e in at.exception]}}))
+"""
+
+
+def child(code: str) -> Dict:
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def best(code: str, repeat: int) -> Dict:
+    return min((child(code) for _ in range(repeat)), key=lambda r: r["seconds"])
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def time_to_healthy(command: List[str], timeout: float = 60) -> float:
+    port = free_port()
+    args = command + ["--server.port", str(port), "--server.headless", "true"]
+    start = time.perf_counter()
+    proc = subprocess.Popen(args, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as r:
+                    if r.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.05)
+        raise TimeoutError(f"{' '.join(command)} not healthy after {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per measurement (best is kept)")
+    parser.add_argument("--pages", default=",".join(PAGES))
+    parser.add_argument("--no-server", action="store_true", help="skip the server readiness timings")
+    args = parser.parse_args()
+
+    print(f"{'import':<16} {'ms':>8}  loads")
+    leaks = []
+    for module in MODULES:
+        r = best(IMPORT_CHILD.format(module=module, heavy=HEAVY), args.repeat)
+        print(f"{module:<16} {r['seconds'] * 1000:>8.0f}  {', '.join(r['loaded']) or '-'}")
+        if module in UI_FREE and r["loaded"]:
+            leaks.append(module)
+
+    print(f"\n{'first render':<24} {'cold ms':>9} {'warm ms':>9} {'warm-up s':>10}")
+    for page in args.pages.split(","):
+        cold = best(RENDER_CHILD.format(page=page, warm=False), args.repeat)
+        warm = best(RENDER_CHILD.format(page=page, warm=True), args.repeat)
+        errors = cold["errors"] + warm["errors"]
+        print(f"{page:<24} {cold['seconds'] * 1000:>9.0f} {warm['seconds'] * 1000:>9.0f} {warm['warm_up']:>10.2f}" + (f"  errors: {errors}" if errors else ""))
+
+    if not args.no_server:
+        print(f"\n{'server healthy after':<32} {'s':>6}")
+        for name, command in [
+            ("streamlit run app.py", [sys.executable, "-m", "streamlit", "run", "app.py"]),
+            ("python serve.py (warm-up)", [sys.executable, "serve.py"]),
+        ]:
+            seconds = min(time_to_healthy(command) for _ in range(args.repeat))
+            print(f"{name:<32} {seconds:>6.2f}")
+
+    if leaks:
+        sys.exit(f"\n{', '.join(leaks)} import the UI stack ({', '.join(HEAVY)}); keep Streamlit/Plotly imports out of compute modules")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Per-rerun payload of the brand theme, before and after static serving.
+
+    python -m benchmarks.theme_payload [image]
+
+"Before" is the original behaviour: the source image base64-inlined into the CSS sent
+with every rerun. "After" is the CSS sent per rerun plus the hashed image files, which
+the browser downloads once and then serves from its cache.
+"""
+from __future__ import annotations
+
+import base64
+import os
+import sys
+import time
+
+import ui
+
+
+def main(image_path: str = "super.jpeg") -> None:
+    with open(image_path, "rb") as f:
+        inline_before = len(base64.b64encode(f.read()))
+    css_shell = len(ui.brand_css(None))
+
+    start = time.perf_counter()
+    static_css = ui.brand_css(image_path, True)
+    first_build = time.perf_counter() - start
+    start = time.perf_counter()
+    ui.brand_css(image_path, True)
+    cached_build = time.perf_counter() - start
+    assets = ui._background_assets(image_path, os.stat(image_path).st_mtime_ns)
+    inline_after = len(ui.brand_css(image_path, False))
+
+    print(f"before: {css_shell + inline_before:>8,} B per rerun (base64 source image inlined)")
+    print(f"after:  {len(static_css):>8,} B per rerun (static serving)")
+    for name, path in assets.items():
+        print(f"        {os.path.getsize(path):>8,} B once, {name} image (browser-cached, content-hashed)")
+    print(f"        {inline_after:>8,} B per rerun if static serving is disabled (recompressed inline)")
+    print(f"CSS build: {first_build * 1000:.1f} ms first call, {cached_build * 1e6:.1f} us cached")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Sequence, Tuple
+
+_lock = threading.RLock()
+_data_version = 0
+_registry: Dict[str, "_Memo"] = {}
+_listeners: List[Callable[[Tuple[str, ...]], None]] = []
+
+
+class _Memo:
+    """LRU + TTL store for one cached function, with hit/miss counters."""
+
+    def __init__(self, ttl: float | None, maxsize: int, tables: Sequence[str] = (), code: Hashable = None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.tables = frozenset(tables)
+        self.code = code
+        self.version = 0
+        self.entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.in_flight: Dict[Hashable, threading.Event] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, now: float) -> Tuple[bool, Any]:
+        entry = self.entries.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            if self.ttl is None or now - stored_at < self.ttl:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return True, value
+            del self.entries[key]
+            self.expirations += 1
+        return False, None
+
+    def put(self, key: Hashable, value: Any, now: float) -> None:
+        self.entries[key] = (now, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "size": len(self.entries),
+        }
+
+
+def data_version() -> int:
+    return _data_version
+
+
+def invalidate(*tables: str) -> None:
+    """Drop cached results; call whenever the underlying data changes.
+
+    With ``tables`` only functions declared ``cached(tables=...)`` on one of them are
+    dropped, so e.g. a stream of order writes leaves the sales caches warm.
+    """
+    global _data_version
+    with _lock:
+        if not tables:
+            _data_version += 1
+        for memo in _registry.values():
+            if not tables or memo.tables.intersection(tables):
+                memo.version += 1
+                memo.entries.clear()
+    for listener in list(_listeners):
+        listener(tables)
+
+
+def on_invalidate(listener: Callable[[Tuple[str, ...]], None]) -> None:
+    """Call ``listener(tables)`` after every ``invalidate`` (``()`` when all was dropped).
+
+    For state that lives beside a cached result, such as a background thread.
+    """
+    _listeners.append(listener)
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    with _lock:
+        return {name: memo.stats() for name, memo in _registry.items()}
+
+
+def cached(ttl: float | None = 300, maxsize: int = 32, tables: Sequence[str] = ()) -> Callable[[Callable], Callable]:
+    """Memoize a function per process, keyed on its arguments and the data version.
+
+    Results are shared between callers (and Streamlit sessions), so treat returned
+    DataFrames as read-only: ``.assign``/``.copy`` before adding columns. ``tables``
+    names the tables the result is read from, for ``invalidate(*tables)``. Concurrent
+    calls with the same key compute once: later callers wait for the first one's result
+    (e.g. a page opened while the start-up warm-up is still loading the same data).
+    """
+
+    def decorator(func: Callable) -> Callable:
+        name = f"{func.__module__}.{func.__qualname__}"
+        # Streamlit re-executes page scripts on every rerun, decorating their functions
+        # again; the same code keeps its results unless the function was edited
+        code = (func.__code__.co_code, func.__code__.co_consts)
+        with _lock:
+            memo = _registry.get(name)
+            if memo is None or (memo.ttl, memo.maxsize, memo.tables, memo.code) != (ttl, maxsize, frozenset(tables), code):
+                memo = _registry[name] = _Memo(ttl, maxsize, tables, code)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (_data_version, memo.version, args, tuple(sorted(kwargs.items())))
+            while True:
+                with _lock:
+                    found, value = memo.get(key, time.monotonic())
+                    if found:
+                        return value
+                    flight = memo.in_flight.get(key)
+                    if flight is None:
+                        flight = memo.in_flight[key] = threading.Event()
+                        memo.misses += 1
+                        break
+                flight.wait()  # then read the result, or compute it if that call failed
+            try:
+                value = func(*args, **kwargs)
+                with _lock:
+                    memo.put(key, value, time.monotonic())
+            finally:
+                with _lock:
+                    del memo.in_flight[key]
+                flight.set()
+            return value
+
+        wrapper.cache_stats = memo.stats
+        return wrapper
+
+    return decorator
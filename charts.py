@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from typing import Any
+import numpy as np
+import pandas as pd
+
+# Charts never need more points than the plot is wide in pixels
+MAX_POINTS = 1000
+# Above this many points a trace is drawn with WebGL (Scattergl) instead of SVG. Kept
+# below MAX_POINTS, which every prepared series is capped at, so long series still switch
+WEBGL_THRESHOLD = 500
+RESAMPLE_FREQS = {"Day": "D", "Week": "W-MON", "Month": "MS"}
+
+
+def resample(df: pd.DataFrame, freq: str, x: str = "date", y: str = "revenue", how: str = "mean") -> pd.DataFrame:
+    """Aggregate ``y`` into ``freq`` buckets (pandas offset alias, e.g. "D", "W-MON", "MS")."""
+    out = df.set_index(pd.to_datetime(df[x]))[y].resample(freq, label="left", closed="left").agg(how)
+    return out.dropna().rename_axis(x).reset_index()
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of ``n_out`` points chosen by Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last point and, from each bucket in between, the point forming
+    the largest triangle with the previous pick and the next bucket's mean, so peaks and
+    dips survive the reduction.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    xf = np.asarray(x, dtype=float)
+    yf = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    # Mean of each bucket, used as the third vertex for the bucket before it
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(xf[1:n - 1], edges[:-1] - 1) / counts
+    mean_y = np.add.reduceat(yf[1:n - 1], edges[:-1] - 1) / counts
+    mean_x = np.append(mean_x[1:], xf[-1])
+    mean_y = np.append(mean_y[1:], yf[-1])
+
+    picked = np.empty(n_out, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        area = np.abs(
+            (xf[prev] - mean_x[b]) * (yf[lo:hi] - yf[prev]) - (xf[prev] - xf[lo:hi]) * (mean_y[b] - yf[prev])
+        )
+        prev = lo + int(area.argmax())
+        picked[b + 1] = prev
+    return picked
+
+
+def downsample(df: pd.DataFrame, x: str = "date", y: str = "revenue", max_points: int = MAX_POINTS) -> pd.DataFrame:
+    """Reduce ``df`` to at most ``max_points`` rows with LTTB (no-op when already small)."""
+    if len(df) <= max_points:
+        return df
+    df = df.sort_values(x)
+    xs = pd.to_datetime(df[x]).to_numpy().astype("int64") if np.issubdtype(df[x].dtype, np.datetime64) else df[x].to_numpy()
+    return df.iloc[lttb(xs, df[y].to_numpy(), max_points)]
+
+
+def prepare_series(
+    df: pd.DataFrame,
+    x: str = "date",
+    y: str = "revenue",
+    granularity: str = "Auto",
+    max_points: int = MAX_POINTS,
+    how: str = "mean",
+) -> pd.DataFrame:
+    """Resample to ``granularity`` ("Auto", "Day", "Week", "Month") with ``how``, then cap at ``max_points``."""
+    if granularity != "Auto":
+        df = resample(df, RESAMPLE_FREQS[granularity], x, y, how)
+    return downsample(df, x, y, max_points)
+
+
+def top_n_with_other(df: pd.DataFrame, label: str, value: str, n: int = 20) -> pd.DataFrame:
+    """Keep the ``n`` largest rows by ``value`` and fold the rest into one "Other" row."""
+    if len(df) <= n:
+        return df
+    ranked = df.sort_values(value, ascending=False)
+    other = pd.DataFrame({label: ["Other"], value: [ranked[value].iloc[n:].sum()]})
+    return pd.concat([ranked.head(n)[[label, value]], other], ignore_index=True)
+
+
+def scatter_trace(x, y, webgl_threshold: int = WEBGL_THRESHOLD, **kwargs: Any):
+    """``go.Scatter``, or ``go.Scattergl`` once the trace has more than ``webgl_threshold`` points."""
+    import plotly.graph_objects as go
+
+    trace_cls = go.Scattergl if len(x) > webgl_threshold else go.Scatter
+    return trace_cls(x=x, y=y, **kwargs)
+
+
+def warm_up() -> None:
+    """Import Plotly and build one figure of each kind the pages draw.
+
+    Plotly loads ``plotly.express`` and each trace type's validators on first use, which
+    otherwise lands on the first visitor's render (around a second on a small instance).
+    """
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    frame = pd.DataFrame({"x": ["a", "b"], "y": [1.0, 2.0]})
+    figures = [
+        px.bar(frame, x="x", y="y"),
+        px.line(frame, x="x", y="y", hover_data=["y"], markers=True),
+        px.scatter(frame, x="y", y="y", text="x", size="y"),
+        px.pie(frame, names="x", values="y", hole=0.45),
+        go.Figure([scatter_trace(frame["x"], frame["y"]), scatter_trace(frame["x"], frame["y"], webgl_threshold=0)]),
+    ]
+    for fig in figures:
+        fig.to_json()
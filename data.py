@@ -1,29 +1,212 @@
 from __future__ import annotations
 
-import math
+import functools
+import os
 from datetime import timedelta
+from typing import Callable, List, Sequence, Tuple
 import numpy as np
 import pandas as pd
 
+from basket import mine
+import perf
+from cache import invalidate
+from ledger import StockLedger
+from schema import MINOR_UNITS, conform
+from store import DataSource, SQLiteSource, paginate_frame
+
+
+_source: DataSource | None = None
+_source_configured = False
+
+
+def set_data_source(source: DataSource | None) -> None:
+    """Serve every ``get_*`` loader from ``source`` (``None`` restores the demo data)."""
+    global _source, _source_configured
+    _source = source
+    _source_configured = True
+    invalidate()
+
+
+def get_data_source() -> DataSource | None:
+    """The active data source; ``BARAKA_DB=<path>`` selects a SQLite store on first use."""
+    global _source, _source_configured
+    if not _source_configured:
+        path = os.environ.get("BARAKA_DB")
+        if path:
+            _source = SQLiteSource(path)
+        _source_configured = True
+    return _source
+
+
+_ledger: StockLedger | None = None
+_ledger_configured = False
+
+
+def _stock_moved(skus: List[str]) -> None:
+    # Only stock levels change: sales, KPI and analytics caches stay warm
+    invalidate("inventory")
+
+
+def set_stock_ledger(ledger: StockLedger | None) -> None:
+    """Take on-hand ``qty`` and ``expiry`` from ``ledger`` (``None`` uses the source's table)."""
+    global _ledger, _ledger_configured
+    if ledger is not _ledger:
+        if _ledger is not None:
+            _ledger.unsubscribe_batch(_stock_moved)
+        if ledger is not None:
+            ledger.subscribe_batch(_stock_moved)
+        _ledger = ledger
+    _ledger_configured = True
+    invalidate()
+
+
+def get_stock_ledger() -> StockLedger | None:
+    """The active stock ledger; ``BARAKA_LEDGER=<dir>`` opens a persisted one on first use."""
+    global _ledger_configured
+    if not _ledger_configured:
+        path = os.environ.get("BARAKA_LEDGER")
+        if path:
+            set_stock_ledger(StockLedger.open(path))
+        _ledger_configured = True  # nothing cached differs when no ledger is configured
+    return _ledger
+
+
+def _sourced(func: Callable) -> Callable:
+    """Route a loader to the method of the same name on the active data source.
+
+    The synthetic generator stays reachable as ``func.__wrapped__``.
+    """
+
+    label = f"data.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        source = get_data_source()
+        with perf.span(label):
+            if source is None:
+                return func(*args, **kwargs)
+            return getattr(source, func.__name__)(*args, **kwargs)
+
+    return wrapper
+
+
+def _wraps_loader(func: Callable) -> Callable[[Callable], Callable]:
+    """``functools.wraps`` for decorators stacked on ``_sourced``.
+
+    ``__wrapped__`` keeps pointing at the synthetic generator rather than the next layer.
+    """
+
+    def decorate(wrapper: Callable) -> Callable:
+        functools.update_wrapper(wrapper, func)
+        wrapper.__wrapped__ = func.__wrapped__
+        return wrapper
+
+    return decorate
+
+
+def _conformed(table: str) -> Callable[[Callable], Callable]:
+    """Validate a loader's frame and give it the compact dtypes of ``schema.SCHEMAS[table]``."""
+
+    def decorator(func: Callable) -> Callable:
+        @_wraps_loader(func)
+        def wrapper(*args, **kwargs):
+            return conform(table, func(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
+
 
 def _today() -> pd.Timestamp:
     return pd.Timestamp.today().normalize()
 
 
+def _in_cents(df: pd.DataFrame, *columns: str) -> pd.DataFrame:
+    # Demo amounts are written in shillings; loaders hand out minor units (schema.MINOR_UNITS)
+    return df.assign(**{column: df[column] * MINOR_UNITS for column in columns})
+
+
+@_conformed("sales_by_day")
+@_sourced
 def get_sales_by_day(num_days: int = 30, seed: int = 42) -> pd.DataFrame:
-    np.random.seed(seed)
+    # RandomState draws the same stream the old per-day np.random.randint loop did,
+    # without reseeding the global RNG
+    rng = np.random.RandomState(seed)
     end = _today()
     dates = pd.date_range(end - timedelta(days=num_days - 1), end)
-    revenues = []
-    for i, d in enumerate(dates):
-        base = 300 + math.sin(i / 2.0) * 80
-        weekend_boost = 200 if d.weekday() >= 5 else 0
-        noise = np.random.randint(0, 120)
-        revenues.append(int(base + weekend_boost + noise))
+    base = 300 + np.sin(np.arange(num_days) / 2.0) * 80
+    weekend_boost = np.where(dates.weekday >= 5, 200, 0)
+    noise = rng.randint(0, 120, size=num_days)
+    revenues = (base + weekend_boost + noise).astype(np.int64) * MINOR_UNITS
     df = pd.DataFrame({"date": dates, "revenue": revenues})
     return df
 
 
+# Share of a trading day's units sold in each hour (06:00-22:00 open)
+_HOURLY_PROFILE = np.array(
+    [0, 0, 0, 0, 0, 0, 2, 5, 7, 6, 5, 6, 8, 7, 5, 5, 6, 8, 10, 9, 6, 4, 2, 0], dtype=float
+)
+_HOURLY_PROFILE /= _HOURLY_PROFILE.sum()
+
+
+@_conformed("sales_detail")
+@_sourced
+def get_sales_detail(
+    num_days: int = 30,
+    stores: Sequence[str] = ("Main",),
+    skus: pd.DataFrame | None = None,
+    freq: str = "D",
+    seed: int = 42,
+) -> pd.DataFrame:
+    """Per-store, per-SKU sales at daily (``freq="D"``) or hourly (``freq="h"``) grain.
+
+    The whole (period x store x SKU) grid is drawn in one vectorized pass from a local
+    ``np.random.Generator``, so years of history for many branches take milliseconds.
+    ``skus`` needs ``sku`` and ``price`` (minor units) columns and defaults to the inventory.
+    """
+    if freq not in ("D", "h"):
+        raise ValueError(f"freq must be 'D' or 'h', got {freq!r}")
+    rng = np.random.default_rng(seed)
+    if skus is None:
+        skus = get_inventory()
+    stores = list(stores)
+    prices = skus["price"].to_numpy()
+    n_stores, n_skus = len(stores), len(prices)
+
+    end = _today()
+    start = end - timedelta(days=num_days - 1)
+    day_idx = np.arange(num_days)
+    days = pd.date_range(start, periods=num_days, freq="D")
+    # Same daily shape as get_sales_by_day: slow wave plus a weekend lift
+    day_factor = 1 + np.sin(day_idx / 2.0) * 80 / 300 + np.where(days.weekday >= 5, 200 / 300, 0)
+    if freq == "h":
+        periods = pd.date_range(start, periods=num_days * 24, freq="h")
+        period_factor = np.repeat(day_factor, 24) * np.tile(_HOURLY_PROFILE, num_days)
+    else:
+        periods = days
+        period_factor = day_factor
+
+    base_units = np.clip(3000 * MINOR_UNITS / np.maximum(prices.astype(float), 1), 0.5, 80)
+    store_factor = rng.uniform(0.6, 1.4, size=n_stores)
+    lam = period_factor[:, None, None] * store_factor[None, :, None] * base_units[None, None, :]
+    units = rng.poisson(lam).reshape(-1)
+
+    n_periods = len(periods)
+    store_codes = np.tile(np.repeat(np.arange(n_stores), n_skus), n_periods)
+    sku_codes = np.tile(np.arange(n_skus), n_periods * n_stores)
+    return pd.DataFrame(
+        {
+            "date": np.repeat(periods.to_numpy(), n_stores * n_skus),
+            "store": pd.Categorical.from_codes(store_codes, categories=stores),
+            "sku": pd.Categorical.from_codes(sku_codes, categories=skus["sku"].tolist()),
+            "units": units,
+            "revenue": units * np.tile(prices, n_periods * n_stores),
+        }
+    )
+
+
+@_conformed("top_sellers")
+@_sourced
 def get_top_sellers() -> pd.DataFrame:
     data = [
         {"sku": "BAN-001", "name": "Bananas (kg)", "category": "Produce", "sold": 420, "revenue": 8400, "margin": 0.25},
@@ -32,9 +215,24 @@ def get_top_sellers() -> pd.DataFrame:
         {"sku": "SODA-330", "name": "Cola 330ml", "category": "Beverage", "sold": 260, "revenue": 39000, "margin": 0.40},
         {"sku": "ICE-1L", "name": "Ice Cream 1L", "category": "Frozen", "sold": 150, "revenue": 15000, "margin": 0.35},
     ]
-    return pd.DataFrame(data)
+    return _in_cents(pd.DataFrame(data), "revenue")
+
+
+def _ledgered(func: Callable) -> Callable:
+    """Overlay current ledger balances and earliest lot expiry on an inventory loader."""
 
+    @_wraps_loader(func)
+    def wrapper(*args, **kwargs):
+        ledger = get_stock_ledger()
+        inventory = func(*args, **kwargs)
+        return inventory if ledger is None else ledger.apply_to(inventory)
 
+    return wrapper
+
+
+@_conformed("inventory")
+@_ledgered
+@_sourced
 def get_inventory() -> pd.DataFrame:
     today = _today()
     data = [
@@ -52,10 +250,41 @@ def get_inventory() -> pd.DataFrame:
         {"sku": "CHICK-1KG", "name": "Chicken 1kg", "category": "Butchery", "qty": 9, "expiry": today + timedelta(days=3), "cost": 360, "price": 520, "supplier": "FreshFarms"},
         {"sku": "DET-1L", "name": "Detergent 1L", "category": "Household", "qty": 27, "expiry": today + timedelta(days=900), "cost": 200, "price": 320, "supplier": "CleanSupplies"},
     ]
-    df = pd.DataFrame(data)
-    return df
+    return _in_cents(pd.DataFrame(data), "cost", "price")
+
+
+# Demo branch -> relative trading volume; "Main" is the get_sales_by_day series itself
+_DEMO_BRANCH_SCALE = {"Main": 1.0, "Westlands": 0.8, "Thika Road": 0.6, "Nyali": 0.9, "Nakuru": 0.7}
 
 
+@_conformed("branches")
+@_sourced
+def get_branches() -> pd.DataFrame:
+    """Branches with their region and share of chain operating expenses."""
+    data = [
+        {"store": "Main", "region": "Nairobi", "expense_share": 0.30},
+        {"store": "Westlands", "region": "Nairobi", "expense_share": 0.20},
+        {"store": "Thika Road", "region": "Nairobi", "expense_share": 0.15},
+        {"store": "Nyali", "region": "Coast", "expense_share": 0.20},
+        {"store": "Nakuru", "region": "Rift Valley", "expense_share": 0.15},
+    ]
+    return pd.DataFrame(data)
+
+
+@_conformed("branch_sales")
+@_sourced
+def get_branch_sales(num_days: int = 90, seed: int = 42) -> pd.DataFrame:
+    """Daily revenue per branch (``date``, ``store``, ``revenue``)."""
+    frames = []
+    for i, store in enumerate(get_branches.__wrapped__()["store"]):
+        daily = get_sales_by_day.__wrapped__(num_days, seed + i)
+        daily["revenue"] = (daily["revenue"] * _DEMO_BRANCH_SCALE.get(store, 1.0)).round().astype(np.int64)
+        frames.append(daily.assign(store=store))
+    return pd.concat(frames, ignore_index=True)[["date", "store", "revenue"]]
+
+
+@_conformed("suppliers")
+@_sourced
 def get_suppliers() -> pd.DataFrame:
     data = [
         {"name": "DairyCo", "lastPrice": 78, "avgLeadDays": 2},
@@ -66,9 +295,11 @@ def get_suppliers() -> pd.DataFrame:
         {"name": "FreshFarms", "lastPrice": 300, "avgLeadDays": 3},
         {"name": "CleanSupplies", "lastPrice": 190, "avgLeadDays": 6},
     ]
-    return pd.DataFrame(data)
+    return _in_cents(pd.DataFrame(data), "lastPrice")
 
 
+@_conformed("expenses")
+@_sourced
 def get_expenses() -> pd.DataFrame:
     data = [
         {"type": "Rent", "amount": 80000},
@@ -77,9 +308,11 @@ def get_expenses() -> pd.DataFrame:
         {"type": "Supplies", "amount": 12000},
         {"type": "Logistics", "amount": 9000},
     ]
-    return pd.DataFrame(data)
+    return _in_cents(pd.DataFrame(data), "amount")
 
 
+@_conformed("orders")
+@_sourced
 def get_orders() -> pd.DataFrame:
     data = [
         {"id": "ORD-1001", "customer": "Asha W.", "items": 5, "total": 1200, "status": "Delivered"},
@@ -89,17 +322,116 @@ def get_orders() -> pd.DataFrame:
         {"id": "ORD-1005", "customer": "Baraka Online", "items": 8, "total": 3200, "status": "Dispatched"},
         {"id": "ORD-1006", "customer": "Office NextDoor", "items": 14, "total": 5600, "status": "Pending"},
     ]
-    return pd.DataFrame(data)
+    return _in_cents(pd.DataFrame(data), "total")
 
 
-def get_basket_pairs() -> pd.DataFrame:
-    """Dummy co-purchase pairs for bundle ideas."""
-    data = [
-        {"item_a": "Bread", "item_b": "Milk", "count": 180},
-        {"item_a": "Rice 5kg", "item_b": "Cooking Oil 5L", "count": 95},
-        {"item_a": "Eggs", "item_b": "Bread", "count": 120},
-        {"item_a": "Cola 330ml", "item_b": "Chips", "count": 140},
-    ]
-    return pd.DataFrame(data)
+# Co-purchases planted in the demo baskets: (sku, companion, probability)
+_DEMO_AFFINITIES = [
+    ("BREAD-TR", "MILK-1L", 0.45),
+    ("RICE-5KG", "OIL-05L", 0.5),
+    ("EGG-30", "BREAD-TR", 0.35),
+    ("FLOUR-2KG", "SUGAR-1KG", 0.3),
+]
+
+
+def get_baskets(
+    num_baskets: int = 20_000,
+    skus: pd.DataFrame | None = None,
+    seed: int = 42,
+    affinities: Sequence[Tuple[str, str, float]] = tuple(_DEMO_AFFINITIES),
+) -> pd.DataFrame:
+    """Synthetic transaction lines (``basket_id``, ``sku``) with planted ``affinities``.
+
+    Items are drawn in proportion to how fast they sell (cheaper lines sell more), all in
+    one vectorized pass.
+    """
+    rng = np.random.default_rng(seed)
+    if skus is None:
+        skus = get_inventory()
+    codes = skus["sku"].to_numpy()
+    weights = np.clip(3000 * MINOR_UNITS / np.maximum(skus["price"].to_numpy(dtype=float), 1), 0.5, 80)
+    sizes = rng.poisson(2.5, num_baskets) + 1
+    basket_ids = np.repeat(np.arange(num_baskets), sizes)
+    items = rng.choice(len(codes), size=len(basket_ids), p=weights / weights.sum())
+
+    position = {sku: i for i, sku in enumerate(codes)}
+    extra_baskets, extra_items = [basket_ids], [items]
+    for sku, companion, prob in affinities:
+        if sku in position and companion in position:
+            hit = (items == position[sku]) & (rng.random(len(items)) < prob)
+            extra_baskets.append(basket_ids[hit])
+            extra_items.append(np.full(int(hit.sum()), position[companion]))
+    basket_ids = np.concatenate(extra_baskets)
+    items = np.concatenate(extra_items)
+    order = np.argsort(basket_ids, kind="stable")
+    return pd.DataFrame({"basket_id": basket_ids[order], "sku": codes[items[order]]})
+
+
+def _name_pairs(pairs: pd.DataFrame, inventory: pd.DataFrame) -> pd.DataFrame:
+    names = dict(zip(inventory["sku"], inventory["name"]))
+    return pairs.assign(item_a=pairs["item_a"].map(names).fillna(pairs["item_a"]), item_b=pairs["item_b"].map(names).fillna(pairs["item_b"]))
+
+
+@_sourced
+def get_basket_pairs(top: int = 10) -> pd.DataFrame:
+    """Top co-purchase pairs for bundle ideas, mined from the demo baskets."""
+    inventory = get_inventory()
+    pairs = mine(get_baskets(skus=inventory)).bundles(top, min_count=20)
+    return _name_pairs(pairs, inventory)
+
+
+def _ledger_filtered(func: Callable) -> Callable:
+    # With a ledger the live quantities aren't in the source's table, so filter the
+    # overlaid frame (the demo implementation) instead of querying the source.
+    @_wraps_loader(func)
+    def wrapper(*args, **kwargs):
+        if get_stock_ledger() is None:
+            return func(*args, **kwargs)
+        return func.__wrapped__(*args, **kwargs)
+
+    return wrapper
+
+
+@_ledger_filtered
+@_sourced
+def query_inventory(
+    supplier: str | None = None,
+    max_qty: int | None = None,
+    expiry_within_days: int | None = None,
+    sort_by: Sequence[str] = ("days_to_expiry", "name"),
+    page: int = 0,
+    page_size: int | None = 50,
+) -> Tuple[pd.DataFrame, int]:
+    """One page of inventory (with ``days_to_expiry``) matching the filters, plus the match count."""
+    inv = get_inventory()
+    days = (pd.to_datetime(inv["expiry"]) - _today()).dt.days.to_numpy()
+    mask = np.ones(len(inv), dtype=bool)
+    if supplier:
+        mask &= (inv["supplier"] == supplier).to_numpy()
+    if max_qty is not None:
+        mask &= inv["qty"].to_numpy() <= max_qty
+    if expiry_within_days is not None:
+        mask &= days <= expiry_within_days
+    return paginate_frame(inv, mask, sort_by, page, page_size, extra={"days_to_expiry": days})
+
+
+@_sourced
+def query_orders(
+    statuses: Sequence[str] = (), sort_by: Sequence[str] = ("id",), page: int = 0, page_size: int | None = 50
+) -> Tuple[pd.DataFrame, int]:
+    orders = get_orders()
+    mask = orders["status"].isin(list(statuses)).to_numpy() if statuses else None
+    return paginate_frame(orders, mask, sort_by, page, page_size)
+
+
+@_sourced
+def table_version(table: str) -> int:
+    """Counter bumped by every write to ``table`` (the demo data never changes)."""
+    return 0
 
 
+@_sourced
+def list_values(table: str, column: str) -> List:
+    """Sorted distinct values of ``column`` (for filter widgets)."""
+    frames = {"inventory": get_inventory, "orders": get_orders, "suppliers": get_suppliers, "expenses": get_expenses}
+    return sorted(frames[table]()[column].dropna().unique().tolist())
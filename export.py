@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import gzip
+import io
+from typing import IO, Callable, Dict, Iterable, Iterator, Tuple
+import pandas as pd
+
+# format -> (file extension, MIME type)
+FORMATS: Dict[str, Tuple[str, str]] = {
+    "CSV": ("csv", "text/csv"),
+    "CSV (gzip)": ("csv.gz", "application/gzip"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+CHUNK_ROWS = 50_000
+
+
+def frame_chunks(df: pd.DataFrame, chunksize: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    # An empty frame still yields once so the export gets a header/schema
+    for start in range(0, max(len(df), 1), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+
+def query_chunks(fetch: Callable[[int, int], Tuple[pd.DataFrame, int]], chunksize: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Walk a paged ``fetch(page, page_size)`` query (e.g. ``data.query_inventory``) page by page."""
+    page = 0
+    while True:
+        rows, total = fetch(page, chunksize)
+        if len(rows) or page == 0:
+            yield rows
+        page += 1
+        if page * chunksize >= total or rows.empty:
+            return
+
+
+def write_export(chunks: Iterable[pd.DataFrame], fmt: str, out: IO[bytes]) -> int:
+    """Stream ``chunks`` into ``out`` as CSV, gzip-CSV or Parquet; returns rows written.
+
+    Only one chunk is held in memory at a time.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; choose from {list(FORMATS)}")
+    rows = 0
+    if fmt == "Parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(out, table.schema, compression="zstd")
+                writer.write_table(table.cast(writer.schema))
+                rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+    raw = gzip.GzipFile(fileobj=out, mode="wb") if fmt == "CSV (gzip)" else out
+    text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+    try:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(text, index=False, header=i == 0)
+            rows += len(chunk)
+    finally:
+        text.flush()
+        text.detach()
+        if raw is not out:
+            raw.close()
+    return rows
+
+
+def export_file(chunks: Iterable[pd.DataFrame], fmt: str) -> io.BytesIO:
+    """Write an export into an in-memory file, rewound and ready to hand to ``st.download_button``.
+
+    Streamlit needs the finished bytes, so the encoded file (not a DataFrame plus its CSV
+    text) is the only full copy held.
+    """
+    out = io.BytesIO()
+    write_export(chunks, fmt, out)
+    out.seek(0)
+    return out
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import itertools
+import time
+from statistics import NormalDist
+from typing import Callable, Dict, List, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+# Every model takes a (n_series, T) matrix of daily values and returns
+# (point forecasts (n_series, horizon), one-step in-sample residual std (n_series,)).
+# Series are fitted together with array ops, so thousands of SKU x store series cost
+# about as much as one.
+
+SEASON = 7
+
+
+def _as_matrix(y) -> np.ndarray:
+    y = np.asarray(y, dtype=float)
+    return y[None, :] if y.ndim == 1 else y
+
+
+def _mean_model(y: np.ndarray, horizon: int) -> Tuple[np.ndarray, np.ndarray]:
+    # Fallback for series shorter than one season
+    level = y.mean(axis=1, keepdims=True)
+    return np.repeat(level, horizon, axis=1), y.std(axis=1)
+
+
+def seasonal_naive(y, horizon: int = 7, season: int = SEASON) -> Tuple[np.ndarray, np.ndarray]:
+    """Repeat the last observed season."""
+    y = _as_matrix(y)
+    n, t = y.shape
+    if t < season:
+        return _mean_model(y, horizon)
+    last = y[:, -season:]
+    preds = last[:, np.arange(horizon) % season]
+    resid = y[:, season:] - y[:, :-season]
+    sigma = resid.std(axis=1) if resid.shape[1] else np.zeros(n)
+    return preds, sigma
+
+
+def weekday_profile(y, horizon: int = 7, season: int = SEASON, weeks: int = 4) -> Tuple[np.ndarray, np.ndarray]:
+    """Last week's level scaled by each weekday's share over the last ``weeks`` weeks."""
+    y = _as_matrix(y)
+    n, t = y.shape
+    w = min(weeks, t // season)
+    if w == 0:
+        return _mean_model(y, horizon)
+    block = y[:, t - w * season:].reshape(n, w, season)
+    overall = block.mean(axis=(1, 2))
+    share = np.divide(block.mean(axis=1), overall[:, None], out=np.ones((n, season)), where=overall[:, None] != 0)
+    level = y[:, -season:].mean(axis=1)
+    preds = level[:, None] * share[:, np.arange(horizon) % season]
+    fitted = (block.mean(axis=2, keepdims=True) * share[:, None, :]).reshape(n, -1)
+    sigma = (y[:, t - w * season:] - fitted).std(axis=1)
+    return preds, sigma
+
+
+# (alpha, beta, gamma) candidates searched per series
+HW_GRID = list(itertools.product([0.1, 0.3, 0.6], [0.0, 0.05], [0.05, 0.2, 0.4]))
+
+
+def holt_winters(y, horizon: int = 7, season: int = SEASON, grid: Sequence[Tuple[float, float, float]] = HW_GRID) -> Tuple[np.ndarray, np.ndarray]:
+    """Additive Holt-Winters, choosing the best (alpha, beta, gamma) per series.
+
+    All grid points and series are smoothed in one pass over time with
+    (grid, series) shaped state, then each series keeps its lowest-SSE parameters.
+    """
+    y = _as_matrix(y)
+    n, t = y.shape
+    if t < season:
+        return _mean_model(y, horizon)
+    params = np.asarray(grid, dtype=float)
+    alpha, beta, gamma = (params[:, i, None] for i in range(3))
+    g = len(params)
+
+    first = y[:, :season].mean(axis=1)
+    trend0 = (y[:, season:2 * season].mean(axis=1) - first) / season if t >= 2 * season else np.zeros(n)
+    level = np.broadcast_to(first, (g, n)).copy()
+    trend = np.broadcast_to(trend0, (g, n)).copy()
+    seasonal = np.broadcast_to(y[:, :season] - first[:, None], (g, n, season)).copy()
+    sse = np.zeros((g, n))
+
+    for i in range(t):
+        s_idx = i % season
+        obs = y[:, i]
+        s_prev = seasonal[:, :, s_idx]
+        err = obs - (level + trend + s_prev)
+        if i >= season:
+            sse += err * err
+        new_level = alpha * (obs - s_prev) + (1 - alpha) * (level + trend)
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        seasonal[:, :, s_idx] = gamma * (obs - new_level) + (1 - gamma) * s_prev
+        level = new_level
+
+    best = sse.argmin(axis=0)
+    cols = np.arange(n)
+    steps = np.arange(1, horizon + 1)
+    season_idx = (t + steps - 1) % season
+    preds = level[best, cols, None] + trend[best, cols, None] * steps + seasonal[best, cols][:, season_idx]
+    sigma = np.sqrt(sse[best, cols] / max(t - season, 1))
+    return preds, sigma
+
+
+MODELS: Dict[str, Callable] = {
+    "seasonal_naive": seasonal_naive,
+    "holt_winters": holt_winters,
+    "weekday_profile": weekday_profile,
+}
+
+
+def forecast(y, horizon: int = 7, model: str = "weekday_profile", level: float = 0.9) -> Dict[str, np.ndarray]:
+    """Point forecasts with ``level`` prediction intervals for each row of ``y``.
+
+    Interval width grows with the square root of the step ahead.
+    """
+    if model not in MODELS:
+        raise ValueError(f"Unknown model {model!r}; choose from {sorted(MODELS)}")
+    preds, sigma = MODELS[model](y, horizon)
+    z = NormalDist().inv_cdf((1 + level) / 2)
+    width = z * sigma[:, None] * np.sqrt(np.arange(1, horizon + 1))
+    return {"mean": preds, "lower": np.maximum(preds - width, 0), "upper": preds + width}
+
+
+def series_matrix(detail: pd.DataFrame, keys: Sequence[str] = ("store", "sku"), value: str = "revenue") -> Tuple[np.ndarray, pd.Index, pd.DatetimeIndex]:
+    """Pivot long sales rows (e.g. ``data.get_sales_detail``) into a (series, day) matrix."""
+    wide = detail.pivot_table(index=list(keys), columns="date", values=value, aggfunc="sum", fill_value=0, observed=True)
+    return wide.to_numpy(dtype=float), wide.index, pd.DatetimeIndex(wide.columns)
+
+
+def forecast_frame(sales: pd.DataFrame, horizon: int = 7, model: str = "weekday_profile", level: float = 0.9) -> pd.DataFrame:
+    """Forecast a single daily ``date``/``revenue`` frame into ``date``/``predicted``/``lower``/``upper``."""
+    sales_sorted = sales.sort_values("date")
+    result = forecast(sales_sorted["revenue"].to_numpy(), horizon, model, level)
+    last_date = pd.to_datetime(sales_sorted["date"].max())
+    return pd.DataFrame(
+        {
+            "date": pd.date_range(last_date + pd.Timedelta(days=1), periods=horizon),
+            "predicted": result["mean"][0].round().astype(int),
+            "lower": result["lower"][0].round().astype(int),
+            "upper": result["upper"][0].round().astype(int),
+        }
+    )
+
+
+def mape(actual: np.ndarray, predicted: np.ndarray) -> float:
+    mask = actual != 0
+    if not mask.any():
+        return float("nan")
+    return float(np.mean(np.abs(actual[mask] - predicted[mask]) / np.abs(actual[mask])) * 100)
+
+
+def backtest(y, horizon: int = 7, folds: int = 4, models: List[str] | None = None) -> pd.DataFrame:
+    """Rolling-origin backtest: MAPE and total fit+forecast seconds per model.
+
+    The last ``folds * horizon`` days are forecast ``horizon`` at a time, each fold
+    trained on everything before it.
+    """
+    y = _as_matrix(y)
+    t = y.shape[1]
+    rows = []
+    for name in models or list(MODELS):
+        errors, seconds = [], 0.0
+        for fold in range(folds, 0, -1):
+            cut = t - fold * horizon
+            if cut <= 0:
+                continue
+            start = time.perf_counter()
+            preds, _ = MODELS[name](y[:, :cut], horizon)
+            seconds += time.perf_counter() - start
+            errors.append(mape(y[:, cut:cut + horizon], preds))
+        rows.append({"model": name, "mape": float(np.nanmean(errors)) if errors else float("nan"), "seconds": seconds})
+    return pd.DataFrame(rows)
+
+
+def main() -> None:
+    import data
+
+    sales = data.get_sales_by_day(365)
+    print("Daily revenue (365 days):")
+    print(backtest(sales["revenue"].to_numpy()).to_string(index=False))
+    detail = data.get_sales_detail(365, stores=[f"Branch {i}" for i in range(20)])
+    matrix, _, _ = series_matrix(detail)
+    print(f"\nStore x SKU revenue ({matrix.shape[0]} series):")
+    print(backtest(matrix).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Iterator, List, Protocol, Sequence, Tuple
+import numpy as np
+
+from schema import to_minor_units
+
+# Order and status-change events, one JSON object per line/message:
+#   {"type": "order", "id": "ORD-2001", "customer": "Asha W.", "items": 5, "total": 1200, "status": "Pending"}
+#   {"type": "status", "id": "ORD-2001", "status": "Delivered"}
+# An "order" event inserts or replaces the whole order; a "status" event changes one field.
+# ``total`` is in shillings on the wire and stored in minor units.
+STATUSES = ("Pending", "Preparing", "Dispatched", "Delivered", "Cancelled")
+
+Event = Tuple[str, tuple]  # ("order", (id, customer, items, total, status)) or ("status", (status, id))
+
+
+class OrderSink(Protocol):
+    """Where batches go; ``store.SQLiteSource`` implements it."""
+
+    def write_orders(self, orders: Sequence[tuple], status_changes: Sequence[tuple]) -> int: ...
+
+
+def parse_event(raw: Any) -> Event:
+    """Validate one event (JSON text/bytes or a dict) into the tuple form the sinks take."""
+    event = raw if isinstance(raw, dict) else json.loads(raw)
+    kind = event.get("type")
+    status = str(event["status"])
+    if kind == "order":
+        return kind, (str(event["id"]), str(event.get("customer", "")), int(event["items"]), int(to_minor_units(event["total"])), status)
+    if kind == "status":
+        return kind, (status, str(event["id"]))
+    raise ValueError(f"Unknown event type {kind!r}; expected 'order' or 'status'")
+
+
+def compact(events: Sequence[Event]) -> Tuple[List[tuple], List[tuple]]:
+    """Collapse a batch to one row per new order plus the last status change per order.
+
+    A status change for an order created in the same batch is folded into its row, so
+    the result can be written as "upsert orders, then update statuses" in any order.
+    """
+    orders: dict = {}
+    changes: dict = {}
+    for kind, values in events:
+        if kind == "order":
+            orders[values[0]] = values
+            changes.pop(values[0], None)
+        elif values[1] in orders:
+            orders[values[1]] = orders[values[1]][:4] + (values[0],)
+        else:
+            changes[values[1]] = values
+    return list(orders.values()), list(changes.values())
+
+
+@dataclass
+class IngestStats:
+    received: int = 0
+    rejected: int = 0
+    written: int = 0
+    batches: int = 0
+    max_pending: int = 0  # deepest the queue got; equals the limit while back-pressure applies
+    seconds: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self.received / self.seconds if self.seconds else 0.0
+
+
+_DONE = object()
+
+
+class OrderIngestor:
+    """Stream order events from an async source into a store in batched transactions.
+
+    Parsed events wait in a queue of at most ``max_pending``; when the store falls
+    behind, the source is no longer read (a file stops being tailed, socket clients are
+    throttled by TCP) instead of memory growing. A writer task takes whatever is queued,
+    up to ``batch_size`` events, waiting at most ``flush_interval`` seconds for a batch
+    to fill, and writes it in a worker thread so reading continues meanwhile.
+    """
+
+    def __init__(self, sink: OrderSink, batch_size: int = 2000, flush_interval: float = 0.05, max_pending: int = 20_000):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.stats = IngestStats()
+
+    async def run(self, source: AsyncIterator[Any]) -> IngestStats:
+        """Consume ``source`` until it ends (or this task is cancelled), then flush.
+
+        If the sink raises, reading stops and the sink's exception is raised from here.
+        """
+        queue: asyncio.Queue = asyncio.Queue(self.max_pending)
+        writer = asyncio.create_task(self._write(queue))
+        start = time.perf_counter()
+        stats = self.stats
+        try:
+            async for raw in source:
+                try:
+                    event = parse_event(raw)
+                except (ValueError, TypeError, KeyError, AttributeError):
+                    stats.rejected += 1
+                    continue
+                await self._put(queue, event, writer)
+                stats.received += 1
+                stats.max_pending = max(stats.max_pending, queue.qsize())
+        finally:
+            try:
+                if not writer.done():
+                    await self._put(queue, _DONE, writer)
+                await writer
+            finally:
+                stats.seconds += time.perf_counter() - start
+        return stats
+
+    @staticmethod
+    async def _put(queue: asyncio.Queue, item: Any, writer: asyncio.Task) -> None:
+        # Wait for room in the queue, unless the writer dies first: a full queue is then
+        # never drained again
+        if queue.full():
+            put = asyncio.ensure_future(queue.put(item))
+            await asyncio.wait({put, writer}, return_when=asyncio.FIRST_COMPLETED)
+            if not put.done():
+                put.cancel()
+        else:
+            queue.put_nowait(item)
+        if writer.done():
+            writer.result()  # re-raises the sink's error
+            if item is not _DONE:
+                raise RuntimeError("Order writer stopped before the end of the stream")
+
+    def _drain(self, queue: asyncio.Queue, batch: list) -> bool:
+        while len(batch) < self.batch_size and not queue.empty():
+            item = queue.get_nowait()
+            if item is _DONE:
+                return True
+            batch.append(item)
+        return False
+
+    async def _write(self, queue: asyncio.Queue) -> None:
+        done = False
+        while not done:
+            first = await queue.get()
+            if first is _DONE:
+                return
+            batch = [first]
+            done = self._drain(queue, batch)
+            if not done and len(batch) < self.batch_size and self.flush_interval:
+                await asyncio.sleep(self.flush_interval)
+                done = self._drain(queue, batch)
+            orders, changes = compact(batch)
+            self.stats.written += await asyncio.to_thread(self.sink.write_orders, orders, changes)
+            self.stats.batches += 1
+
+
+# Sources: async iterators of raw events
+
+
+async def queue_source(queue: asyncio.Queue) -> AsyncIterator[Any]:
+    """Events put on an in-process ``asyncio.Queue``; ``None`` ends the stream."""
+    while True:
+        item = await queue.get()
+        if item is None:
+            return
+        yield item
+
+
+async def tail_source(path: str, follow: bool = True, poll: float = 0.25) -> AsyncIterator[str]:
+    """Lines of a JSON-lines file from the start, then lines appended to it (``tail -f``).
+
+    Without ``follow`` the stream ends at end of file.
+    """
+    partial = ""
+    with open(path, "r", encoding="utf-8") as f:
+        while True:
+            lines = f.readlines(1 << 16)
+            if not lines:
+                if not follow:
+                    break
+                await asyncio.sleep(poll)
+                continue
+            lines[0] = partial + lines[0]
+            partial = "" if lines[-1].endswith("\n") else lines.pop()
+            for line in lines:
+                yield line
+    if partial:
+        yield partial
+
+
+async def socket_source(
+    host: str = "127.0.0.1", port: int = 9009, max_pending: int = 10_000, started: asyncio.Event | None = None
+) -> AsyncIterator[bytes]:
+    """Newline-delimited events from any number of TCP clients; runs until cancelled.
+
+    A client's connection is only read while there is room in the ``max_pending`` line
+    buffer, so a fast producer is slowed to the ingestion rate. ``started`` is set once
+    the server is listening.
+    """
+    lines: asyncio.Queue = asyncio.Queue(max_pending)
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            async for line in reader:
+                await lines.put(line)
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port, limit=1 << 20)
+    async with server:
+        if started is not None:
+            started.set()
+        while True:
+            yield await lines.get()
+
+
+def demo_events(n: int, seed: int = 0, first_id: int = 2001) -> Iterator[dict]:
+    """``n`` plausible events: new orders interleaved with status moves of open ones."""
+    rng = np.random.default_rng(seed)
+    customers = ["Asha W.", "John K.", "Farmers Coop", "Mary N.", "Baraka Online", "Office NextDoor", "Peter O.", "Grace M."]
+    open_ids: List[str] = []
+    steps: dict = {}
+    next_id = first_id
+    for _ in range(n):
+        if open_ids and rng.random() < 0.6:
+            pos = int(rng.integers(len(open_ids)))
+            order_id = open_ids[pos]
+            step = steps[order_id] + 1 if rng.random() > 0.05 else STATUSES.index("Cancelled")
+            steps[order_id] = step
+            if step >= STATUSES.index("Delivered"):
+                open_ids[pos] = open_ids[-1]
+                open_ids.pop()
+                del steps[order_id]
+            yield {"type": "status", "id": order_id, "status": STATUSES[step]}
+        else:
+            order_id = f"ORD-{next_id}"
+            next_id += 1
+            items = int(rng.integers(1, 40))
+            open_ids.append(order_id)
+            steps[order_id] = 0
+            yield {
+                "type": "order",
+                "id": order_id,
+                "customer": customers[rng.integers(len(customers))],
+                "items": items,
+                "total": int(items * rng.integers(80, 600)),
+                "status": STATUSES[0],
+            }
+
+
+async def _paced(events: Iterator[dict], rate: float) -> AsyncIterator[dict]:
+    start = time.perf_counter()
+    for i, event in enumerate(events):
+        ahead = i / rate - (time.perf_counter() - start)
+        if ahead > 0:
+            await asyncio.sleep(ahead)
+        yield event
+
+
+def main(argv: List[str] | None = None) -> None:
+    from store import SQLiteSource
+
+    parser = argparse.ArgumentParser(description="Stream order events into the Baraka SQLite store")
+    parser.add_argument("--db", default="baraka.db", help="SQLite file (default: baraka.db)")
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--max-pending", type=int, default=20_000)
+    sub = parser.add_subparsers(dest="command", required=True)
+    tail = sub.add_parser("tail", help="follow a JSON-lines file of events")
+    tail.add_argument("path")
+    tail.add_argument("--no-follow", action="store_true", help="stop at end of file")
+    listen = sub.add_parser("listen", help="accept newline-delimited JSON events over TCP")
+    listen.add_argument("--host", default="127.0.0.1")
+    listen.add_argument("--port", type=int, default=9009)
+    demo = sub.add_parser("demo", help="generate demo events at a steady rate")
+    demo.add_argument("--events", type=int, default=100_000)
+    demo.add_argument("--rate", type=float, default=200, help="events per second")
+    args = parser.parse_args(argv)
+
+    if args.command == "tail":
+        source = tail_source(args.path, follow=not args.no_follow)
+    elif args.command == "listen":
+        source = socket_source(args.host, args.port, args.max_pending)
+    else:
+        source = _paced(demo_events(args.events), args.rate)
+    ingestor = OrderIngestor(SQLiteSource(args.db), args.batch_size, max_pending=args.max_pending)
+    try:
+        asyncio.run(ingestor.run(source))
+    except KeyboardInterrupt:
+        pass
+    s = ingestor.stats
+    print(f"{s.received:,} events ({s.rejected:,} rejected) in {s.batches:,} batches, {s.rate:,.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import bisect
+import json
+import os
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Tuple
+import pandas as pd
+
+# Movement kind -> sign applied to the quantity
+MOVEMENT_SIGNS = {"receipt": 1, "return": 1, "sale": -1, "write_off": -1}
+
+# Listener called with (sku, on_hand, earliest_expiry ordinal or None) after each change
+Listener = Callable[[str, int, "int | None"], None]
+# Called once per recorded batch with the SKUs it changed
+BatchListener = Callable[[List[str]], None]
+
+
+class StockLedger:
+    """Append-only stock movements with per-SKU running balances and expiry lots.
+
+    Every receipt, sale, return and write-off is appended to the log and applied to the
+    running state at once, so ``on_hand`` and ``earliest_expiry`` are O(1) lookups and
+    nothing is replayed on page loads. Lots are kept in expiry order and consumed from
+    the front (first to expire, first out). Units sold beyond the lots on hand are owed
+    and the next receipts pay them off first, so the lots always add up to
+    ``max(on_hand, 0)``.
+
+    With a ``directory`` the log is persisted as ``movements.jsonl`` and a snapshot of
+    the state is written every ``snapshot_every`` movements; ``open`` restores the latest
+    snapshot and replays only the movements logged after it.
+    """
+
+    def __init__(self, directory: str | None = None, snapshot_every: int = 10_000):
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.seq = 0
+        self._on_hand: Dict[str, int] = {}
+        self._lots: Dict[str, List[List[int]]] = {}  # sku -> sorted [[expiry ordinal, qty], ...]
+        self._oversold: Dict[str, int] = {}  # sku -> units sold with no lot left to take them from
+        self._listeners: List[Listener] = []
+        self._batch_listeners: List[BatchListener] = []
+        self._log = None
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._log = open(os.path.join(directory, "movements.jsonl"), "a", encoding="utf-8")
+
+    @classmethod
+    def open(cls, directory: str, snapshot_every: int = 10_000) -> "StockLedger":
+        ledger = cls(None, snapshot_every)
+        offset = 0
+        snapshot_path = os.path.join(directory, "snapshot.json")
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, encoding="utf-8") as f:
+                state = json.load(f)
+            ledger.seq = state["seq"]
+            ledger._on_hand = state["on_hand"]
+            ledger._lots = state["lots"]
+            # Snapshots written before oversold units were tracked: an overdrawn SKU had no lots
+            ledger._oversold = state.get("oversold", {s: -q for s, q in ledger._on_hand.items() if q < 0})
+            offset = state["log_offset"]
+        log_path = os.path.join(directory, "movements.jsonl")
+        if os.path.exists(log_path):
+            with open(log_path, encoding="utf-8") as f:
+                f.seek(offset)
+                for line in f:
+                    m = json.loads(line)
+                    ledger._apply(m["kind"], m["sku"], m["qty"], m.get("expiry"))
+                    ledger.seq = m["seq"]
+        ledger.directory = directory
+        ledger._log = open(log_path, "a", encoding="utf-8")
+        return ledger
+
+    def subscribe(self, listener: Listener) -> None:
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Listener) -> None:
+        self._listeners.remove(listener)
+
+    def subscribe_batch(self, listener: BatchListener) -> None:
+        self._batch_listeners.append(listener)
+
+    def unsubscribe_batch(self, listener: BatchListener) -> None:
+        self._batch_listeners.remove(listener)
+
+    # Writes
+
+    def record(self, kind: str, sku: str, qty: int, expiry: date | pd.Timestamp | None = None) -> int:
+        """Append one movement; ``qty`` is positive, its sign comes from ``kind``."""
+        return self.record_batch([(kind, sku, qty, expiry)])
+
+    def record_batch(self, movements: Iterable[Tuple[str, str, int, object]]) -> int:
+        """Append ``(kind, sku, qty, expiry)`` movements; returns the last sequence number."""
+        changed = {}
+        lines = []
+        for kind, sku, qty, expiry in movements:
+            if kind not in MOVEMENT_SIGNS:
+                raise ValueError(f"Unknown movement kind {kind!r}; expected one of {sorted(MOVEMENT_SIGNS)}")
+            if qty < 0:
+                raise ValueError(f"Movement quantity must be positive, got {qty} for {sku!r}")
+            expiry_ord = None if expiry is None or pd.isna(expiry) else pd.Timestamp(expiry).toordinal()
+            self.seq += 1
+            self._apply(kind, sku, int(qty), expiry_ord)
+            changed[sku] = None
+            if self._log is not None:
+                lines.append(json.dumps({"seq": self.seq, "kind": kind, "sku": sku, "qty": int(qty), "expiry": expiry_ord}))
+            if self._log is not None and self.seq % self.snapshot_every == 0:
+                self._write(lines)
+                lines = []
+                self.snapshot()
+        if lines:
+            self._write(lines)
+        for sku in changed:
+            for listener in self._listeners:
+                listener(sku, self._on_hand[sku], self.earliest_expiry(sku))
+        if changed:
+            for batch_listener in self._batch_listeners:
+                batch_listener(list(changed))
+        return self.seq
+
+    def record_frame(self, movements: pd.DataFrame) -> int:
+        """Append movements from a frame with ``kind``, ``sku``, ``qty`` and optional ``expiry``."""
+        expiry = movements["expiry"] if "expiry" in movements else [None] * len(movements)
+        return self.record_batch(zip(movements["kind"], movements["sku"], movements["qty"], expiry))
+
+    def _write(self, lines: List[str]) -> None:
+        self._log.write("\n".join(lines) + "\n")
+        self._log.flush()
+
+    def _apply(self, kind: str, sku: str, qty: int, expiry: int | None) -> None:
+        sign = MOVEMENT_SIGNS[kind]
+        self._on_hand[sku] = self._on_hand.get(sku, 0) + sign * qty
+        lots = self._lots.setdefault(sku, [])
+        if sign > 0:
+            owed = self._oversold.get(sku, 0)
+            if owed:
+                paid = min(owed, qty)
+                qty -= paid
+                if owed == paid:
+                    del self._oversold[sku]
+                else:
+                    self._oversold[sku] = owed - paid
+                if not qty:
+                    return
+            if expiry is None:
+                # Undated returns go back onto the earliest lot, or an undated lot at the end
+                expiry = lots[0][0] if lots else date.max.toordinal()
+            i = bisect.bisect_left(lots, [expiry, -1])
+            if i < len(lots) and lots[i][0] == expiry:
+                lots[i][1] += qty
+            else:
+                lots.insert(i, [expiry, qty])
+        else:
+            remaining = qty
+            while remaining and lots:
+                take = min(remaining, lots[0][1])
+                lots[0][1] -= take
+                remaining -= take
+                if lots[0][1] == 0:
+                    lots.pop(0)
+            if remaining:
+                self._oversold[sku] = self._oversold.get(sku, 0) + remaining
+
+    def snapshot(self) -> None:
+        """Persist the current state so ``open`` only replays movements after this point."""
+        if self.directory is None:
+            raise ValueError("snapshot() needs a ledger directory")
+        self._log.flush()
+        state = {
+            "seq": self.seq,
+            "log_offset": self._log.tell(),
+            "on_hand": self._on_hand,
+            "lots": self._lots,
+            "oversold": self._oversold,
+        }
+        tmp = os.path.join(self.directory, "snapshot.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, os.path.join(self.directory, "snapshot.json"))
+
+    def close(self) -> None:
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    # Reads
+
+    def on_hand(self, sku: str) -> int:
+        return self._on_hand.get(sku, 0)
+
+    def earliest_expiry(self, sku: str) -> int | None:
+        lots = self._lots.get(sku)
+        if not lots or lots[0][0] == date.max.toordinal():
+            return None
+        return lots[0][0]
+
+    def lots(self, sku: str) -> List[Tuple[date, int]]:
+        return [(date.fromordinal(e), q) for e, q in self._lots.get(sku, [])]
+
+    def apply_to(self, inventory: pd.DataFrame) -> pd.DataFrame:
+        """``inventory`` with ``qty`` and ``expiry`` replaced by ledger state for tracked SKUs."""
+        tracked = inventory["sku"].isin(self._on_hand.keys())
+        if not tracked.any():
+            return inventory
+        skus = inventory.loc[tracked, "sku"]
+        expiries = {
+            sku: pd.Timestamp(date.fromordinal(e)) if (e := self.earliest_expiry(sku)) is not None else pd.NaT
+            for sku in skus
+        }
+        out = inventory.copy()
+        out.loc[tracked, "qty"] = skus.map(self._on_hand).astype(inventory["qty"].dtype)
+        out.loc[tracked, "expiry"] = pd.to_datetime(skus.map(expiries))
+        return out
+
+    @classmethod
+    def from_inventory(cls, inventory: pd.DataFrame, directory: str | None = None, **kwargs) -> "StockLedger":
+        """Start a ledger with one opening receipt per SKU from an inventory snapshot."""
+        ledger = cls(directory, **kwargs)
+        ledger.record_frame(inventory.assign(kind="receipt")[["kind", "sku", "qty", "expiry"]])
+        return ledger
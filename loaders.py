@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict, List, Tuple
+import pandas as pd
+
+import alerts as alert_rules
+import data
+import markdown
+import replenishment
+import utils
+from alerts import Alert, AlertEngine
+from analytics import CubeRefresher, SalesCube
+from cache import cached, invalidate, on_invalidate
+from ledger import StockLedger
+from perf import span
+from rollup import CHAIN, KpiCube
+
+# Cached entry points for the pages. Derived results take the same arguments as the
+# loaders they depend on, so widget changes that don't alter them (currency, layout)
+# are served from memory. Results that depend on stock levels declare the "inventory"
+# table, which stock-ledger movements invalidate on their own.
+
+
+@cached(ttl=600)
+def get_sales_by_day(num_days: int = 30) -> pd.DataFrame:
+    return data.get_sales_by_day(num_days)
+
+
+@cached(ttl=600)
+def get_top_sellers() -> pd.DataFrame:
+    return data.get_top_sellers()
+
+
+@cached(ttl=600, tables=("inventory",))
+def get_inventory() -> pd.DataFrame:
+    return data.get_inventory()
+
+
+@cached(ttl=600)
+def get_suppliers() -> pd.DataFrame:
+    return data.get_suppliers()
+
+
+@cached(ttl=600)
+def get_expenses() -> pd.DataFrame:
+    return data.get_expenses()
+
+
+@cached(ttl=600, tables=("orders",))
+def get_orders() -> pd.DataFrame:
+    return data.get_orders()
+
+
+# Days of branch history held in the KPI cube (the "Days window" slider's maximum)
+CUBE_DAYS = 90
+
+
+@cached(ttl=600, maxsize=1)
+def kpi_cube() -> KpiCube:
+    return KpiCube.build(data.get_branch_sales(CUBE_DAYS), data.get_branches(), get_expenses())
+
+
+def kpis(num_days: int = 30, scope: str = CHAIN) -> Dict[str, float]:
+    """Revenue/expenses/profit for a branch, region or the chain: a range sum over the cube."""
+    return kpi_cube().window(num_days, scope)
+
+
+def branch_sales(num_days: int = 30, scope: str = CHAIN) -> pd.DataFrame:
+    return kpi_cube().series(num_days, scope)
+
+
+@cached(ttl=600)
+def forecast(num_days: int = 30, scope: str = CHAIN) -> pd.DataFrame:
+    return utils.simple_forecast_next_7_days(branch_sales(num_days, scope))
+
+
+_tracking: Tuple[AlertEngine, StockLedger] | None = None  # engine following the ledger
+
+
+@cached(ttl=None, maxsize=1)
+def alert_engine() -> AlertEngine:
+    """Built once per data version; stock movements then reach it from the ledger."""
+    global _tracking
+    engine = AlertEngine.from_frames(get_inventory(), get_sales_by_day(alert_rules.HISTORY_DAYS))
+    ledger = data.get_stock_ledger()
+    if ledger is not None:
+        engine.track(ledger)
+        _tracking = (engine, ledger)
+    return engine
+
+
+def alerts() -> List[Alert]:
+    """Current alerts from the engine, after folding in sales from its latest day on."""
+    engine = alert_engine()
+    sales = get_sales_by_day(alert_rules.HISTORY_DAYS)
+    if engine.last_day is not None:
+        sales = sales[pd.to_datetime(sales["date"]) >= engine.last_day]
+    engine.apply_sales(sales, replace=True)
+    return engine.alerts()
+
+
+@cached(ttl=600, tables=("inventory",))
+def pricing() -> pd.DataFrame:
+    return utils.dynamic_pricing_recommendations(get_inventory())
+
+
+# Days of sales history behind the replenishment demand estimates
+PLAN_DAYS = 56
+
+
+@cached(ttl=600, tables=("inventory",))
+def replenishment_plan() -> pd.DataFrame:
+    inventory = get_inventory()
+    return replenishment.plan(inventory, get_suppliers(), data.get_sales_detail(PLAN_DAYS, skus=inventory))
+
+
+@cached(ttl=600, tables=("inventory",))
+def purchase_orders() -> pd.DataFrame:
+    return replenishment.purchase_orders(replenishment_plan())
+
+
+@cached(ttl=600)
+def profit_leaders() -> pd.DataFrame:
+    top = get_top_sellers()
+    return top.assign(margin_value=(top["revenue"] * top["margin"]).round())
+
+
+# Days of hourly history in the analytics cube, and how often newly closed days are folded in
+ANALYTICS_DAYS = 364
+ANALYTICS_REFRESH_SECONDS = 600
+_refresher: CubeRefresher | None = None
+
+
+def _hourly_sales(since: pd.Timestamp | None) -> pd.DataFrame:
+    # Always the same window, so the lines for a day don't depend on when they are fetched
+    sales = data.get_sales_detail(ANALYTICS_DAYS, skus=get_inventory(), freq="h")
+    return sales if since is None else sales[sales["date"] >= since].reset_index(drop=True)
+
+
+def _drop_followers(tables: Tuple[str, ...]) -> None:
+    # analytics_cube and alert_engine are only dropped with everything else; the threads
+    # and subscriptions keeping them current go with them
+    global _refresher, _tracking
+    if tables:
+        return
+    if _refresher is not None:
+        _refresher.stop()
+        _refresher = None
+    if _tracking is not None:
+        engine, ledger = _tracking
+        engine.untrack(ledger)
+        _tracking = None
+
+
+on_invalidate(_drop_followers)
+
+
+@cached(ttl=None, maxsize=1)
+def analytics_cube() -> SalesCube:
+    """Built once per data version, then kept current by a background refresher."""
+    global _refresher
+    if _refresher is not None:
+        _refresher.stop()
+    cube = SalesCube(get_inventory(), max_days=ANALYTICS_DAYS)
+    _refresher = CubeRefresher(cube, _hourly_sales, ANALYTICS_REFRESH_SECONDS)
+    _refresher.refresh()
+    _refresher.start()
+    return cube
+
+
+@cached(ttl=600, tables=("inventory",))
+def markdown_plan() -> pd.DataFrame:
+    inventory = get_inventory()
+    sales = data.get_sales_detail(PLAN_DAYS, skus=inventory)
+    return markdown.plan_markdowns(inventory, sales, data.get_stock_ledger())
+
+
+@cached(ttl=600, maxsize=128, tables=("inventory",))
+def query_inventory(
+    supplier: str | None = None,
+    max_qty: int | None = None,
+    expiry_within_days: int | None = None,
+    sort_by: Tuple[str, ...] = ("days_to_expiry", "name"),
+    page: int = 0,
+    page_size: int | None = 50,
+) -> Tuple[pd.DataFrame, int]:
+    return data.query_inventory(supplier, max_qty, expiry_within_days, sort_by, page, page_size)
+
+
+@cached(ttl=600, maxsize=128, tables=("orders",))
+def query_orders(
+    statuses: Tuple[str, ...] = (), sort_by: Tuple[str, ...] = ("id",), page: int = 0, page_size: int | None = 50
+) -> Tuple[pd.DataFrame, int]:
+    return data.query_orders(statuses, sort_by, page, page_size)
+
+
+@cached(ttl=600, tables=("inventory", "orders", "suppliers", "expenses"))
+def list_values(table: str, column: str) -> List:
+    return data.list_values(table, column)
+
+
+_seen_versions: Dict[str, int] = {}
+
+
+def refresh(table: str) -> int:
+    """Drop cached results read from ``table`` if it changed since the last check.
+
+    Picks up writes made by another process, such as ``python -m ingest``.
+    """
+    version = data.table_version(table)
+    if _seen_versions.get(table) != version:
+        invalidate(table)
+        _seen_versions[table] = version
+    return version
+
+
+@cached(ttl=3600)
+def get_basket_pairs(top: int = 10) -> pd.DataFrame:
+    return data.get_basket_pairs(top)
+
+
+# What each page reads on its first render, called with the same arguments as the pages
+# so the cache keys match; the landing dashboard first.
+WARM_UP: List[Tuple[str, Callable[[], object]]] = [
+    ("kpi_cube", kpi_cube),
+    ("forecast", lambda: forecast(30, CHAIN)),
+    ("inventory_snapshot", lambda: query_inventory(sort_by=("name",), page=0, page_size=25)),
+    ("top_sellers", get_top_sellers),
+    ("alerts", alerts),
+    ("pricing", pricing),
+    ("suppliers", get_suppliers),
+    ("orders", get_orders),
+    ("analytics_cube", analytics_cube),
+    ("basket_pairs", get_basket_pairs),
+    ("inventory_page", lambda: query_inventory(supplier=None, max_qty=None, expiry_within_days=None, page=0, page_size=50)),
+    ("supplier_values", lambda: list_values("inventory", "supplier")),
+    ("markdown_plan", markdown_plan),
+    ("purchase_orders", purchase_orders),
+    ("order_statuses", lambda: list_values("orders", "status")),
+    ("orders_page", lambda: query_orders((), page=0, page_size=50)),
+    ("expenses", get_expenses),
+]
+
+
+def warm_up() -> Dict[str, float]:
+    """Fill the caches in ``WARM_UP``; returns seconds per step.
+
+    Meant for server start (``python serve.py``). A page opened before it finishes waits
+    for the result being computed rather than computing it again. Every step is tried;
+    if any failed, a ``RuntimeError`` naming them is raised at the end.
+    """
+    seconds: Dict[str, float] = {}
+    failed: Dict[str, Exception] = {}
+    for name, load in WARM_UP:
+        start = time.perf_counter()
+        try:
+            with span(f"warm_up.{name}"):
+                load()
+        except Exception as exc:  # keep warming the other pages
+            failed[name] = exc
+            continue
+        seconds[name] = time.perf_counter() - start
+    if failed:
+        raise RuntimeError(f"Warm-up failed for {', '.join(failed)}") from next(iter(failed.values()))
+    return seconds
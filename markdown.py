@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+from ledger import StockLedger
+from perf import timed
+from replenishment import demand_stats
+
+ELASTICITY = 2.0  # at a discount d, demand is multiplied by (1 - d) ** -ELASTICITY
+HORIZON_DAYS = 14  # lots expiring later than this are left to the regular pricing rules
+SCENARIOS = 1000  # simulated demand paths per lot
+_CHUNK_DRAWS = 1 << 22  # lots x scenarios x days held in memory at once, per worker
+
+# Steps of (days left before expiry when the step starts, discount), with days left
+# decreasing and discounts deepening, e.g. [(3, 0.2), (1, 0.5)]: 20% off from 3 days
+# before expiry, 50% off on the last day. An empty schedule keeps the full price.
+Schedule = List[Tuple[int, float]]
+
+
+def step_schedules(discounts: Sequence[float] = (0.1, 0.2, 0.3, 0.5), starts: Sequence[int] = (1, 2, 3, 5, 7)) -> Dict[str, Schedule]:
+    """Candidate schedules: no markdown, every single step, and a few two-step staircases."""
+    schedules: Dict[str, Schedule] = {"No markdown": []}
+    for start in starts:
+        for discount in discounts:
+            schedules[f"{discount:.0%} off from {start}d left"] = [(start, discount)]
+    for (first, low), (second, high) in [((5, 0.1), (2, 0.3)), ((3, 0.2), (1, 0.5)), ((7, 0.1), (3, 0.3))]:
+        schedules[f"{low:.0%} from {first}d, {high:.0%} from {second}d"] = [(first, low), (second, high)]
+    return schedules
+
+
+def _check_schedule(name: str, steps: Schedule) -> None:
+    days = [d for d, _ in steps]
+    discounts = [x for _, x in steps]
+    if any(a <= b for a, b in zip(days, days[1:])) or any(d < 1 for d in days):
+        raise ValueError(f"Schedule {name!r}: step days must be >= 1 and strictly decreasing, got {days}")
+    if any(not 0 <= x < 1 for x in discounts):
+        raise ValueError(f"Schedule {name!r}: discounts must be in [0, 1), got {discounts}")
+
+
+def inventory_lots(inventory: pd.DataFrame, ledger: StockLedger | None = None, today: pd.Timestamp | None = None) -> pd.DataFrame:
+    """One row per stock lot with its ``days_to_expiry`` and the units ``ahead`` of it.
+
+    Lots come from ``ledger`` for the SKUs it tracks, otherwise one lot per inventory row.
+    Within a SKU lots sell first-expiry-first-out, so ``ahead`` is the stock in lots that
+    expire earlier but are still sellable (expired lots and lots expiring today sell
+    nothing). Lots without an expiry date are left out.
+    """
+    today = pd.Timestamp.today().normalize() if today is None else today
+    rows = inventory[["sku", "name", "qty", "expiry", "cost", "price"]].astype({"sku": object})
+    if ledger is not None:
+        tracked = rows["sku"].map(lambda sku: ledger.on_hand(sku) > 0 or bool(ledger.lots(sku)))
+        lots = [
+            (sku, pd.Timestamp(expiry), qty)
+            for sku in rows.loc[tracked, "sku"]
+            for expiry, qty in ledger.lots(sku)
+            if expiry != date.max
+        ]
+        from_ledger = pd.DataFrame(lots, columns=["sku", "expiry", "qty"])
+        from_ledger = from_ledger.merge(rows.drop(columns=["qty", "expiry"]), on="sku")
+        rows = pd.concat([rows[~tracked], from_ledger], ignore_index=True)
+    rows = rows[rows["expiry"].notna() & (rows["qty"] > 0)].sort_values(["sku", "expiry"], ignore_index=True)
+    rows["qty"] = rows["qty"].astype(np.int64)
+    rows["days_to_expiry"] = (pd.to_datetime(rows["expiry"]) - today).dt.days.astype(np.int64)
+    sellable = rows["qty"].where(rows["days_to_expiry"] > 0, 0)
+    rows["ahead"] = sellable.groupby(rows["sku"]).cumsum() - sellable
+    return rows
+
+
+def _simulate_chunk(
+    lots: Dict[str, np.ndarray], schedules: List[Schedule], n_scenarios: int, elasticity: float, seed: np.random.SeedSequence
+) -> Dict[str, np.ndarray]:
+    days = lots["days"]
+    n, horizon = len(days), int(days.max())
+    rows = np.arange(n)
+    # Daily demand = rate x a mean-1 lognormal shock with the spread of the sales history
+    sigma = lots["sigma"].astype(np.float32)[:, None, None]
+    shock = np.random.default_rng(seed).standard_normal((n, horizon, n_scenarios), dtype=np.float32)
+    shock *= sigma
+    shock -= sigma**2 / 2
+    np.exp(shock, out=shock)
+    shock *= lots["rate"].astype(np.float32)[:, None, None]
+    # cum[:, t] = full-price demand over days [0, t). A schedule's price is constant between
+    # its steps, so its demand up to a step is a weighted sum of differences of cum at the
+    # step days: a schedule costs O(steps), not another pass over the days. Step days are
+    # clipped to the lot's expiry, so days after it are never read.
+    cum = np.zeros((n, horizon + 1, n_scenarios), dtype=np.float32)
+    np.cumsum(shock, axis=1, out=cum[:, 1:])
+    del shock
+    at_step: Dict[int, np.ndarray] = {0: cum[rows, days]}  # keyed by days left
+
+    def demand_until(days_left: int) -> np.ndarray:
+        if days_left not in at_step:
+            at_step[days_left] = cum[rows, np.clip(days - days_left, 0, days)]
+        return at_step[days_left]
+
+    qty = lots["qty"].astype(np.float32)[:, None]
+    ahead = lots["ahead"].astype(np.float32)[:, None]
+    price = lots["price"]
+    out = {k: np.empty((n, len(schedules))) for k in ("sold", "waste", "waste_prob", "revenue")}
+    for k, steps in enumerate(schedules):
+        # Segments of constant discount, ending at each step's start and then at expiry
+        ends = [left for left, _ in steps] + [0]
+        discounts = [0.0] + [discount for _, discount in steps]
+        demand = np.zeros((n, n_scenarios), dtype=np.float32)
+        before = np.zeros((n, n_scenarios), dtype=np.float32)
+        revenue = np.zeros(n)
+        prev_sold = np.zeros(n)
+        for end, discount in zip(ends, discounts):
+            now = demand_until(end)
+            demand += np.float32((1 - discount) ** -elasticity) * (now - before)
+            before = now
+            # Earlier-expiring lots of the SKU are sold first. Revenue is linear in units
+            # sold per segment, so only the mean sold at each step is needed.
+            sold = np.minimum(np.maximum(demand - ahead, 0), qty)
+            mean_sold = sold.mean(axis=1, dtype=np.float64)
+            revenue += (mean_sold - prev_sold) * price * (1 - discount)
+            prev_sold = mean_sold
+        out["sold"][:, k] = prev_sold
+        out["waste"][:, k] = lots["qty"] - prev_sold
+        out["waste_prob"][:, k] = (sold <= qty - 0.5).mean(axis=1)
+        out["revenue"][:, k] = revenue
+    return out
+
+
+@timed()
+def simulate(
+    lots: pd.DataFrame,
+    demand: pd.DataFrame,
+    schedules: Dict[str, Schedule] | None = None,
+    n_scenarios: int = SCENARIOS,
+    elasticity: float = ELASTICITY,
+    seed: int = 0,
+    workers: int | None = None,
+) -> pd.DataFrame:
+    """Expected sell-through, waste and revenue of every lot under every schedule.
+
+    ``lots`` is ``inventory_lots`` output (lots already expired are dropped) and
+    ``demand`` has ``sku``, ``daily_demand`` and ``demand_std`` as from
+    ``replenishment.demand_stats``. Each lot gets ``n_scenarios`` demand paths up to its
+    expiry. Lots are simulated in chunks spread over ``workers`` threads (numpy releases
+    the GIL for the heavy loops); each chunk has its own random stream, so results do
+    not depend on the number of workers. Returns one row per (lot, schedule).
+    """
+    schedules = step_schedules() if schedules is None else schedules
+    for name, steps in schedules.items():
+        _check_schedule(name, steps)
+    lots = lots[lots["days_to_expiry"] > 0].reset_index(drop=True)
+    stats = demand.assign(sku=demand["sku"].astype(object)).set_index("sku")
+    sku = lots["sku"].astype(object)
+    rate = sku.map(stats["daily_demand"]).fillna(0).to_numpy(dtype=float)
+    std = sku.map(stats["demand_std"]).fillna(0).to_numpy(dtype=float)
+    cv = np.divide(std, rate, out=np.zeros(len(rate)), where=rate > 0)
+    arrays = {
+        "days": lots["days_to_expiry"].to_numpy(dtype=np.int64),
+        "qty": lots["qty"].to_numpy(dtype=float),
+        "ahead": lots["ahead"].to_numpy(dtype=float),
+        "price": lots["price"].to_numpy(dtype=float),
+        "rate": rate,
+        "sigma": np.sqrt(np.log1p(cv**2)),
+    }
+    names = list(schedules)
+    results: Dict[str, np.ndarray] = {k: np.empty((len(lots), len(names))) for k in ("sold", "waste", "waste_prob", "revenue")}
+    if len(lots):
+        per_chunk = max(1, _CHUNK_DRAWS // (n_scenarios * int(arrays["days"].max())))
+        starts = range(0, len(lots), per_chunk)
+        seeds = np.random.SeedSequence(seed).spawn(len(starts))
+        steps = [schedules[name] for name in names]
+
+        def run(i: int) -> None:
+            part = slice(starts[i], starts[i] + per_chunk)
+            chunk = _simulate_chunk({k: v[part] for k, v in arrays.items()}, steps, n_scenarios, elasticity, seeds[i])
+            for k, values in chunk.items():
+                results[k][part] = values
+
+        workers = min(workers or os.cpu_count() or 1, len(starts))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(run, range(len(starts))))
+        else:
+            for i in range(len(starts)):
+                run(i)
+
+    n_lots, n_names = len(lots), len(names)
+    out = lots.loc[np.repeat(np.arange(n_lots), n_names)].reset_index(drop=True)
+    out.insert(0, "lot", np.repeat(np.arange(n_lots), n_names))
+    out["daily_demand"] = np.repeat(rate, n_names)
+    out["markdown"] = np.tile(names, n_lots)
+    for k in ("sold", "waste", "waste_prob", "revenue"):
+        out[f"expected_{k}" if k in ("sold", "waste") else k] = results[k].ravel()
+    out["margin"] = out["revenue"] - out["qty"] * out["cost"].astype(float)
+    return out
+
+
+def best_markdowns(simulated: pd.DataFrame) -> pd.DataFrame:
+    """Per lot, the schedule with the highest expected margin, against no markdown.
+
+    Ties go to the schedule listed first (so no markdown wins unless a discount helps).
+    """
+    best = simulated.loc[simulated.groupby("lot", sort=True)["margin"].idxmax()].set_index("lot")
+    baseline = simulated[simulated["markdown"] == "No markdown"].set_index("lot")
+    if len(baseline):
+        best["waste_without_markdown"] = baseline["expected_waste"]
+        best["margin_gain"] = best["margin"] - baseline["margin"]
+    return best.reset_index(drop=True)
+
+
+def plan_markdowns(
+    inventory: pd.DataFrame,
+    sales: pd.DataFrame,
+    ledger: StockLedger | None = None,
+    horizon: int = HORIZON_DAYS,
+    **kwargs,
+) -> pd.DataFrame:
+    """Best markdown for each lot expiring within ``horizon`` days, most margin recovered first.
+
+    Demand rates come from ``sales`` (``date``, ``sku``, ``units`` lines); extra keyword
+    arguments go to ``simulate``.
+    """
+    lots = inventory_lots(inventory, ledger)
+    lots = lots[lots["days_to_expiry"].between(1, horizon)]
+    plan = best_markdowns(simulate(lots, demand_stats(sales), **kwargs))
+    columns = ["sku", "name", "expiry", "days_to_expiry", "qty", "daily_demand", "markdown", "expected_sold"]
+    columns += ["expected_waste", "waste_prob", "waste_without_markdown", "revenue", "margin", "margin_gain"]
+    return plan.reindex(columns=columns).sort_values("margin_gain", ascending=False, ignore_index=True)
@@ -1,40 +1,94 @@
 from __future__ import annotations
 
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 
-from data import get_sales_by_day, get_top_sellers
+from loaders import analytics_cube, get_basket_pairs, get_inventory, profit_leaders
+from ui import begin_profile, debug_panel, fragment, shillings, show_chart, show_dataframe
 
 
 st.set_page_config(page_title="Analytics – Baraka", page_icon="📊", layout="wide")
+begin_profile("Analytics")
 
 st.title("📊 Analytics – Your Super Manager")
 st.caption("Actionable insights from sales trends and product performance")
 
-sales = get_sales_by_day()
-top = get_top_sellers()
+ALL_CATEGORIES = "All categories"
+ALL_SKUS = "All SKUs"
+GREEN = ["#0f766e"]
+MARGINS = dict(l=10, r=10, t=10, b=10)
 
-# Sales by weekday (pattern insights)
-sales["weekday"] = pd.to_datetime(sales["date"]).dt.day_name()
-weekday_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-sales["weekday"] = pd.Categorical(sales["weekday"], categories=weekday_order, ordered=True)
-by_weekday = sales.groupby("weekday", as_index=False, observed=False)["revenue"].mean()
 
-c1, c2 = st.columns([1.2, 1])
-with c1:
-    st.subheader("Sales by Weekday (avg)")
-    st.plotly_chart(px.bar(by_weekday, x="weekday", y="revenue", color_discrete_sequence=["#0f766e"]).update_layout(margin=dict(l=10,r=10,t=10,b=10)), use_container_width=True)
-with c2:
-    st.subheader("Top Sellers – Units vs Revenue")
-    st.plotly_chart(px.scatter(top, x="sold", y="revenue", text="name", size="revenue", color_discrete_sequence=["#0f766e"]).update_traces(textposition="top center"), use_container_width=True)
+# Window and drill-down (chain -> category -> SKU) rerun only this section; every chart
+# reads aggregated cells of the analytics cube, not sales lines
+@fragment("Analytics", "patterns")
+def sales_patterns() -> None:
+    cube = analytics_cube()
+    inventory = get_inventory()
+    names = dict(zip(inventory["sku"].astype(str), inventory["name"]))
+    c1, c2, c3 = st.columns(3, gap="small")
+    with c1:
+        days = st.select_slider("History", options=[28, 91, 182, 364], value=91, format_func=lambda d: f"{d // 7} weeks")
+    with c2:
+        category = st.selectbox("Category", [ALL_CATEGORIES] + sorted(cube.categories))
+    category = None if category == ALL_CATEGORIES else category
+    skus = shillings(cube.by_sku(days, category), ["revenue"])
+    with c3:
+        sku = st.selectbox("SKU", [ALL_SKUS] + skus["sku"].tolist(), format_func=lambda s: names.get(s, s))
+    sku = None if sku == ALL_SKUS else sku
+    scope = names.get(sku, sku) if sku else category or "all sales"
+
+    c1, c2 = st.columns([1.2, 1])
+    with c1:
+        st.subheader("Sales by Weekday (avg)")
+        by_weekday = shillings(cube.by_weekday(days, category, sku), ["revenue"])
+        show_chart(px.bar(by_weekday, x="weekday", y="revenue", color_discrete_sequence=GREEN).update_layout(margin=MARGINS), "weekday_bar", use_container_width=True)
+    with c2:
+        st.subheader("Sales by Hour (avg)")
+        if cube.has_hours:
+            # Hours are kept per category; a SKU shows its category's pattern
+            hour_scope = skus.set_index("sku").loc[sku, "category"] if sku else category
+            by_hour = shillings(cube.by_hour(days, hour_scope), ["revenue"])
+            show_chart(px.bar(by_hour, x="hour", y="revenue", color_discrete_sequence=GREEN).update_layout(margin=MARGINS), "hour_bar", use_container_width=True)
+            if sku:
+                st.caption(f"Pattern for the {hour_scope} category")
+        else:
+            st.caption("The data source records sales per day, so there is no hourly pattern")
+
+    st.subheader(f"Weekly Revenue – {scope}")
+    by_week = shillings(cube.by_week(days, category, sku), ["revenue"])
+    weekly = px.line(by_week, x="week", y="revenue", hover_data=["week_of_year", "units"], markers=True, color_discrete_sequence=GREEN)
+    show_chart(weekly.update_layout(margin=MARGINS), "weekly_line", use_container_width=True)
+
+    if category is None:
+        st.subheader("Category Mix")
+        mix = shillings(cube.by_category(days), ["revenue"])
+        show_dataframe(mix.assign(share=(mix["share"] * 100).round(1)).rename(columns={"share": "share %"}), "category_mix", use_container_width=True, hide_index=True)
+    elif sku is None:
+        st.subheader(f"{category} – SKUs")
+        show_dataframe(skus.assign(name=skus["sku"].map(names))[["sku", "name", "revenue", "units"]], "category_skus", use_container_width=True, hide_index=True)
+
+
+sales_patterns()
+
+top = shillings(profit_leaders(), ["revenue", "margin_value"])
+st.subheader("Top Sellers – Units vs Revenue")
+show_chart(px.scatter(top, x="sold", y="revenue", text="name", size="revenue", color_discrete_sequence=GREEN).update_traces(textposition="top center"), "top_sellers_scatter", use_container_width=True)
 
 # Profit leaders
-top = top.copy()
-top["margin_value"] = (top["revenue"] * top["margin"]).round(2)
 st.subheader("Profit Leaders")
-st.dataframe(top[["name", "sold", "revenue", "margin", "margin_value"]].rename(columns={"margin": "margin %"}).assign(**{"margin %": (top["margin"]*100).round(0)}), use_container_width=True)
-
-st.info("Use these insights to schedule promotions on high-margin items and allocate shelf space to best performers.")
+show_dataframe(top[["name", "sold", "revenue", "margin", "margin_value"]].rename(columns={"margin": "margin %"}).assign(**{"margin %": (top["margin"]*100).round(0)}), "profit_leaders", use_container_width=True)
 
+st.subheader("Bundle Ideas")
+st.caption("Items bought together more often than chance (lift > 1), mined from basket data")
+bundles = get_basket_pairs()
+show_dataframe(
+    bundles[["item_a", "item_b", "count", "confidence_a_b", "lift"]]
+    .rename(columns={"item_a": "item", "item_b": "bundle with", "confidence_a_b": "confidence"})
+    .round({"confidence": 2, "lift": 2}),
+    "bundles",
+    use_container_width=True,
+)
 
+st.info("Use these insights to schedule promotions on high-margin items and allocate shelf space to best performers.")
+debug_panel()
@@ -3,41 +3,72 @@ from __future__ import annotations
 import streamlit as st
 import pandas as pd
 
-from data import get_inventory
+from loaders import list_values, markdown_plan, query_inventory
+from markdown import HORIZON_DAYS
+import data
+from export import query_chunks
+from ui import begin_profile, debug_panel, export_button, fragment, paged, shillings, show_dataframe
 
 st.set_page_config(page_title="Inventory – Baraka", page_icon="📦", layout="wide")
+begin_profile("Inventory")
 
 st.title("📦 Inventory")
 st.caption("Track quantities, expiry, and pricing")
 
-inv = get_inventory().copy()
-inv["expiry"] = pd.to_datetime(inv["expiry"]).dt.date
+MONEY = ["cost", "price"]
 
-col1, col2, col3 = st.columns([1, 1, 1], gap="small")
-with col1:
-    supplier = st.selectbox("Supplier", options=["All"] + sorted(inv["supplier"].unique().tolist()))
-with col2:
-    low_only = st.checkbox("Show low stock (<= 5)")
-with col3:
-    near_exp = st.checkbox("Show near expiry (<= 3 days)")
 
-if supplier != "All":
-    inv = inv[inv["supplier"] == supplier]
+# Filters, table and export rerun on their own; the rest of the page is left alone
+@fragment("Inventory", "table")
+def inventory_table() -> None:
+    col1, col2, col3 = st.columns([1, 1, 1], gap="small")
+    with col1:
+        supplier = st.selectbox("Supplier", options=["All"] + list_values("inventory", "supplier"))
+    with col2:
+        low_only = st.checkbox("Show low stock (<= 5)")
+    with col3:
+        near_exp = st.checkbox("Show near expiry (<= 3 days)")
 
-today = pd.Timestamp.today().normalize()
-inv["days_to_expiry"] = (pd.to_datetime(inv["expiry"]) - today).dt.days
+    # Filtering, sorting and paging happen in the data layer; only the visible page is loaded
+    filters = dict(
+        supplier=None if supplier == "All" else supplier,
+        max_qty=5 if low_only else None,
+        expiry_within_days=3 if near_exp else None,
+    )
+    inv = paged(lambda page, size: query_inventory(**filters, page=page, page_size=size), key="inventory_page")
+    inv = shillings(inv, MONEY).assign(expiry=pd.to_datetime(inv["expiry"]).dt.date)
 
-if low_only:
-    inv = inv[inv["qty"] <= 5]
-if near_exp:
-    inv = inv[inv["days_to_expiry"] <= 3]
+    show_dataframe(inv, "inventory", use_container_width=True, height=520)
 
-st.dataframe(inv.sort_values(["days_to_expiry", "name"]).reset_index(drop=True), use_container_width=True, height=520)
+    # Export is built only on request, a page of rows at a time
+    export_button(
+        "Download inventory",
+        lambda: (shillings(chunk, MONEY) for chunk in query_chunks(lambda page, size: data.query_inventory(**filters, page=page, page_size=size))),
+        "inventory",
+        key="inventory_export",
+    )
 
-# Download CSV
-csv = inv.to_csv(index=False).encode("utf-8")
-st.download_button("Download CSV", csv, "inventory.csv", mime="text/csv")
 
-st.info("Tip: Use dynamic pricing to clear near-expiry items and avoid waste.")
+inventory_table()
 
+# Markdowns: simulated sell-through of each perishable lot under candidate discount schedules
+st.subheader("Markdown Plan for Perishables")
+st.caption(
+    f"Lots expiring within {HORIZON_DAYS} days, with the discount schedule that recovers the most margin "
+    "over simulated demand (sales rate and variability from the last 8 weeks)"
+)
+plan = markdown_plan()
+if plan.empty:
+    st.success(f"No stock expires within {HORIZON_DAYS} days")
+else:
+    shown = shillings(plan, ["cost", "price", "revenue", "margin", "margin_gain"]).assign(expiry=pd.to_datetime(plan["expiry"]).dt.date, waste_prob=(plan["waste_prob"] * 100).round())
+    shown = shown.round({"daily_demand": 1, "expected_sold": 1, "expected_waste": 1, "waste_without_markdown": 1})
+    show_dataframe(
+        shown.round({"revenue": 0, "margin": 0, "margin_gain": 0}).rename(columns={"waste_prob": "waste_chance_%"}),
+        "markdown_plan",
+        use_container_width=True,
+        hide_index=True,
+    )
 
+st.info("Tip: Use dynamic pricing to clear near-expiry items and avoid waste.")
+debug_panel()
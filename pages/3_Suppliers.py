@@ -3,20 +3,44 @@ from __future__ import annotations
 import streamlit as st
 import pandas as pd
 
-from data import get_suppliers
+from export import frame_chunks
+from loaders import get_suppliers, purchase_orders, replenishment_plan
+from ui import begin_profile, debug_panel, export_button, shillings, show_dataframe
 
 st.set_page_config(page_title="Suppliers – Baraka", page_icon="🚚", layout="wide")
+begin_profile("Suppliers")
 
 st.title("🚚 Suppliers")
 st.caption("Compare supplier prices and lead times")
 
-sups = get_suppliers().copy()
-sups = sups.sort_values(["lastPrice", "avgLeadDays"])  # cheap and fast first
+sups = get_suppliers().sort_values(["lastPrice", "avgLeadDays"])  # cheap and fast first
+sups = shillings(sups, ["lastPrice"])
 
-st.dataframe(sups, use_container_width=True)
+show_dataframe(sups, "suppliers", use_container_width=True)
 
-st.download_button("Download suppliers CSV", sups.to_csv(index=False).encode("utf-8"), "suppliers.csv", "text/csv")
+export_button("Download suppliers", lambda: frame_chunks(sups), "suppliers", key="suppliers_export")
 
 st.success("Recommendation: Prefer suppliers with lower price and shorter lead time to reduce stockouts and cost.")
 
-
+# Suggested purchase orders: reorder points from sales history and supplier lead times
+st.subheader("Suggested Purchase Orders")
+st.caption("SKUs at or below their reorder point (95% service level over the supplier's lead time), batched per supplier")
+orders = purchase_orders()
+if orders.empty:
+    st.success("All SKUs are above their reorder points")
+else:
+    show_dataframe(shillings(orders, ["value"]), "purchase_orders", use_container_width=True, hide_index=True)
+    plan = shillings(replenishment_plan(), ["cost", "price", "order_value"])
+    supplier = st.selectbox("Order lines for", orders["supplier"].tolist())
+    lines = plan[(plan["supplier"] == supplier) & (plan["order_qty"] > 0)][
+        ["sku", "name", "qty", "daily_demand", "lead_days", "safety_stock", "reorder_point", "days_of_cover", "order_qty", "order_value"]
+    ]
+    show_dataframe(lines.round({"daily_demand": 1}), "order_lines", use_container_width=True, hide_index=True)
+    export_button(
+        "Download order lines",
+        lambda: frame_chunks(plan[plan["order_qty"] > 0]),
+        "purchase_orders",
+        key="po_export",
+    )
+
+debug_panel()
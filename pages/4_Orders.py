@@ -3,22 +3,42 @@ from __future__ import annotations
 import streamlit as st
 import pandas as pd
 
-from data import get_orders
+from loaders import list_values, query_orders, refresh
+import data
+from export import query_chunks
+from ui import begin_profile, debug_panel, export_button, fragment, paged, shillings, show_dataframe
 
 st.set_page_config(page_title="Orders – Baraka", page_icon="🧾", layout="wide")
+begin_profile("Orders")
 
 st.title("🧾 Orders")
 st.caption("Online + in-store mock orders for demo")
 
-orders = get_orders()
+# With a data store, orders may be streaming in (``python -m ingest``): re-run just the
+# table every few seconds and reload it only when the store's orders version has moved.
+LIVE = data.get_data_source() is not None
+REFRESH_SECONDS = 2
 
-status = st.multiselect("Filter status", options=sorted(orders["status"].unique().tolist()), default=[])
-if status:
-    orders = orders[orders["status"].isin(status)]
 
-st.dataframe(orders, use_container_width=True)
-st.download_button("Download orders CSV", orders.to_csv(index=False).encode("utf-8"), "orders.csv", "text/csv")
+@fragment("Orders", "table", run_every=REFRESH_SECONDS if LIVE else None)
+def orders_table() -> None:
+    if LIVE:
+        version = refresh("orders")
+        st.caption(f"🟢 Live – checking for new orders every {REFRESH_SECONDS} s (update #{version:,})")
+    status = st.multiselect("Filter status", options=list_values("orders", "status"), default=[])
+    orders = paged(lambda page, size: query_orders(tuple(status), page=page, page_size=size), key="orders_page")
 
-st.info("Connect this to your real POS/e-commerce to go live.")
+    show_dataframe(shillings(orders, ["total"]), "orders", use_container_width=True)
+    export_button(
+        "Download orders",
+        lambda: (shillings(chunk, ["total"]) for chunk in query_chunks(lambda page, size: data.query_orders(tuple(status), page=page, page_size=size))),
+        "orders",
+        key="orders_export",
+    )
 
 
+orders_table()
+
+if not LIVE:
+    st.info("Connect this to your real POS/e-commerce to go live: set BARAKA_DB and stream order events with `python -m ingest`.")
+debug_panel()
@@ -3,18 +3,21 @@ from __future__ import annotations
 import streamlit as st
 import plotly.express as px
 
-from data import get_expenses
+from export import frame_chunks
+from loaders import get_expenses
+from ui import begin_profile, debug_panel, export_button, shillings, show_chart, show_dataframe
 
 st.set_page_config(page_title="Expenses – Baraka", page_icon="💸", layout="wide")
+begin_profile("Expenses")
 
 st.title("💸 Expenses")
 st.caption("Understand your cost drivers")
 
-exps = get_expenses()
+exps = shillings(get_expenses(), ["amount"])
 total = exps["amount"].sum()
 
 st.metric("Total Monthly Expenses", f"KSh {total:,.0f}")
-st.plotly_chart(
+show_chart(
     px.pie(
         exps,
         names="type",
@@ -22,10 +25,12 @@ st.plotly_chart(
         hole=0.45,
         color_discrete_sequence=["#0f766e", "#115e59", "#14b8a6", "#0ea5e9", "#64748b"],
     ).update_layout(margin=dict(l=10, r=10, t=10, b=10)),
+    "expenses_pie",
     use_container_width=True,
 )
 
-st.dataframe(exps, use_container_width=True)
-st.download_button("Download expenses CSV", exps.to_csv(index=False).encode("utf-8"), "expenses.csv", "text/csv")
+show_dataframe(exps, "expenses", use_container_width=True)
+export_button("Download expenses", lambda: frame_chunks(exps), "expenses", key="expenses_export")
+debug_panel()
 
 
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, List
+import pandas as pd
+
+# BARAKA_PERF_LOG: append one JSON line per rerun. BARAKA_PERF_PROM: keep a Prometheus
+# text-format file up to date (e.g. for node_exporter's textfile collector).
+# BARAKA_PERF=1: measure payload sizes on every rerun, not only with the debug panel open.
+LOG_PATH = os.environ.get("BARAKA_PERF_LOG")
+PROM_PATH = os.environ.get("BARAKA_PERF_PROM")
+DETAILED = os.environ.get("BARAKA_PERF", "") not in ("", "0")
+
+
+@dataclass
+class Span:
+    name: str
+    seconds: float
+    payload_bytes: int | None = None
+
+
+@dataclass
+class Rerun:
+    page: str
+    started: float  # wall-clock epoch seconds
+    detailed: bool = False
+    seconds: float = 0.0
+    spans: List[Span] = field(default_factory=list)
+
+
+_local = threading.local()
+_lock = threading.Lock()
+_totals: Dict[str, List[float]] = {}  # span name -> [count, seconds, max seconds, payload bytes]
+_reruns: Dict[str, List[float]] = {}  # page -> [count, seconds, max seconds]
+recent: Deque[Rerun] = deque(maxlen=50)
+
+
+def _current() -> Rerun | None:
+    return getattr(_local, "rerun", None)
+
+
+def _record(name: str, seconds: float, payload_bytes: int | None = None) -> None:
+    with _lock:
+        total = _totals.setdefault(name, [0, 0.0, 0.0, 0])
+        if payload_bytes is None:
+            total[0] += 1
+            total[1] += seconds
+            total[2] = max(total[2], seconds)
+        else:
+            total[3] += payload_bytes
+    rerun = _current()
+    if rerun is not None:
+        rerun.spans.append(Span(name, seconds, payload_bytes))
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the enclosed block as ``name`` (added to the current rerun and the totals)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, time.perf_counter() - start)
+
+
+def timed(name: str | None = None) -> Callable[[Callable], Callable]:
+    """Decorator form of ``span``; defaults to ``module.function`` as the name."""
+
+    def decorator(func: Callable) -> Callable:
+        label = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(label):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def payload_size(obj: Any) -> int:
+    """Approximate bytes sent to the browser for a table, figure or text."""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if hasattr(obj, "data") and isinstance(obj.data, pd.DataFrame):  # Styler
+        return payload_size(obj.data)
+    if hasattr(obj, "to_json"):  # Plotly figure
+        return len(obj.to_json())
+    if isinstance(obj, (bytes, str)):
+        return len(obj)
+    return sys.getsizeof(obj)
+
+
+def payload(name: str, obj: Any) -> None:
+    """Count the size of ``obj`` under ``name``, when payload measurement is on.
+
+    Sizing a figure means serializing it again, so it only happens with ``BARAKA_PERF``
+    set or the debug panel open.
+    """
+    rerun = _current()
+    if DETAILED or (rerun is not None and rerun.detailed):
+        _record(name, 0.0, payload_size(obj))
+
+
+def in_rerun() -> bool:
+    return _current() is not None
+
+
+def begin_rerun(page: str, detailed: bool = False) -> None:
+    _local.rerun = Rerun(page, time.time(), detailed or DETAILED)
+    _local.start = time.perf_counter()
+
+
+def end_rerun() -> Rerun | None:
+    """Close the current rerun, log it and refresh the exported metrics."""
+    rerun = _current()
+    if rerun is None:
+        return None
+    _local.rerun = None
+    rerun.seconds = time.perf_counter() - _local.start
+    with _lock:
+        total = _reruns.setdefault(rerun.page, [0, 0.0, 0.0])
+        total[0] += 1
+        total[1] += rerun.seconds
+        total[2] = max(total[2], rerun.seconds)
+        recent.append(rerun)
+    if LOG_PATH:
+        with open(LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(asdict(rerun)) + "\n")
+    if PROM_PATH:
+        tmp = PROM_PATH + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(prometheus_text())
+        os.replace(tmp, PROM_PATH)
+    return rerun
+
+
+def span_table(rerun: Rerun) -> pd.DataFrame:
+    """Time, call count and payload per span name for one rerun, slowest first."""
+    spans = pd.DataFrame(
+        {
+            "name": [s.name for s in rerun.spans],
+            "seconds": [s.seconds for s in rerun.spans],
+            "timed": [s.payload_bytes is None for s in rerun.spans],
+            "payload_bytes": [s.payload_bytes for s in rerun.spans],
+        }
+    )
+    table = spans.groupby("name", sort=False).agg(
+        ms=("seconds", "sum"), calls=("timed", "sum"), payload_kb=("payload_bytes", "sum")
+    )
+    table["ms"] = (table["ms"] * 1000).round(2)
+    table["payload_kb"] = (table["payload_kb"] / 1024).round(1).where(table["payload_kb"] > 0)
+    return table.sort_values("ms", ascending=False).reset_index()
+
+
+def prometheus_text() -> str:
+    """Totals since process start in the Prometheus text exposition format."""
+    lines = [
+        "# HELP baraka_rerun_seconds Streamlit script rerun time per page.",
+        "# TYPE baraka_rerun_seconds summary",
+    ]
+    with _lock:
+        reruns = {page: list(v) for page, v in _reruns.items()}
+        totals = {name: list(v) for name, v in _totals.items()}
+    for page, (count, seconds, _) in sorted(reruns.items()):
+        lines.append(f'baraka_rerun_seconds_count{{page="{page}"}} {int(count)}')
+        lines.append(f'baraka_rerun_seconds_sum{{page="{page}"}} {seconds:.6f}')
+    lines += ["# HELP baraka_rerun_seconds_max Slowest rerun per page.", "# TYPE baraka_rerun_seconds_max gauge"]
+    lines += [f'baraka_rerun_seconds_max{{page="{page}"}} {mx:.6f}' for page, (_, _, mx) in sorted(reruns.items())]
+    lines += ["# HELP baraka_span_seconds Time spent in instrumented calls.", "# TYPE baraka_span_seconds summary"]
+    for name, (count, seconds, _, _) in sorted(totals.items()):
+        if count:
+            lines.append(f'baraka_span_seconds_count{{name="{name}"}} {int(count)}')
+            lines.append(f'baraka_span_seconds_sum{{name="{name}"}} {seconds:.6f}')
+    lines += ["# HELP baraka_payload_bytes_total Bytes of tables and figures sent to the browser.", "# TYPE baraka_payload_bytes_total counter"]
+    lines += [f'baraka_payload_bytes_total{{name="{name}"}} {int(b)}' for name, (_, _, _, b) in sorted(totals.items()) if b]
+    return "\n".join(lines) + "\n"
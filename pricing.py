@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+import operator
+from typing import Any, Dict, List, Mapping, Tuple
+import numpy as np
+
+# Rules are plain data so they can live in a JSON/TOML file. Each rule matches when all
+# of its [column, op, value] clauses hold; the first matching rule (by priority, then
+# list order) wins and unmatched rows get DEFAULT_RECOMMENDATION.
+DEFAULT_RULES: List[Dict[str, Any]] = [
+    {
+        "name": "out_of_stock",
+        "when": [["qty", "==", 0]],
+        "recommendation": "Out of stock",
+        "price_change_pct": 0,
+    },
+    {
+        "name": "near_expiry",
+        "when": [["days_to_expiry", "<", 2]],
+        "recommendation": "Recommend 15% discount (near expiry)",
+        "price_change_pct": -15,
+    },
+    {
+        "name": "overstock",
+        "when": [["qty", ">", 100]],
+        "recommendation": "Recommend 5% discount (overstock)",
+        "price_change_pct": -5,
+    },
+    {
+        "name": "fast_moving",
+        "when": [["qty", "<", 5], ["days_to_expiry", ">", 14]],
+        "recommendation": "Consider +5% price (fast-moving)",
+        "price_change_pct": 5,
+    },
+]
+DEFAULT_RECOMMENDATION = {"recommendation": "Keep price", "price_change_pct": 0}
+
+_OPS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def load_rules(path: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Read ``{"rules": [...], "default": {...}}`` from a .json or .toml file."""
+    if path.endswith(".toml"):
+        import tomllib
+
+        with open(path, "rb") as f:
+            config = tomllib.load(f)
+    else:
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+    rules = config["rules"]
+    for rule in rules:
+        for column, op, _ in rule["when"]:
+            if op not in _OPS:
+                raise ValueError(f"Rule {rule.get('name')!r}: unknown operator {op!r} on {column!r}")
+    return rules, config.get("default", DEFAULT_RECOMMENDATION)
+
+
+def apply_rules(
+    columns: Mapping[str, Any],
+    rules: List[Dict[str, Any]] | None = None,
+    default: Dict[str, Any] | None = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Evaluate ``rules`` over column arrays with boolean masks and ``np.select``.
+
+    Returns ``(recommendation, price_change_pct)`` arrays aligned with the input rows.
+    Comparisons against NaN (e.g. a missing expiry) are false, so such clauses never match.
+    """
+    rules = DEFAULT_RULES if rules is None else rules
+    default = DEFAULT_RECOMMENDATION if default is None else default
+    ordered = sorted(rules, key=lambda r: r.get("priority", 0))
+
+    arrays = {name: np.asarray(values) for name, values in columns.items()}
+    n_rows = len(next(iter(arrays.values())))
+    conditions = [np.zeros(n_rows, dtype=bool)]  # keeps np.select happy with no rules
+    for rule in ordered:
+        mask = np.ones(n_rows, dtype=bool)
+        for column, op, value in rule["when"]:
+            mask &= _OPS[op](arrays[column], value)
+        conditions.append(mask)
+
+    # Select a rule index per row, then look up its outputs
+    codes = np.select(conditions, np.arange(-1, len(ordered)), default=len(ordered))
+    outcomes = ordered + [default]
+    labels = np.array([r["recommendation"] for r in outcomes], dtype=object)
+    changes = np.array([r["price_change_pct"] for r in outcomes], dtype=float)
+    return labels[codes], changes[codes]
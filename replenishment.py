@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from statistics import NormalDist
+from typing import Sequence
+import numpy as np
+import pandas as pd
+
+from perf import timed
+
+SERVICE_LEVEL = 0.95  # chance of not stocking out during a replenishment lead time
+ORDER_COST = 50_000.0  # fixed cost of placing one purchase-order line (KSh 500, in minor units)
+HOLDING_RATE = 0.25  # yearly holding cost as a share of unit cost
+DEFAULT_LEAD_DAYS = 7  # for SKUs whose supplier has no lead-time record
+
+
+def demand_stats(sales: pd.DataFrame, keys: Sequence[str] = ("sku",)) -> pd.DataFrame:
+    """Mean and standard deviation of daily ``units`` per ``keys`` group.
+
+    Rows are bucketed into one dense (group x day) matrix with ``np.bincount``, so days a
+    group sold nothing count as zeros, and the whole catalogue is reduced in one pass.
+    """
+    keys = list(keys)
+    days = pd.to_datetime(sales["date"]).dt.normalize()
+    day_pos = (days - days.min()).dt.days.to_numpy() if len(days) else np.zeros(0, dtype=np.int64)
+    n_days = int(day_pos.max()) + 1 if len(day_pos) else 1
+    grouped = sales.groupby(keys, sort=False, observed=True)
+    group_codes = grouped.ngroup().to_numpy()
+    group_index = grouped.size().index
+    n_groups = len(group_index)
+    per_day = np.bincount(
+        group_codes.astype(np.int64) * n_days + day_pos, weights=sales["units"].to_numpy(dtype=float), minlength=n_groups * n_days
+    ).reshape(n_groups, n_days)
+    std = per_day.std(axis=1, ddof=1) if n_days > 1 else np.zeros(n_groups)
+    return pd.DataFrame({"daily_demand": per_day.mean(axis=1), "demand_std": std}, index=group_index).reset_index()
+
+
+@timed()
+def plan(
+    inventory: pd.DataFrame,
+    suppliers: pd.DataFrame,
+    sales: pd.DataFrame,
+    service_level: float = SERVICE_LEVEL,
+    order_cost: float = ORDER_COST,
+    holding_rate: float = HOLDING_RATE,
+) -> pd.DataFrame:
+    """Reorder point and order quantity for every SKU (or SKU per store).
+
+    Demand comes from ``sales`` history and lead time from the SKU's supplier
+    (``avgLeadDays``, plus ``leadStdDays`` when present; ``DEFAULT_LEAD_DAYS`` if unknown):
+
+    - safety stock = z * sqrt(L * sd_d^2 + d^2 * sd_L^2)
+    - reorder point = d * L + safety stock
+    - order quantity = max(EOQ, reorder point - stock position) once position <= reorder point
+
+    where EOQ = sqrt(2 * yearly demand * ``order_cost`` / (``holding_rate`` * cost)) and
+    the stock position is ``qty`` plus ``on_order`` when present. When ``inventory`` has
+    a ``store`` column, SKUs are planned per store.
+    """
+    keys = ["store", "sku"] if "store" in inventory else ["sku"]
+    stats = demand_stats(sales, keys)
+    out = inventory.merge(stats, on=keys, how="left")
+    out[["daily_demand", "demand_std"]] = out[["daily_demand", "demand_std"]].fillna(0.0)
+
+    lead = suppliers.set_index("name")
+    supplier = out["supplier"].astype(object)
+    lead_days = supplier.map(lead["avgLeadDays"]).fillna(DEFAULT_LEAD_DAYS).to_numpy(dtype=float)
+    lead_std = supplier.map(lead["leadStdDays"]).fillna(0).to_numpy(dtype=float) if "leadStdDays" in lead else 0.0
+    d = out["daily_demand"].to_numpy()
+    sd = out["demand_std"].to_numpy()
+
+    z = NormalDist().inv_cdf(service_level)
+    safety = z * np.sqrt(lead_days * sd**2 + d**2 * lead_std**2)
+    rop = d * lead_days + safety
+    holding = holding_rate * np.maximum(out["cost"].to_numpy(dtype=float), 1e-9)
+    eoq = np.sqrt(2 * d * 365 * order_cost / holding)
+    position = out["qty"].to_numpy(dtype=float) + (out["on_order"].to_numpy(dtype=float) if "on_order" in out else 0.0)
+    needs_order = (position <= rop) & (d > 0)
+    order_qty = np.where(needs_order, np.ceil(np.maximum(eoq, rop - position)), 0).astype(np.int64)
+
+    out["lead_days"] = lead_days
+    out["safety_stock"] = np.ceil(safety).astype(np.int64)
+    out["reorder_point"] = np.ceil(rop).astype(np.int64)
+    out["days_of_cover"] = np.divide(position, d, out=np.full(len(d), np.inf), where=d > 0).round(1)
+    out["order_qty"] = order_qty
+    out["order_value"] = order_qty * out["cost"].to_numpy(dtype=float)
+    return out
+
+
+def purchase_orders(planned: pd.DataFrame) -> pd.DataFrame:
+    """One purchase order per supplier (per store when planned per store) from ``plan`` output."""
+    keys = ["supplier", "store"] if "store" in planned else ["supplier"]
+    lines = planned[planned["order_qty"] > 0]
+    return (
+        lines.groupby(keys, sort=True, observed=True)
+        .agg(lines=("sku", "size"), units=("order_qty", "sum"), value=("order_value", "sum"), min_days_of_cover=("days_of_cover", "min"))
+        .reset_index()
+        .sort_values(["min_days_of_cover", "value"], ascending=[True, False], ignore_index=True)
+    )
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+MINOR_UNITS = 100  # cents per shilling: money is held in cents everywhere, shillings only on screen
+
+# Column types:
+#   "category"                 low-cardinality labels (codes + one copy of each string)
+#   "int8" ... "int64"         counts; values outside the type's range are rejected
+#   "float32"                  ratios such as margins and shares
+#   "money"                    fixed-point amounts in minor units (cents, see MINOR_UNITS), int32
+#                              or int64 by range, so sums are exact; fractions of a cent are rejected
+#   "day"                      calendar dates, datetime64[s] normalized to midnight
+#   "datetime"                 timestamps, datetime64[s]
+# A trailing "?" allows missing values. Columns not listed are passed through unchanged.
+SCHEMAS: Dict[str, Dict[str, str]] = {
+    "sales_by_day": {"date": "day", "revenue": "money"},
+    "sales_detail": {"date": "datetime", "store": "category", "sku": "category", "units": "int32", "revenue": "money"},
+    "top_sellers": {"sku": "category", "category": "category", "sold": "int32", "revenue": "money", "margin": "float32?"},
+    "inventory": {
+        "sku": "category",
+        "category": "category?",
+        "qty": "int32",
+        "expiry": "day?",
+        "cost": "money",
+        "price": "money",
+        "supplier": "category?",
+    },
+    "suppliers": {"lastPrice": "money?", "avgLeadDays": "int16"},
+    "expenses": {"type": "category", "amount": "money"},
+    "orders": {"items": "int16", "total": "money", "status": "category"},
+    "branches": {"store": "category", "region": "category", "expense_share": "float32?"},
+    "branch_sales": {"date": "day", "store": "category", "revenue": "money"},
+}
+
+
+def _convert(values: pd.Series, kind: str) -> pd.Series:
+    if kind == "category":
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            return values
+        # Categories sorted, so sorting by codes matches sorting by label
+        return values.astype(pd.CategoricalDtype(sorted(values.dropna().unique())))
+    if kind in ("day", "datetime"):
+        if not pd.api.types.is_datetime64_dtype(values.dtype):
+            values = pd.to_datetime(values)
+        if isinstance(values.dtype, pd.DatetimeTZDtype):
+            values = values.dt.tz_localize(None)  # keep local wall-clock time
+        # Truncating in numpy is much cheaper than .dt.normalize(); NaT stays NaT
+        stamps = values.to_numpy().astype("datetime64[D]" if kind == "day" else "datetime64[s]")
+        return pd.Series(stamps.astype("datetime64[s]"), index=values.index, name=values.name)
+    numbers = pd.to_numeric(values)
+    if kind == "float32":
+        return numbers.astype(np.float32)
+    if kind == "money":
+        present = numbers.dropna()
+        if not np.isfinite(present).all() or (present != present.round()).any():
+            raise ValueError(f"money must be whole minor units (1/{MINOR_UNITS} shilling)")
+        small = np.iinfo(np.int32)
+        kind = "int32" if present.empty or (present.min() >= small.min and present.max() <= small.max) else "int64"
+    info = np.iinfo(kind)
+    present = numbers.dropna()
+    if len(present) and (present.min() < info.min or present.max() > info.max):
+        raise ValueError(f"values {present.min()}..{present.max()} do not fit {kind}")
+    # Nullable integer dtype only when values are actually missing
+    return numbers.astype(kind if not numbers.isna().any() else kind.capitalize())
+
+
+def _check(table: str, df: pd.DataFrame) -> Tuple[Dict[str, pd.Series], List[str]]:
+    columns, problems = {}, []
+    for column, spec in SCHEMAS[table].items():
+        kind, nullable = spec.rstrip("?"), spec.endswith("?")
+        if column not in df:
+            problems.append(f"{table}.{column}: missing column")
+            continue
+        if not nullable and df[column].isna().any():
+            problems.append(f"{table}.{column}: {int(df[column].isna().sum())} missing values")
+            continue
+        try:
+            columns[column] = _convert(df[column], kind)
+        except (ValueError, TypeError) as exc:
+            problems.append(f"{table}.{column}: {exc}")
+    return columns, problems
+
+
+def validate(table: str, df: pd.DataFrame) -> List[str]:
+    """Problems that would stop ``df`` conforming to ``SCHEMAS[table]`` (empty if none)."""
+    return _check(table, df)[1]
+
+
+def conform(table: str, df: pd.DataFrame) -> pd.DataFrame:
+    """``df`` with the compact dtypes of ``SCHEMAS[table]``; raises ValueError if it doesn't fit."""
+    columns, problems = _check(table, df)
+    if problems:
+        raise ValueError("Data does not match schema: " + "; ".join(problems))
+    return df.assign(**columns)
+
+
+def to_minor_units(shillings: Any) -> Any:
+    """Shilling amounts (a number or Series, e.g. from a CSV export) rounded to whole minor units."""
+    return np.round(pd.to_numeric(shillings) * MINOR_UNITS)
+
+
+def memory_usage(df: pd.DataFrame) -> int:
+    """Bytes held by ``df``, counting the strings inside object columns."""
+    return int(df.memory_usage(index=True, deep=True).sum())
@@ -0,0 +1,48 @@
+"""Start the dashboard with its caches warmed in the background.
+
+    python serve.py [streamlit options, e.g. --server.port 8501]
+
+Runs ``streamlit run app.py`` in this process after starting a thread that imports
+Plotly and fills the loader caches (``charts.warm_up``, ``loaders.warm_up``). The
+imports move ahead of the server, so it listens a little later (about 0.7 s), but no
+visitor pays for them; a page opened while warm-up is still running waits for the
+loaders it shares with it instead of computing them twice. ``BARAKA_WARM_UP=0`` skips
+the warm-up. ``python -m benchmarks.startup`` measures the difference.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+
+# Everything is imported here, before the warm-up thread starts: a module imported from
+# two threads at once can be seen half-initialised
+import plotly.express  # noqa: F401  (the pages and charts.warm_up use it)
+from streamlit.web import cli
+
+import charts
+import loaders
+
+
+def warm_up() -> None:
+    start = time.perf_counter()
+    try:
+        charts.warm_up()
+        loaders.warm_up()
+    except Exception as exc:  # the app still works cold; report and carry on
+        print(f"Warm-up incomplete after {time.perf_counter() - start:.1f}s: {exc!r}", file=sys.stderr)
+    else:
+        print(f"Warm-up done in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+
+def main() -> None:
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    if os.environ.get("BARAKA_WARM_UP", "1") not in ("", "0"):
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    sys.argv = ["streamlit", "run", "app.py", *sys.argv[1:]]
+    sys.exit(cli.main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+from cache import invalidate
+from schema import to_minor_units
+
+
+class DataSource:
+    """Backend for the ``data.get_*`` loaders.
+
+    Methods mirror the functions in ``data.py`` (same names and arguments) so a source
+    can be swapped in with ``data.set_data_source`` without touching the pages.
+    """
+
+    def get_sales_by_day(self, num_days: int = 30, seed: int = 42) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def get_sales_detail(self, num_days: int = 30, stores=("Main",), skus=None, freq: str = "D", seed: int = 42) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def get_top_sellers(self) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def get_inventory(self) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def get_suppliers(self) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def get_expenses(self) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def get_orders(self) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def get_branches(self) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def get_branch_sales(self, num_days: int = 90, seed: int = 42) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def get_basket_pairs(self, top: int = 10) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def query_inventory(self, supplier=None, max_qty=None, expiry_within_days=None, sort_by=("days_to_expiry", "name"), page=0, page_size=50) -> Tuple[pd.DataFrame, int]:
+        raise NotImplementedError
+
+    def query_orders(self, statuses=(), sort_by=("id",), page=0, page_size=50) -> Tuple[pd.DataFrame, int]:
+        raise NotImplementedError
+
+    def list_values(self, table: str, column: str) -> List:
+        raise NotImplementedError
+
+    def table_version(self, table: str) -> int:
+        raise NotImplementedError
+
+
+def _sort_key(column: pd.Series) -> np.ndarray:
+    # Categoricals with sorted categories sort by their integer codes (missing last, as for labels)
+    if isinstance(column.dtype, pd.CategoricalDtype) and column.cat.categories.is_monotonic_increasing:
+        codes = column.cat.codes.to_numpy()
+        return np.where(codes < 0, len(column.cat.categories), codes)
+    return column.to_numpy()
+
+
+def paginate_frame(
+    df: pd.DataFrame,
+    mask: np.ndarray | None = None,
+    sort_by: Sequence[str] = (),
+    page: int = 0,
+    page_size: int | None = 50,
+    extra: Dict[str, np.ndarray] | None = None,
+) -> Tuple[pd.DataFrame, int]:
+    """Filter, sort and slice ``df``, materializing only the rows of the requested page.
+
+    ``sort_by`` names columns of ``df`` or ``extra`` (computed per-row arrays, appended to
+    the output); prefix with "-" for descending. ``page_size=None`` returns every match.
+    Returns ``(page_rows, total_matching_rows)``.
+    """
+    extra = extra or {}
+    idx = np.arange(len(df)) if mask is None else np.flatnonzero(mask)
+    total = len(idx)
+    if sort_by:
+        names = [c.lstrip("-") for c in sort_by]
+        keys = pd.DataFrame({n: (extra[n] if n in extra else _sort_key(df[n]))[idx] for n in names})
+        order = keys.sort_values(names, ascending=[not c.startswith("-") for c in sort_by], kind="stable").index.to_numpy()
+        idx = idx[order]
+    if page_size is not None:
+        idx = idx[page * page_size:(page + 1) * page_size]
+    rows = df.iloc[idx]
+    if extra:
+        rows = rows.assign(**{n: values[idx] for n, values in extra.items()})
+    return rows.reset_index(drop=True), total
+
+
+def _order_by(sort_by: Sequence[str], allowed: Sequence[str]) -> str:
+    terms = []
+    for col in sort_by:
+        name = col.lstrip("-")
+        if name not in allowed:
+            raise ValueError(f"Cannot sort by {name!r}; choose from {list(allowed)}")
+        terms.append(f"{name} {'DESC' if col.startswith('-') else 'ASC'}")
+    return f"ORDER BY {', '.join(terms)}" if terms else ""
+
+
+# Table -> (column DDL, indexes). Dates are ISO "YYYY-MM-DD" text so they sort and
+# range-filter correctly on an index; money is INTEGER minor units (schema.MINOR_UNITS).
+TABLES: Dict[str, tuple] = {
+    "sales": (
+        "date TEXT NOT NULL, store TEXT NOT NULL DEFAULT 'Main', sku TEXT NOT NULL, "
+        "units INTEGER NOT NULL DEFAULT 0, revenue INTEGER NOT NULL, basket_id TEXT",
+        ["date", "sku", "basket_id"],
+    ),
+    "inventory": (
+        "sku TEXT PRIMARY KEY, name TEXT, category TEXT, qty INTEGER, expiry TEXT, "
+        "cost INTEGER, price INTEGER, supplier TEXT",
+        ["supplier", "expiry"],
+    ),
+    "suppliers": ("name TEXT PRIMARY KEY, lastPrice INTEGER, avgLeadDays INTEGER", []),
+    "expenses": ("type TEXT, amount INTEGER", []),
+    "branches": ("store TEXT PRIMARY KEY, region TEXT, expense_share REAL", []),
+    "orders": ("id TEXT PRIMARY KEY, customer TEXT, items INTEGER, total INTEGER, status TEXT", ["status"]),
+}
+
+DATE_COLUMNS = {"sales": ["date"], "inventory": ["expiry"]}
+# Amounts that CSV exports give in shillings
+MONEY_COLUMNS = {"sales": ["revenue"], "inventory": ["cost", "price"], "suppliers": ["lastPrice"], "expenses": ["amount"], "orders": ["total"]}
+
+# Write counter per table, so readers in other processes can tell when to reload
+VERSIONS_DDL = "CREATE TABLE IF NOT EXISTS table_versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+
+
+def _columns(table: str) -> List[str]:
+    return [c.strip().split()[0] for c in TABLES[table][0].split(",")]
+
+
+class SQLiteSource(DataSource):
+    """Serve the dashboard from a local SQLite file.
+
+    Sales are stored at transaction (or any finer-than-daily) grain and aggregated in
+    SQL, so only the rows a page shows are ever pulled into pandas. The sales window is
+    anchored on the latest recorded day rather than today, so historical POS exports
+    still render.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self.create_schema()
+
+    def connect(self) -> sqlite3.Connection:
+        # One connection per thread: Streamlit runs each session in its own thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def create_schema(self) -> None:
+        conn = self.connect()
+        with conn:
+            for table, (ddl, indexes) in TABLES.items():
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({ddl})")
+                for col in indexes:
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{col} ON {table} ({col})")
+            conn.execute(VERSIONS_DDL)
+
+    def _bump_version(self, conn: sqlite3.Connection, table: str) -> None:
+        conn.execute(
+            "INSERT INTO table_versions VALUES (?, 1) ON CONFLICT(name) DO UPDATE SET version = version + 1", (table,)
+        )
+
+    def _value_set(self, name: str, values: Iterable) -> str:
+        """Load ``values`` into a per-connection temp table; returns a subquery over it.
+
+        Used instead of ``IN (?, ?, ...)``, which stops at SQLite's host-parameter limit
+        for catalogue-sized lists.
+        """
+        conn = self.connect()
+        with conn:
+            conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS {name} (value TEXT PRIMARY KEY)")
+            conn.execute(f"DELETE FROM temp.{name}")
+            conn.executemany(f"INSERT OR IGNORE INTO temp.{name} VALUES (?)", ((str(v),) for v in values))
+        return f"(SELECT value FROM temp.{name})"
+
+    def query(self, sql: str, params: Iterable = (), parse_dates: List[str] | None = None) -> pd.DataFrame:
+        return pd.read_sql_query(sql, self.connect(), params=list(params), parse_dates=parse_dates)
+
+    # Bulk loading
+
+    def load_frame(self, table: str, df: pd.DataFrame) -> int:
+        """Insert (or replace, for keyed tables) the rows of ``df`` into ``table``."""
+        conn = self.connect()
+        with conn:
+            n = self._insert(conn, table, df)
+        invalidate()
+        return n
+
+    def _insert(self, conn: sqlite3.Connection, table: str, df: pd.DataFrame) -> int:
+        cols = [c for c in _columns(table) if c in df.columns]
+        if not cols:
+            raise ValueError(f"No columns of table {table!r} found in frame: {list(df.columns)}")
+        df = df[cols].copy()
+        for col in DATE_COLUMNS.get(table, []):
+            if col in df.columns:
+                df[col] = pd.to_datetime(df[col]).dt.strftime("%Y-%m-%d")
+        placeholders = ", ".join("?" for _ in cols)
+        sql = f"INSERT OR REPLACE INTO {table} ({', '.join(cols)}) VALUES ({placeholders})"
+        conn.executemany(sql, df.astype(object).where(df.notna(), None).itertuples(index=False, name=None))
+        self._bump_version(conn, table)
+        return len(df)
+
+    def write_orders(self, orders: Sequence[tuple], status_changes: Sequence[tuple]) -> int:
+        """Apply one batch of order events in a single transaction.
+
+        ``orders`` are new or replaced ``(id, customer, items, total, status)`` rows and
+        ``status_changes`` are ``(status, id)`` pairs applied after them; changes for
+        unknown order ids are ignored. Returns the number of rows written.
+        """
+        conn = self.connect()
+        before = conn.total_changes
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO orders (id, customer, items, total, status) VALUES (?, ?, ?, ?, ?)", orders)
+            conn.executemany("UPDATE orders SET status = ? WHERE id = ?", status_changes)
+            written = conn.total_changes - before
+            self._bump_version(conn, "orders")
+        invalidate("orders")
+        return written
+
+    def load_csv(self, table: str, path: str, chunksize: int = 100_000, rename: Dict[str, str] | None = None) -> int:
+        """Stream a CSV export into ``table`` in chunks of ``chunksize`` rows.
+
+        ``rename`` maps CSV headers to table columns, e.g. ``{"Qty": "units"}``. Amounts
+        are read as shillings and stored as minor units. Memory use is bounded by the chunk
+        size, not the file size.
+        """
+        total = 0
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            if rename:
+                chunk = chunk.rename(columns=rename)
+            money = [c for c in MONEY_COLUMNS.get(table, []) if c in chunk]
+            total += self.load_frame(table, chunk.assign(**{c: to_minor_units(chunk[c]) for c in money}))
+        return total
+
+    def seed_demo(self, num_days: int = 90) -> None:
+        """Replace the store's tables with the synthetic demo tables from ``data.py``.
+
+        The tables are emptied and refilled in one transaction, so seeding again gives
+        the same store rather than a second copy of the (unkeyed) sales lines.
+        """
+        import data
+
+        inventory = data.get_inventory.__wrapped__()
+        branches = data.get_branches.__wrapped__()
+        sales = data.get_sales_detail.__wrapped__(num_days, stores=branches["store"], skus=inventory)
+        frames = {
+            "inventory": inventory,
+            "branches": branches,
+            "sales": sales[sales["units"] > 0],
+            "suppliers": data.get_suppliers.__wrapped__(),
+            "expenses": data.get_expenses.__wrapped__(),
+            "orders": data.get_orders.__wrapped__(),
+        }
+        conn = self.connect()
+        with conn:
+            for table, df in frames.items():
+                conn.execute(f"DELETE FROM {table}")
+                self._insert(conn, table, df)
+        invalidate()
+
+    # DataSource
+
+    def get_sales_by_day(self, num_days: int = 30, seed: int = 42) -> pd.DataFrame:
+        # seed is accepted for signature parity with data.get_sales_by_day and ignored
+        return self.query(
+            "SELECT date, CAST(SUM(revenue) AS INTEGER) AS revenue FROM sales "
+            "WHERE date > date((SELECT max(date) FROM sales), ?) GROUP BY date ORDER BY date",
+            [f"-{int(num_days)} days"],
+            parse_dates=["date"],
+        )
+
+    def get_sales_detail(self, num_days: int = 30, stores=None, skus=None, freq: str = "D", seed: int = 42) -> pd.DataFrame:
+        # Stored rows are returned at daily grain; stores/skus filter rather than generate
+        where = ["date > date((SELECT max(date) FROM sales), ?)"]
+        params: List = [f"-{int(num_days)} days"]
+        if stores is not None and len(stores):
+            where.append(f"store IN {self._value_set('store_filter', stores)}")
+        if skus is not None:
+            where.append(f"sku IN {self._value_set('sku_filter', skus['sku'])}")
+        df = self.query(
+            "SELECT date, store, sku, SUM(units) AS units, SUM(revenue) AS revenue FROM sales "
+            f"WHERE {' AND '.join(where)} GROUP BY date, store, sku ORDER BY date",
+            params,
+            parse_dates=["date"],
+        )
+        return df.astype({"store": "category", "sku": "category"})
+
+    def get_top_sellers(self) -> pd.DataFrame:
+        return self.query(
+            "SELECT s.sku, i.name, i.category, SUM(s.units) AS sold, SUM(s.revenue) AS revenue, "
+            "CASE WHEN i.price > 0 THEN ROUND(1.0 - CAST(i.cost AS REAL) / i.price, 2) END AS margin "
+            "FROM sales s JOIN inventory i ON i.sku = s.sku GROUP BY s.sku ORDER BY sold DESC LIMIT 5"
+        )
+
+    def get_inventory(self) -> pd.DataFrame:
+        return self.query("SELECT * FROM inventory", parse_dates=["expiry"])
+
+    def get_suppliers(self) -> pd.DataFrame:
+        return self.query("SELECT * FROM suppliers")
+
+    def get_expenses(self) -> pd.DataFrame:
+        return self.query("SELECT * FROM expenses")
+
+    def get_orders(self) -> pd.DataFrame:
+        return self.query("SELECT * FROM orders")
+
+    def get_branches(self) -> pd.DataFrame:
+        # Stores seen in sales but missing from the branches table get their own region
+        return self.query(
+            "SELECT store, region, expense_share FROM branches UNION ALL "
+            "SELECT DISTINCT store, 'Unassigned', NULL FROM sales WHERE store NOT IN (SELECT store FROM branches) "
+            "ORDER BY store"
+        )
+
+    def get_branch_sales(self, num_days: int = 90, seed: int = 42) -> pd.DataFrame:
+        return self.query(
+            "SELECT date, store, SUM(revenue) AS revenue FROM sales "
+            "WHERE date > date((SELECT max(date) FROM sales), ?) GROUP BY date, store ORDER BY date",
+            [f"-{int(num_days)} days"],
+            parse_dates=["date"],
+        )
+
+    def query_inventory(self, supplier=None, max_qty=None, expiry_within_days=None, sort_by=("days_to_expiry", "name"), page=0, page_size=50) -> Tuple[pd.DataFrame, int]:
+        days = "CAST(julianday(expiry) - julianday(date('now', 'localtime')) AS INTEGER)"
+        where, params = ["1 = 1"], []
+        if supplier:
+            where.append("supplier = ?")
+            params.append(supplier)
+        if max_qty is not None:
+            where.append("qty <= ?")
+            params.append(int(max_qty))
+        if expiry_within_days is not None:
+            where.append("expiry <= date('now', 'localtime', ?)")
+            params.append(f"{int(expiry_within_days):+d} days")
+        clause = " AND ".join(where)
+        total = int(self.connect().execute(f"SELECT COUNT(*) FROM inventory WHERE {clause}", params).fetchone()[0])
+        order = _order_by(sort_by, _columns("inventory") + ["days_to_expiry"])
+        limit = "" if page_size is None else f"LIMIT {int(page_size)} OFFSET {int(page) * int(page_size)}"
+        rows = self.query(
+            f"SELECT *, {days} AS days_to_expiry FROM inventory WHERE {clause} {order} {limit}",
+            params,
+            parse_dates=["expiry"],
+        )
+        return rows, total
+
+    def query_orders(self, statuses=(), sort_by=("id",), page=0, page_size=50) -> Tuple[pd.DataFrame, int]:
+        clause, params = "1 = 1", list(statuses)
+        if statuses:
+            clause = f"status IN ({', '.join('?' for _ in statuses)})"
+        total = int(self.connect().execute(f"SELECT COUNT(*) FROM orders WHERE {clause}", params).fetchone()[0])
+        order = _order_by(sort_by, _columns("orders"))
+        limit = "" if page_size is None else f"LIMIT {int(page_size)} OFFSET {int(page) * int(page_size)}"
+        return self.query(f"SELECT * FROM orders WHERE {clause} {order} {limit}", params), total
+
+    def list_values(self, table: str, column: str) -> List:
+        if table not in TABLES or column not in _columns(table):
+            raise ValueError(f"Unknown column {table}.{column}")
+        cur = self.connect().execute(f"SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL ORDER BY {column}")
+        return [row[0] for row in cur]
+
+    def table_version(self, table: str) -> int:
+        row = self.connect().execute("SELECT version FROM table_versions WHERE name = ?", (table,)).fetchone()
+        return int(row[0]) if row else 0
+
+    def get_basket_pairs(self, top: int = 10) -> pd.DataFrame:
+        """Mine sales lines that carry a ``basket_id``, streamed in basket order."""
+        from basket import mine_chunks
+        from data import _name_pairs
+
+        chunks = pd.read_sql_query(
+            "SELECT basket_id, sku FROM sales WHERE basket_id IS NOT NULL ORDER BY basket_id",
+            self.connect(),
+            chunksize=500_000,
+        )
+        return _name_pairs(mine_chunks(chunks).bundles(top, min_count=20), self.get_inventory())
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Manage the Baraka SQLite data store")
+    parser.add_argument("--db", default="baraka.db", help="SQLite file (default: baraka.db)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    seed = sub.add_parser("seed-demo", help="load the synthetic demo tables")
+    seed.add_argument("--days", type=int, default=90)
+    load = sub.add_parser("load", help="bulk-load a CSV export into a table")
+    load.add_argument("table", choices=sorted(TABLES))
+    load.add_argument("csv")
+    load.add_argument("--chunksize", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    source = SQLiteSource(args.db)
+    if args.command == "seed-demo":
+        source.seed_demo(args.days)
+        print(f"Seeded {args.db} with {args.days} days of demo data")
+    else:
+        n = source.load_csv(args.table, args.csv, chunksize=args.chunksize)
+        print(f"Loaded {n:,} rows into {args.table}")
+
+
+if __name__ == "__main__":
+    main()
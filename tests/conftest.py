@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import pytest
+
+import data
+
+
+@pytest.fixture(autouse=True)
+def demo_data(monkeypatch):
+    """Every test starts on the synthetic data with empty caches and no stock ledger."""
+    monkeypatch.delenv("BARAKA_DB", raising=False)
+    monkeypatch.delenv("BARAKA_LEDGER", raising=False)
+    data.set_data_source(None)
+    data.set_stock_ledger(None)
+    yield
+    data.set_data_source(None)
+    data.set_stock_ledger(None)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+import alerts
+import data
+import loaders
+from alerts import AlertEngine
+from cache import invalidate
+from ledger import StockLedger
+
+TODAY = pd.Timestamp("2026-03-10")
+
+
+def inventory() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "sku": ["MILK-1L", "RICE-5KG", "EGGS-12"],
+            "name": ["Milk 1L", "Rice 5kg", "Eggs"],
+            "qty": [12, 3, 40],
+            "expiry": [TODAY + pd.Timedelta(days=2), TODAY + pd.Timedelta(days=200), None],
+        }
+    )
+
+
+def sales(days: int = 28, drop_from: int | None = None) -> pd.DataFrame:
+    dates = pd.date_range(end=TODAY - pd.Timedelta(days=1), periods=days, freq="D")
+    revenue = np.full(days, 1000.0)
+    if drop_from is not None:
+        revenue[drop_from:] = 700.0
+    return pd.DataFrame({"date": dates, "revenue": revenue})
+
+
+def test_engine_matches_stateless_evaluate():
+    inv, s = inventory(), sales(drop_from=21)
+    engine = AlertEngine.from_frames(inv, s)
+    assert engine.alerts(TODAY) == alerts.evaluate(inv, s, TODAY)
+    assert {a.kind for a in engine.alerts(TODAY)} == {"low_stock", "expiry", "sales_drop"}
+
+
+def test_engine_keeps_only_the_days_it_reads():
+    engine = AlertEngine.from_frames(inventory(), sales(days=400))
+    assert len(engine._daily) == alerts.HISTORY_DAYS
+    assert engine.last_day == TODAY - pd.Timedelta(days=1)
+
+
+def test_replacing_an_open_day_does_not_double_count():
+    engine = AlertEngine.from_frames(inventory(), sales())
+    last = sales().tail(1)
+    engine.apply_sales(last, replace=True)
+    engine.apply_sales(last, replace=True)
+    assert engine._daily[engine._days[-1]] == 1000.0
+    engine.apply_sales(last)
+    assert engine._daily[engine._days[-1]] == 2000.0
+
+
+def test_engine_follows_ledger_until_untracked():
+    engine = AlertEngine.from_frames(inventory(), sales())
+    ledger = StockLedger()
+    engine.track(ledger)
+    ledger.record("sale", "EGGS-12", 38)  # ledger balance -38: the engine takes its qty
+    low = next(a for a in engine.alerts(TODAY) if a.kind == "low_stock")
+    assert "EGGS-12" in low.skus
+    engine.untrack(ledger)
+    ledger.record("receipt", "RICE-5KG", 50, TODAY + pd.Timedelta(days=300))
+    low = next(a for a in engine.alerts(TODAY) if a.kind == "low_stock")
+    assert "RICE-5KG" in low.skus
+
+
+def test_save_and_load_round_trip(tmp_path):
+    engine = AlertEngine.from_frames(inventory(), sales(drop_from=24))
+    engine.save(str(tmp_path / "alerts.json"))
+    assert AlertEngine.load(str(tmp_path / "alerts.json")).alerts(TODAY) == engine.alerts(TODAY)
+
+
+def test_loader_reuses_the_engine_and_matches_evaluate():
+    engine = loaders.alert_engine()
+    found = loaders.alerts()
+    assert loaders.alert_engine() is engine
+    assert found == alerts.evaluate(data.get_inventory(), data.get_sales_by_day(alerts.HISTORY_DAYS))
+    invalidate()
+    assert loaders.alert_engine() is not engine
+
+
+def test_loader_serves_alerts_from_the_ledger_fed_engine():
+    ledger = StockLedger.from_inventory(data.get_inventory())
+    data.set_stock_ledger(ledger)
+    engine = loaders.alert_engine()
+    before = loaders.alerts()
+    sku = next(s for s in data.get_inventory()["sku"].astype(str) if s not in {x for a in before for x in a.skus})
+    ledger.record("write_off", sku, ledger.on_hand(sku))
+    assert loaders.alert_engine() is engine
+    assert any(sku in a.skus for a in loaders.alerts() if a.kind == "low_stock")
+    invalidate()
+    assert loaders._tracking is None
+    assert ledger._listeners == []
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import loaders
+from analytics import OTHER, CubeRefresher, SalesCube
+from cache import invalidate
+
+CATALOGUE = pd.DataFrame({"sku": ["A", "B", "C"], "category": ["Dairy", "Dairy", "Bakery"]})
+
+
+def lines(days: int = 21, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    n = days * 40
+    stamps = pd.Timestamp("2026-01-05") + pd.to_timedelta(rng.integers(0, days * 24, n), unit="h")
+    units = rng.integers(1, 5, n)
+    return pd.DataFrame({"date": stamps, "sku": rng.choice(["A", "B", "C"], n), "units": units, "revenue": units * 10.0})
+
+
+def test_queries_match_pandas():
+    raw = lines()
+    cube = SalesCube(CATALOGUE)
+    cube.update(raw)
+    day = raw["date"].dt.normalize()
+    daily = raw.groupby(day)["revenue"].sum()
+    assert cube.daily()["revenue"].sum() == pytest.approx(raw["revenue"].sum())
+    assert cube.daily(7)["revenue"].tolist() == pytest.approx(daily.iloc[-7:].tolist())
+    by_sku = cube.by_sku(category="Dairy").set_index("sku")["units"]
+    assert by_sku.to_dict() == raw[raw["sku"] != "C"].groupby("sku")["units"].sum().to_dict()
+    hours = cube.by_hour(None, "Bakery")
+    bakery = raw[raw["sku"] == "C"]
+    expected = bakery.groupby(bakery["date"].dt.hour)["revenue"].sum().reindex(range(24), fill_value=0) / cube.n_days
+    assert hours["revenue"].tolist() == pytest.approx(expected.tolist())
+    assert cube.by_weekday()["weekday"].tolist()[0] == "Monday"
+    assert cube.by_category()["share"].sum() == pytest.approx(1)
+
+
+def test_incremental_updates_equal_one_build():
+    raw = lines()
+    whole = SalesCube(CATALOGUE)
+    whole.update(raw)
+    parts = SalesCube(CATALOGUE)
+    day = raw["date"].dt.normalize()
+    for d in sorted(day.unique()):
+        parts.update(raw[day == d])
+    # Re-reading the last (still open) day replaces it instead of adding it twice
+    parts.update(raw[day == day.max()], replace=True)
+    pd.testing.assert_frame_equal(parts.daily(), whole.daily())
+    pd.testing.assert_frame_equal(parts.by_hour(), whole.by_hour())
+
+
+def test_cube_slides_to_keep_only_max_days():
+    raw = lines()
+    whole = SalesCube(CATALOGUE)
+    whole.update(raw)
+    capped, at_once = SalesCube(CATALOGUE, max_days=7), SalesCube(CATALOGUE, max_days=7)
+    at_once.update(raw)
+    day = raw["date"].dt.normalize()
+    for d in sorted(day.unique()):
+        capped.update(raw[day == d])
+    for cube in (capped, at_once):
+        assert cube.n_days == 7 and len(cube._revenue) == 7
+        assert cube.start == day.max() - pd.Timedelta(days=6)
+        pd.testing.assert_frame_equal(cube.daily(), whole.daily(7))
+        pd.testing.assert_frame_equal(cube.by_hour(), whole.by_hour(7))
+    # Lines from before the window are ignored rather than growing the cube backwards
+    capped.update(raw[day == day.min()])
+    pd.testing.assert_frame_equal(capped.daily(), whole.daily(7))
+
+
+def test_hourly_sales_come_from_one_fixed_window():
+    everything = loaders._hourly_sales(None)
+    since = everything["date"].max().normalize() - pd.Timedelta(days=2)
+    recent = loaders._hourly_sales(since)
+    pd.testing.assert_frame_equal(recent, everything[everything["date"] >= since].reset_index(drop=True))
+    assert everything["date"].dt.normalize().nunique() == loaders.ANALYTICS_DAYS
+
+
+def test_unknown_skus_go_to_other():
+    cube = SalesCube(CATALOGUE)
+    cube.update(pd.DataFrame({"date": ["2026-01-05"], "sku": ["NEW"], "units": [1], "revenue": [5.0]}))
+    assert cube.by_sku().set_index("sku").loc["NEW", "category"] == OTHER
+    with pytest.raises(ValueError):
+        cube.daily(category="Frozen")
+
+
+def test_refresher_stops_when_cache_is_invalidated():
+    loaders.analytics_cube()
+    refresher = loaders._refresher
+    assert refresher is not None and refresher._thread.is_alive()
+    invalidate("orders")
+    assert loaders._refresher is refresher
+    invalidate()
+    refresher._thread.join(2)
+    assert not refresher._thread.is_alive()
+    assert loaders._refresher is None
+
+
+def test_refresher_keeps_last_good_cube_on_error():
+    cube = SalesCube(CATALOGUE)
+
+    def fetch(since):
+        raise OSError("source down")
+
+    refresher = CubeRefresher(cube, fetch, interval=0.01).start()
+    try:
+        for _ in range(200):
+            if refresher.error is not None:
+                break
+            refresher._stop.wait(0.01)
+        assert isinstance(refresher.error, OSError)
+    finally:
+        refresher.stop()
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from collections import Counter
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+import basket
+
+
+def transactions(n_baskets: int = 400, n_items: int = 12, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    sizes = rng.integers(1, 6, n_baskets)
+    ids = np.repeat([f"B{i:04d}" for i in range(n_baskets)], sizes)
+    # Repeat scans of an item in one basket are common; they must count once
+    skus = [f"SKU-{i}" for i in rng.integers(0, n_items, len(ids))]
+    return pd.DataFrame({"basket_id": ids, "sku": skus})
+
+
+def brute_force(df: pd.DataFrame):
+    items, pairs = Counter(), Counter()
+    for _, rows in df.groupby("basket_id"):
+        unique = sorted(set(rows["sku"]))
+        items.update(unique)
+        pairs.update(combinations(unique, 2))
+    return df["basket_id"].nunique(), items, pairs
+
+
+def as_counts(pairs: pd.DataFrame) -> dict:
+    return {tuple(sorted((a, b))): c for a, b, c in zip(pairs["item_a"], pairs["item_b"], pairs["count"])}
+
+
+def test_pair_counts_and_rule_metrics_match_brute_force():
+    df = transactions()
+    miner = basket.mine(df)
+    n, items, pairs = brute_force(df)
+    assert miner.n_baskets == n
+    mined = miner.pairs()
+    assert as_counts(mined) == dict(pairs)
+    row = mined.iloc[0]
+    a, b = row["item_a"], row["item_b"]
+    assert row["support"] == row["count"] / n
+    assert row["confidence_a_b"] == row["count"] / items[a]
+    assert np.isclose(row["lift"], row["count"] * n / (items[a] * items[b]))
+
+
+def test_incremental_updates_equal_one_pass():
+    df = transactions()
+    whole = basket.mine(df)
+    # Split on basket boundaries, the second batch introducing new items
+    cut = df["basket_id"].ne(df["basket_id"].shift()).cumsum().searchsorted(200)
+    later = df.iloc[cut:].assign(sku=lambda d: d["sku"].str.replace("SKU-1", "NEW-1"))
+    miner = basket.mine(df.iloc[:cut]).update(later["basket_id"].to_numpy(), later["sku"].to_numpy())
+    expected = brute_force(pd.concat([df.iloc[:cut], later]))[2]
+    assert as_counts(miner.pairs()) == dict(expected)
+    assert miner.n_baskets == whole.n_baskets
+
+
+def test_mine_chunks_keeps_baskets_split_across_chunks_whole():
+    df = transactions()
+    chunks = (df.iloc[i:i + 37] for i in range(0, len(df), 37))
+    streamed = basket.mine_chunks(chunks)
+    whole = basket.mine(df)
+    assert streamed.n_baskets == whole.n_baskets
+    assert as_counts(streamed.pairs()) == as_counts(whole.pairs())
+
+
+def test_bundles_filter_and_rank_by_lift():
+    df = pd.DataFrame(
+        {
+            "basket_id": [1, 1, 2, 2, 3, 3, 4, 5, 6],
+            "sku": ["bread", "milk", "bread", "milk", "bread", "tea", "tea", "milk", "tea"],
+        }
+    )
+    bundles = basket.mine(df).bundles(top=5, min_count=2)
+    assert list(zip(bundles["item_a"], bundles["item_b"])) == [("bread", "milk")]
+    assert bundles["lift"].iloc[0] == 2 * 6 / (3 * 3)
+
+
+def test_frequent_triples_match_brute_force():
+    df = transactions(n_items=6, seed=1)
+    triples = basket.frequent_triples(df, min_support=0.02, top=100)
+    n = df["basket_id"].nunique()
+    expected = Counter()
+    for _, rows in df.groupby("basket_id"):
+        expected.update(combinations(sorted(set(rows["sku"])), 3))
+    min_count = int(np.ceil(0.02 * n))
+    got = {(a, b, c): k for a, b, c, k in zip(triples["item_a"], triples["item_b"], triples["item_c"], triples["count"])}
+    assert got == {t: k for t, k in expected.items() if k >= min_count}
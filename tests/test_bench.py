@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+from benchmarks import bench
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_cases_use_compute_modules_only():
+    code = (
+        "import sys; from benchmarks import bench; bench.run(list(bench.CASES), [1000], 1); "
+        "print([m for m in ('app', 'streamlit') if m in sys.modules])"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_noise_is_not_a_regression():
+    baseline = {"case": {"1000": {"seconds": 0.010, "spread": 0.002, "peak_bytes": 1000}}}
+    # 40% slower, but within three spreads of the baseline's run-to-run noise
+    noisy = {"case": {"1000": {"seconds": 0.014, "spread": 0.001, "peak_bytes": 1000}}}
+    assert bench.compare(noisy, baseline, 0.25) == []
+    # Too small to matter whatever the ratio
+    tiny = {"case": {"1000": {"seconds": 0.001, "peak_bytes": 1000}}}
+    assert bench.compare(tiny, {"case": {"1000": {"seconds": 0.0002, "peak_bytes": 1000}}}, 0.25) == []
+
+
+def test_slowdown_beyond_noise_is_flagged():
+    baseline = {"case": {"1000": {"seconds": 0.010, "spread": 0.0005, "peak_bytes": 1000}}}
+    slow = {"case": {"1000": {"seconds": 0.030, "spread": 0.0005, "peak_bytes": 1000}}}
+    assert bench.compare(slow, baseline, 0.25) == ["case n=1000: seconds 0.01 -> 0.03"]
+    bigger = {"case": {"1000": {"seconds": 0.010, "peak_bytes": 4 * 2**20}}}
+    assert len(bench.compare(bigger, baseline, 0.25)) == 1
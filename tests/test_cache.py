@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from cache import cached, invalidate
+
+
+def counting(name: str, **options):
+    calls = []
+
+    def load(x):
+        calls.append(x)
+        return [x]
+
+    load.__qualname__ = name
+    return cached(**options)(load), calls
+
+
+def test_hits_misses_and_lru_eviction():
+    load, calls = counting("lru", ttl=None, maxsize=2)
+    assert load(1) is load(1)
+    load(2)
+    load(3)  # evicts 1
+    load(1)
+    assert calls == [1, 2, 3, 1]
+    stats = load.cache_stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (1, 4, 2, 2)
+
+
+def test_ttl_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    load, calls = counting("ttl", ttl=10)
+    load(1)
+    now[0] += 5
+    load(1)
+    now[0] += 10
+    load(1)
+    assert calls == [1, 1]
+    assert load.cache_stats()["expirations"] == 1
+
+
+def test_invalidate_by_table_keeps_other_caches():
+    orders, order_calls = counting("orders", tables=("orders",))
+    sales, sales_calls = counting("sales", tables=("sales",))
+    plain, plain_calls = counting("plain")
+    for load in (orders, sales, plain):
+        load(1)
+    invalidate("orders")
+    for load in (orders, sales, plain):
+        load(1)
+    assert (order_calls, sales_calls, plain_calls) == ([1, 1], [1], [1])
+    invalidate()
+    for load in (orders, sales, plain):
+        load(1)
+    assert (order_calls, sales_calls, plain_calls) == ([1, 1, 1], [1, 1], [1, 1])
+
+
+def test_concurrent_callers_compute_once():
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    @cached(ttl=None)
+    def slow(x):
+        calls.append(x)
+        started.set()
+        release.wait(5)
+        return x * 2
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(slow(4)))
+    first.start()
+    started.wait(5)
+    others = [threading.Thread(target=lambda: results.append(slow(4))) for _ in range(3)]
+    for t in others:
+        t.start()
+    release.set()
+    for t in [first, *others]:
+        t.join(5)
+    assert results == [8, 8, 8, 8]
+    assert calls == [4]
+    assert slow.cache_stats()["misses"] == 1
+
+
+def test_failed_call_is_not_cached_and_waiters_retry():
+    attempts = []
+
+    @cached(ttl=None)
+    def flaky(x):
+        attempts.append(x)
+        if len(attempts) == 1:
+            raise RuntimeError("source unavailable")
+        return x
+
+    with pytest.raises(RuntimeError):
+        flaky(1)
+    assert flaky(1) == 1
+    assert attempts == [1, 1]
+
+
+def test_redecorated_function_keeps_its_results():
+    # As when Streamlit re-executes a page script that defines a cached function
+    source = "def figure(x):\n    calls.append(x)\n    return [x]\n"
+    calls = []
+
+    def run_script(text):
+        scope = {"calls": calls, "__name__": "page_script"}
+        exec(compile(text, "page_script.py", "exec"), scope)
+        return cached(ttl=None)(scope["figure"])
+
+    first = run_script(source)(1)
+    assert run_script(source)(1) is first
+    assert calls == [1]
+    run_script(source.replace("[x]", "[x, x]"))(1)  # edited: recompute
+    assert calls == [1, 1]
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+import charts
+
+
+def series(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"date": pd.date_range("2020-01-01", periods=n, freq="h"), "revenue": rng.normal(100, 10, n)})
+
+
+def test_lttb_keeps_endpoints_and_extremes():
+    y = np.zeros(10_000)
+    y[4321], y[7000] = 50.0, -50.0
+    picked = charts.lttb(np.arange(len(y)), y, 100)
+    assert len(picked) == 100
+    assert picked[0] == 0 and picked[-1] == len(y) - 1
+    assert {4321, 7000} <= set(picked.tolist())
+    assert np.all(np.diff(picked) > 0)
+
+
+def test_prepare_series_caps_points():
+    df = series(20_000)
+    assert len(charts.prepare_series(df)) == charts.MAX_POINTS
+    weekly = charts.prepare_series(df, granularity="Week")
+    assert len(weekly) < 130
+    assert weekly["date"].dt.weekday.eq(0).all()
+    small = series(50)
+    assert charts.prepare_series(small) is small
+
+
+def test_prepare_series_averages_or_sums_buckets():
+    days = pd.DataFrame({"date": pd.date_range("2026-03-02", periods=14), "revenue": [100.0] * 7 + [200.0] * 7})
+    assert charts.prepare_series(days, granularity="Week")["revenue"].tolist() == [100.0, 200.0]
+    assert charts.prepare_series(days, granularity="Week", how="sum")["revenue"].tolist() == [700.0, 1400.0]
+
+
+def test_long_series_switch_to_webgl_after_downsampling():
+    assert charts.WEBGL_THRESHOLD < charts.MAX_POINTS
+    long = charts.prepare_series(series(20_000))
+    assert type(charts.scatter_trace(long["date"], long["revenue"])).__name__ == "Scattergl"
+    short = series(90)
+    assert type(charts.scatter_trace(short["date"], short["revenue"])).__name__ == "Scatter"
+
+
+def test_top_n_with_other():
+    df = pd.DataFrame({"name": list("abcdef"), "sold": [6, 5, 4, 3, 2, 1]})
+    out = charts.top_n_with_other(df, "name", "sold", n=3)
+    assert out["name"].tolist() == ["a", "b", "c", "Other"]
+    assert out["sold"].tolist() == [6, 5, 4, 6]
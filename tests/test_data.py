@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+import data
+from ledger import StockLedger
+from schema import MINOR_UNITS
+
+
+def loop_sales_by_day(num_days: int, seed: int) -> list:
+    """The original per-day generator (in shillings), which reseeded the global RNG."""
+    state = np.random.get_state()
+    np.random.seed(seed)
+    try:
+        dates = data.get_sales_by_day(num_days, seed)["date"]
+        return [
+            int(300 + math.sin(i / 2.0) * 80 + (200 if d.weekday() >= 5 else 0) + np.random.randint(0, 120)) * MINOR_UNITS
+            for i, d in enumerate(dates)
+        ]
+    finally:
+        np.random.set_state(state)
+
+
+@pytest.mark.parametrize("num_days, seed", [(30, 42), (7, 1), (400, 42)])
+def test_sales_by_day_matches_the_loop_it_replaced(num_days, seed):
+    sales = data.get_sales_by_day(num_days, seed)
+    assert len(sales) == num_days
+    assert sales["date"].is_monotonic_increasing
+    assert list(sales["revenue"]) == loop_sales_by_day(num_days, seed)
+
+
+def test_generators_leave_the_global_rng_alone():
+    np.random.seed(0)
+    expected = np.random.rand()
+    np.random.seed(0)
+    data.get_sales_by_day(30)
+    data.get_sales_detail(3, stores=["Main", "Westlands"])
+    assert np.random.rand() == expected
+
+
+def test_sales_detail_grid_and_determinism():
+    inventory = data.get_inventory()
+    daily = data.get_sales_detail(5, stores=["Main", "Westlands"])
+    assert len(daily) == 5 * 2 * len(inventory)
+    assert set(daily["store"].astype(str)) == {"Main", "Westlands"}
+    assert (daily["revenue"] == daily["units"] * daily["sku"].astype(str).map(inventory.set_index("sku")["price"])).all()
+    again = data.get_sales_detail(5, stores=["Main", "Westlands"])
+    assert daily.equals(again)
+    assert not daily["units"].equals(data.get_sales_detail(5, stores=["Main", "Westlands"], seed=7)["units"])
+
+    hourly = data.get_sales_detail(2, freq="h")
+    assert len(hourly) == 2 * 24 * len(inventory)
+    closed = hourly[hourly["date"].dt.hour < 6]
+    assert closed["units"].sum() == 0
+    with pytest.raises(ValueError, match="freq"):
+        data.get_sales_detail(2, freq="W")
+
+
+def test_switching_stock_ledgers_moves_the_subscription():
+    first, second = StockLedger(), StockLedger()
+    data.set_stock_ledger(first)
+    data.set_stock_ledger(first)
+    assert first._batch_listeners == [data._stock_moved]
+    data.set_stock_ledger(second)
+    assert first._batch_listeners == [] and second._batch_listeners == [data._stock_moved]
+    data.set_stock_ledger(None)
+    assert second._batch_listeners == []
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import gzip
+import io
+
+import pandas as pd
+import pytest
+
+import data
+import export
+
+
+def frame(n: int = 1_234) -> pd.DataFrame:
+    return pd.DataFrame({"sku": [f"SKU-{i}" for i in range(n)], "qty": range(n), "price": [i * 0.5 for i in range(n)]})
+
+
+def test_frame_chunks_split_and_keep_empty_frames():
+    chunks = list(export.frame_chunks(frame(), chunksize=500))
+    assert [len(c) for c in chunks] == [500, 500, 234]
+    empty = list(export.frame_chunks(frame(0)))
+    assert len(empty) == 1 and list(empty[0].columns) == ["sku", "qty", "price"]
+
+
+def test_query_chunks_walks_every_page():
+    chunks = list(export.query_chunks(lambda page, size: data.query_inventory(page=page, page_size=size), chunksize=7))
+    full, total = data.query_inventory(page_size=None)
+    assert sum(len(c) for c in chunks) == total
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), full)
+    # No match still yields the (empty) first page, for the header
+    none = list(export.query_chunks(lambda page, size: data.query_inventory(max_qty=-1, page=page, page_size=size)))
+    assert len(none) == 1 and none[0].empty
+
+
+@pytest.mark.parametrize("fmt", list(export.FORMATS))
+def test_round_trip(fmt):
+    df = frame()
+    out = export.export_file(export.frame_chunks(df, chunksize=500), fmt)
+    if fmt == "Parquet":
+        back = pd.read_parquet(out)
+    else:
+        raw = out.getvalue()
+        back = pd.read_csv(io.BytesIO(gzip.decompress(raw) if fmt == "CSV (gzip)" else raw))
+    pd.testing.assert_frame_equal(back, df)
+
+
+def test_write_export_counts_rows_and_rejects_unknown_formats():
+    assert export.write_export(export.frame_chunks(frame(), 100), "CSV", io.BytesIO()) == 1_234
+    with pytest.raises(ValueError, match="Unknown export format"):
+        export.write_export(export.frame_chunks(frame()), "XLSX", io.BytesIO())
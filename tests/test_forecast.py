@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data
+import forecast
+import utils
+
+
+def weekly(n_days: int = 70, level: float = 100.0, trend: float = 0.0) -> np.ndarray:
+    pattern = np.array([1.0, 0.8, 0.9, 1.0, 1.1, 1.6, 1.4])
+    return (level + trend * np.arange(n_days)) * pattern[np.arange(n_days) % 7]
+
+
+@pytest.mark.parametrize("model", sorted(forecast.MODELS))
+def test_models_recover_a_clean_weekly_pattern(model):
+    y = weekly()
+    preds, sigma = forecast.MODELS[model](y, horizon=14)
+    assert preds.shape == (1, 14) and sigma.shape == (1,)
+    np.testing.assert_allclose(preds[0], weekly(84)[70:], rtol=0.02)
+
+
+@pytest.mark.parametrize("model", sorted(forecast.MODELS))
+def test_batch_fit_equals_one_series_at_a_time(model):
+    rng = np.random.default_rng(0)
+    y = np.stack([weekly(56, level=l) + rng.normal(0, 5, 56) for l in (50, 100, 400)])
+    batch, batch_sigma = forecast.MODELS[model](y, horizon=7)
+    for i, row in enumerate(y):
+        single, sigma = forecast.MODELS[model](row, horizon=7)
+        np.testing.assert_allclose(batch[i], single[0])
+        np.testing.assert_allclose(batch_sigma[i], sigma[0])
+
+
+def test_short_series_fall_back_to_the_mean():
+    preds, _ = forecast.holt_winters([10.0, 20.0, 30.0], horizon=3)
+    np.testing.assert_allclose(preds, [[20.0, 20.0, 20.0]])
+
+
+def test_intervals_widen_and_stay_non_negative():
+    rng = np.random.default_rng(1)
+    out = forecast.forecast(weekly() + rng.normal(0, 10, 70), horizon=7, model="seasonal_naive")
+    width = out["upper"] - out["mean"]
+    assert (np.diff(width, axis=1) > 0).all()
+    assert (out["lower"] >= 0).all() and (out["lower"] <= out["mean"]).all()
+    with pytest.raises(ValueError, match="Unknown model"):
+        forecast.forecast(weekly(), model="prophet")
+
+
+def test_forecast_frame_starts_the_day_after_the_last_sale():
+    sales = data.get_sales_by_day(60)
+    out = forecast.forecast_frame(sales.sample(frac=1, random_state=0), horizon=7)
+    assert list(out["date"]) == list(pd.date_range(sales["date"].max() + pd.Timedelta(days=1), periods=7))
+    assert ((out["lower"] <= out["predicted"]) & (out["predicted"] <= out["upper"])).all()
+
+
+def test_simple_forecast_still_accepts_a_seed():
+    sales = data.get_sales_by_day(60)
+    expected = forecast.forecast_frame(sales, horizon=7)
+    pd.testing.assert_frame_equal(utils.simple_forecast_next_7_days(sales, 7), expected)
+    pd.testing.assert_frame_equal(utils.simple_forecast_next_7_days(sales, seed=3), expected)
+    naive = utils.simple_forecast_next_7_days(sales, model="seasonal_naive")
+    pd.testing.assert_frame_equal(naive, forecast.forecast_frame(sales, horizon=7, model="seasonal_naive"))
+
+
+def test_backtest_scores_every_model():
+    y = weekly(84) * (1 + np.random.default_rng(2).normal(0, 0.05, 84))
+    result = forecast.backtest(y, horizon=7, folds=3).set_index("model")
+    assert set(result.index) == set(forecast.MODELS)
+    assert (result["mape"] < 15).all()
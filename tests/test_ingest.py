@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+import ingest
+from store import SQLiteSource
+
+
+class FailingSink:
+    def __init__(self):
+        self.calls = 0
+
+    def write_orders(self, orders, status_changes) -> int:
+        self.calls += 1
+        raise OSError("database is locked")
+
+
+async def events(n: int):
+    for event in ingest.demo_events(n):
+        yield event
+
+
+def test_parse_event_validates():
+    assert ingest.parse_event('{"type": "status", "id": "ORD-1", "status": "Delivered"}') == ("status", ("Delivered", "ORD-1"))
+    order = {"type": "order", "id": "ORD-1", "customer": "Asha", "items": 2, "total": 199.99, "status": "Pending"}
+    assert ingest.parse_event(order) == ("order", ("ORD-1", "Asha", 2, 19999, "Pending"))  # total in minor units
+    with pytest.raises(ValueError):
+        ingest.parse_event({"type": "refund", "id": "ORD-1", "status": "Pending"})
+    with pytest.raises(KeyError):
+        ingest.parse_event({"type": "order", "id": "ORD-1", "status": "Pending"})
+
+
+def test_compact_folds_status_into_new_orders():
+    batch = [
+        ("order", ("ORD-1", "Asha", 2, 100.0, "Pending")),
+        ("status", ("Preparing", "ORD-1")),
+        ("status", ("Dispatched", "ORD-9")),
+        ("status", ("Delivered", "ORD-9")),
+    ]
+    orders, changes = ingest.compact(batch)
+    assert orders == [("ORD-1", "Asha", 2, 100.0, "Preparing")]
+    assert changes == [("Delivered", "ORD-9")]
+
+
+def test_run_writes_events_to_store(tmp_path):
+    store = SQLiteSource(str(tmp_path / "orders.db"))
+    raw = list(ingest.demo_events(500))
+    ingestor = ingest.OrderIngestor(store, batch_size=50, max_pending=100)
+
+    async def source():
+        for event in raw:
+            yield json.dumps(event)
+        yield "not json"
+
+    stats = asyncio.run(ingestor.run(source()))
+    assert (stats.received, stats.rejected) == (500, 1)
+    last_status = {}
+    for event in raw:
+        last_status[event["id"]] = event["status"]
+    orders = store.get_orders()
+    assert dict(zip(orders["id"].astype(str), orders["status"].astype(str))) == last_status
+
+
+def test_failing_sink_raises_instead_of_hanging():
+    # More events than the queue holds: without the writer check the reader blocks forever
+    sink = FailingSink()
+    ingestor = ingest.OrderIngestor(sink, batch_size=10, flush_interval=0, max_pending=20)
+    with pytest.raises(OSError, match="locked"):
+        asyncio.run(asyncio.wait_for(ingestor.run(events(10_000)), 5))
+    assert sink.calls == 1
+    assert ingestor.stats.received <= 21
+
+
+def test_failing_sink_raises_at_end_of_short_stream():
+    ingestor = ingest.OrderIngestor(FailingSink(), batch_size=10, max_pending=1000)
+    with pytest.raises(OSError):
+        asyncio.run(asyncio.wait_for(ingestor.run(events(5)), 5))
+
+
+def test_cancel_flushes_pending_events(tmp_path):
+    store = SQLiteSource(str(tmp_path / "orders.db"))
+    ingestor = ingest.OrderIngestor(store, batch_size=1000, flush_interval=0.5)
+
+    async def main():
+        queue: asyncio.Queue = asyncio.Queue()
+        for event in ingest.demo_events(30):
+            queue.put_nowait(event)
+        task = asyncio.create_task(ingestor.run(ingest.queue_source(queue)))
+        while ingestor.stats.received < 30:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert ingestor.stats.written > 0
+    assert len(store.get_orders()) == ingestor.stats.written
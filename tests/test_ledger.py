@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ledger import StockLedger
+
+JAN = [date(2026, 1, d) for d in range(1, 29)]
+
+
+def lot_total(ledger: StockLedger, sku: str) -> int:
+    return sum(q for _, q in ledger.lots(sku))
+
+
+def test_sales_consume_earliest_lot_first():
+    ledger = StockLedger()
+    ledger.record("receipt", "MILK-1L", 10, JAN[10])
+    ledger.record("receipt", "MILK-1L", 5, JAN[3])
+    ledger.record("sale", "MILK-1L", 7)
+    assert ledger.on_hand("MILK-1L") == 8
+    assert ledger.lots("MILK-1L") == [(JAN[10], 8)]
+    assert ledger.earliest_expiry("MILK-1L") == JAN[10].toordinal()
+
+
+def test_oversold_units_are_paid_off_by_the_next_receipt():
+    ledger = StockLedger()
+    ledger.record("receipt", "FLOUR-2KG", 10, JAN[20])
+    ledger.record("sale", "FLOUR-2KG", 29)
+    assert ledger.on_hand("FLOUR-2KG") == -19
+    assert ledger.lots("FLOUR-2KG") == []
+    ledger.record("receipt", "FLOUR-2KG", 33, JAN[25])
+    assert ledger.on_hand("FLOUR-2KG") == 14
+    assert ledger.lots("FLOUR-2KG") == [(JAN[25], 14)]
+    ledger.record("receipt", "FLOUR-2KG", 1, JAN[26])
+    assert lot_total(ledger, "FLOUR-2KG") == 15
+
+
+def test_lots_match_on_hand_under_random_movements(tmp_path):
+    rng = np.random.default_rng(7)
+    ledger = StockLedger(str(tmp_path), snapshot_every=50)
+    skus = ["A", "B", "C"]
+    for _ in range(400):
+        kind = rng.choice(["receipt", "return", "sale", "sale", "write_off"])
+        expiry = JAN[rng.integers(len(JAN))] if kind == "receipt" else None
+        ledger.record(str(kind), str(rng.choice(skus)), int(rng.integers(0, 12)), expiry)
+        for sku in skus:
+            assert lot_total(ledger, sku) == max(ledger.on_hand(sku), 0)
+    ledger.close()
+
+    reopened = StockLedger.open(str(tmp_path))
+    for sku in skus:
+        assert reopened.on_hand(sku) == ledger.on_hand(sku)
+        assert reopened.lots(sku) == ledger.lots(sku)
+    reopened.close()
+
+
+def test_open_replays_only_after_snapshot(tmp_path):
+    ledger = StockLedger(str(tmp_path), snapshot_every=3)
+    ledger.record_batch([("receipt", "EGGS", 4, JAN[5])] * 4)
+    ledger.close()
+    reopened = StockLedger.open(str(tmp_path))
+    assert (reopened.seq, reopened.on_hand("EGGS")) == (4, 16)
+    reopened.record("sale", "EGGS", 20)
+    reopened.record("receipt", "EGGS", 6, JAN[6])
+    reopened.snapshot()
+    reopened.close()
+    again = StockLedger.open(str(tmp_path))
+    assert again.on_hand("EGGS") == 2
+    assert again.lots("EGGS") == [(JAN[6], 2)]
+    again.close()
+
+
+def test_rejects_bad_movements():
+    ledger = StockLedger()
+    with pytest.raises(ValueError, match="kind"):
+        ledger.record("theft", "A", 1)
+    with pytest.raises(ValueError, match="positive"):
+        ledger.record("sale", "A", -1)
+
+
+def test_apply_to_overlays_tracked_skus():
+    inventory = pd.DataFrame(
+        {"sku": ["A", "B"], "qty": [1, 2], "expiry": pd.to_datetime(["2026-02-01", "2026-02-02"])}
+    )
+    ledger = StockLedger()
+    ledger.record("receipt", "A", 9, JAN[0])
+    out = ledger.apply_to(inventory)
+    assert out["qty"].tolist() == [9, 2]
+    assert out["expiry"].tolist() == [pd.Timestamp(JAN[0]), pd.Timestamp("2026-02-02")]
+    assert inventory["qty"].tolist() == [1, 2]
+
+
+def test_listener_called_once_per_sku_per_batch():
+    ledger = StockLedger()
+    calls = []
+    ledger.subscribe(lambda sku, on_hand, expiry: calls.append((sku, on_hand)))
+    ledger.record_batch([("receipt", "A", 3, JAN[0]), ("sale", "A", 1, None), ("receipt", "B", 2, JAN[1])])
+    assert calls == [("A", 2), ("B", 2)]
+
+
+def test_batch_listener_until_unsubscribed():
+    ledger = StockLedger()
+    batches = []
+    ledger.subscribe_batch(batches.append)
+    ledger.record_batch([("receipt", "A", 3, JAN[0]), ("receipt", "B", 2, JAN[1])])
+    ledger.unsubscribe_batch(batches.append)
+    ledger.record("sale", "A", 1)
+    assert batches == [["A", "B"]]
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import data
+import loaders
+from ledger import StockLedger
+
+
+def test_stock_movements_only_drop_inventory_caches(monkeypatch):
+    ledger = StockLedger.from_inventory(data.get_inventory())
+    data.set_stock_ledger(ledger)
+    cube = loaders.kpi_cube()
+    before = loaders.get_inventory()
+    calls = []
+    monkeypatch.setattr(data, "invalidate", lambda *tables: (calls.append(tables), loaders.invalidate(*tables)))
+
+    skus = before["sku"].astype(str).tolist()[:3]
+    ledger.record_batch([("sale", sku, 1, None) for sku in skus])
+
+    assert calls == [("inventory",)]
+    assert loaders.kpi_cube() is cube
+    after = loaders.get_inventory()
+    qty = dict(zip(after["sku"].astype(str), after["qty"]))
+    assert [qty[sku] for sku in skus] == [q - 1 for q in before.set_index(before["sku"].astype(str)).loc[skus, "qty"]]
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+import markdown
+from ledger import StockLedger
+
+TODAY = pd.Timestamp("2026-03-10")
+
+
+def inventory() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "sku": ["MILK-1L", "BREAD-WHT"],
+            "name": ["Milk 1L", "Bread"],
+            "qty": [20, 8],
+            "expiry": [TODAY + pd.Timedelta(days=3), TODAY + pd.Timedelta(days=2)],
+            "cost": [80.0, 40.0],
+            "price": [100.0, 60.0],
+        }
+    )
+
+
+def test_expired_lots_are_not_ahead_of_sellable_ones():
+    ledger = StockLedger()
+    ledger.record("receipt", "MILK-1L", 5, TODAY - pd.Timedelta(days=1))
+    ledger.record("receipt", "MILK-1L", 7, TODAY + pd.Timedelta(days=2))
+    ledger.record("receipt", "MILK-1L", 4, TODAY + pd.Timedelta(days=6))
+    lots = markdown.inventory_lots(inventory(), ledger, TODAY)
+    milk = lots[lots["sku"] == "MILK-1L"]
+    assert milk["days_to_expiry"].tolist() == [-1, 2, 6]
+    assert milk["ahead"].tolist() == [0, 0, 7]
+    bread = lots[lots["sku"] == "BREAD-WHT"]
+    assert bread[["qty", "ahead"]].values.tolist() == [[8, 0]]
+
+
+def test_simulate_matches_expected_sell_through():
+    lots = markdown.inventory_lots(inventory(), today=TODAY)
+    demand = pd.DataFrame({"sku": ["MILK-1L", "BREAD-WHT"], "daily_demand": [10.0, 1.0], "demand_std": [0.0, 0.0]})
+    schedules = {"No markdown": [], "50% off last day": [(1, 0.5)]}
+    out = markdown.simulate(lots, demand, schedules, n_scenarios=50, elasticity=1.0)
+    by = out.set_index(["sku", "markdown"])
+    # Deterministic demand: milk sells 10/day for 3 days and clears its 20 units
+    assert by.loc[("MILK-1L", "No markdown"), "expected_sold"] == pytest.approx(20)
+    assert by.loc[("MILK-1L", "No markdown"), "revenue"] == pytest.approx(2000)
+    # Bread: 1/day for 2 days, then the last day at half price doubles demand
+    assert by.loc[("BREAD-WHT", "No markdown"), "expected_waste"] == pytest.approx(6)
+    assert by.loc[("BREAD-WHT", "50% off last day"), "expected_sold"] == pytest.approx(3)
+    assert by.loc[("BREAD-WHT", "50% off last day"), "revenue"] == pytest.approx(60 + 2 * 30)
+
+
+def test_results_do_not_depend_on_workers():
+    lots = markdown.inventory_lots(inventory(), today=TODAY)
+    demand = pd.DataFrame({"sku": ["MILK-1L", "BREAD-WHT"], "daily_demand": [6.0, 3.0], "demand_std": [3.0, 2.0]})
+    one = markdown.simulate(lots, demand, n_scenarios=200, workers=1)
+    many = markdown.simulate(lots, demand, n_scenarios=200, workers=4)
+    pd.testing.assert_frame_equal(one, many)
+    best = markdown.best_markdowns(one)
+    assert len(best) == len(lots)
+    assert (best["margin_gain"] >= 0).all()
+
+
+def test_rejects_bad_schedules():
+    lots = markdown.inventory_lots(inventory(), today=TODAY)
+    demand = pd.DataFrame({"sku": ["MILK-1L"], "daily_demand": [1.0], "demand_std": [0.0]})
+    with pytest.raises(ValueError, match="decreasing"):
+        markdown.simulate(lots, demand, {"bad": [(1, 0.2), (3, 0.5)]})
+    with pytest.raises(ValueError, match="discounts"):
+        markdown.simulate(lots, demand, {"bad": [(2, 1.2)]})
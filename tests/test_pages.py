@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ["app.py", "pages/1_Analytics.py", "pages/2_Inventory.py", "pages/3_Suppliers.py", "pages/4_Orders.py", "pages/5_Expenses.py"]
+
+
+@pytest.fixture(autouse=True)
+def in_repo_root(monkeypatch):
+    # Pages open assets such as super.jpeg relative to the working directory
+    monkeypatch.chdir(ROOT)
+
+
+@pytest.mark.parametrize("page", PAGES)
+def test_page_renders(page):
+    at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=120).run()
+    assert not at.exception
+
+
+def test_overview_controls_rerun_the_dashboard():
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120).run()
+    days = next(s for s in at.slider if s.label == "Days window")
+    days.set_value(14).run()
+    assert not at.exception
+    assert next(s for s in at.slider if s.label == "Days window").value == 14
+    scope = next(s for s in at.selectbox if s.label == "Branch / region")
+    scope.select(scope.options[-1]).run()
+    assert not at.exception
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data
+from store import SQLiteSource, paginate_frame
+
+
+def test_paginate_frame_filters_sorts_and_slices():
+    df = pd.DataFrame({"name": list("edcbaedcba"), "qty": [5, 3, 8, 1, 9, 2, 7, 4, 6, 0]})
+    mask = df["qty"].to_numpy() > 0
+    rows, total = paginate_frame(df, mask, ["-qty"], page=1, page_size=3)
+    assert total == 9
+    assert list(rows["qty"]) == [6, 5, 4]
+    rows, _ = paginate_frame(df, None, ["name", "qty"], page=0, page_size=None)
+    assert list(zip(rows["name"], rows["qty"]))[:3] == [("a", 0), ("a", 9), ("b", 1)]
+    rows, total = paginate_frame(df, mask, ["qty"], page=5, page_size=3)
+    assert rows.empty and total == 9
+
+
+def test_paginate_frame_sorts_by_extra_and_categorical_order():
+    df = pd.DataFrame({"status": pd.Categorical(["b", None, "a", "c"], categories=["a", "b", "c"])})
+    rows, _ = paginate_frame(df, sort_by=["status"], page_size=None)
+    assert list(rows["status"].astype(object).fillna("-")) == ["a", "b", "c", "-"]
+    extra = {"score": np.array([3, 1, 2, 0])}
+    rows, _ = paginate_frame(df, sort_by=["-score"], page_size=2, extra=extra)
+    assert list(rows["score"]) == [3, 2]
+
+
+def test_pages_cover_every_match_once():
+    _, total = data.query_inventory(page_size=7)
+    pages = [data.query_inventory(page=p, page_size=7)[0] for p in range(-(-total // 7))]
+    skus = pd.concat(pages)["sku"]
+    assert len(skus) == total == skus.nunique()
+    full, _ = data.query_inventory(page_size=None)
+    assert list(skus) == list(full["sku"])
+
+
+@pytest.fixture
+def store(tmp_path) -> SQLiteSource:
+    source = SQLiteSource(str(tmp_path / "baraka.db"))
+    source.seed_demo(num_days=30)
+    return source
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"max_qty": 10},
+        {"expiry_within_days": 7, "sort_by": ("days_to_expiry", "sku")},
+        {"sort_by": ("-qty", "sku"), "page": 1, "page_size": 5},
+    ],
+)
+def test_sqlite_inventory_pages_match_the_frame_source(store, filters):
+    expected, expected_total = data.query_inventory(**filters)
+    data.set_data_source(store)
+    rows, total = data.query_inventory(**filters)
+    assert total == expected_total
+    assert list(rows["sku"].astype(str)) == list(expected["sku"].astype(str))
+    assert list(rows["days_to_expiry"]) == list(expected["days_to_expiry"])
+
+
+def test_sqlite_orders_filter_by_status(store):
+    data.set_data_source(store)
+    rows, total = data.query_orders(statuses=["Pending", "Delivered"], sort_by=("-total",), page_size=None)
+    assert 0 < total == len(rows)
+    assert set(rows["status"].astype(str)) <= {"Pending", "Delivered"}
+    assert rows["total"].is_monotonic_decreasing
+    with pytest.raises(ValueError, match="Cannot sort"):
+        data.query_orders(sort_by=("total; DROP TABLE orders",))
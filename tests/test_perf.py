@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+
+import pandas as pd
+
+import perf
+
+
+@perf.timed("test.work")
+def work(n: int) -> int:
+    return sum(range(n))
+
+
+def test_spans_are_recorded_on_the_current_rerun(monkeypatch, tmp_path):
+    log, prom = tmp_path / "reruns.jsonl", tmp_path / "baraka.prom"
+    monkeypatch.setattr(perf, "LOG_PATH", str(log))
+    monkeypatch.setattr(perf, "PROM_PATH", str(prom))
+    perf.begin_rerun("test-page", detailed=True)
+    assert perf.in_rerun()
+    work(10)
+    with perf.span("test.block"):
+        work(10)
+    perf.payload("test.table", pd.DataFrame({"x": range(100)}))
+    rerun = perf.end_rerun()
+
+    assert not perf.in_rerun() and perf.end_rerun() is None
+    assert [s.name for s in rerun.spans] == ["test.work", "test.work", "test.block", "test.table"]
+    table = perf.span_table(rerun).set_index("name")
+    assert table.loc["test.work", "calls"] == 2
+    assert table.loc["test.table", "payload_kb"] > 0
+    logged = json.loads(log.read_text().splitlines()[-1])
+    assert logged["page"] == "test-page" and len(logged["spans"]) == 4
+    text = prom.read_text()
+    assert 'baraka_rerun_seconds_count{page="test-page"}' in text
+    assert 'baraka_payload_bytes_total{name="test.table"}' in text
+
+
+def test_payload_is_only_measured_when_detailed(monkeypatch):
+    monkeypatch.setattr(perf, "DETAILED", False)
+    monkeypatch.setattr(perf, "LOG_PATH", None)
+    monkeypatch.setattr(perf, "PROM_PATH", None)
+    perf.begin_rerun("quiet-page")
+    perf.payload("test.quiet", "x" * 1000)
+    assert perf.end_rerun().spans == []
+
+
+def test_payload_size():
+    df = pd.DataFrame({"x": range(10)})
+    assert perf.payload_size(df) == df.memory_usage(index=True, deep=True).sum()
+    assert perf.payload_size(df.style) == perf.payload_size(df)
+    assert perf.payload_size(b"abc") == 3
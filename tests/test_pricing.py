@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pricing
+import utils
+
+
+def row_rule(qty, days_to_expiry) -> str:
+    """The row-by-row rules the engine replaced."""
+    if qty == 0:
+        return "Out of stock"
+    if days_to_expiry < 2:
+        return "Recommend 15% discount (near expiry)"
+    if qty > 100:
+        return "Recommend 5% discount (overstock)"
+    if qty < 5 and days_to_expiry > 14:
+        return "Consider +5% price (fast-moving)"
+    return "Keep price"
+
+
+def test_default_rules_match_the_row_rules():
+    rng = np.random.default_rng(0)
+    qty = rng.integers(0, 150, 2_000)
+    days = rng.integers(-5, 40, 2_000).astype(float)
+    days[::50] = np.nan  # missing expiry
+    labels, changes = pricing.apply_rules({"qty": qty, "days_to_expiry": days})
+    assert list(labels) == [row_rule(q, d) for q, d in zip(qty, days)]
+    assert set(changes[labels == "Recommend 15% discount (near expiry)"]) == {-15.0}
+
+
+def test_priority_then_order_decides_and_default_applies():
+    rules = [
+        {"name": "low", "when": [["qty", "<", 10]], "recommendation": "low", "price_change_pct": 1},
+        {"name": "tiny", "when": [["qty", "<", 3]], "recommendation": "tiny", "price_change_pct": 2, "priority": -1},
+    ]
+    labels, changes = pricing.apply_rules({"qty": np.array([1, 5, 50])}, rules, {"recommendation": "none", "price_change_pct": 0})
+    assert list(labels) == ["tiny", "low", "none"]
+    assert list(changes) == [2, 1, 0]
+    labels, _ = pricing.apply_rules({"qty": np.array([1])}, [])
+    assert list(labels) == ["Keep price"]
+
+
+def test_load_rules_from_json_and_toml(tmp_path):
+    rule = {"name": "clear", "when": [["qty", ">=", 10]], "recommendation": "Clear", "price_change_pct": -20}
+    (tmp_path / "rules.json").write_text(json.dumps({"rules": [rule]}))
+    (tmp_path / "rules.toml").write_text(
+        '[[rules]]\nname = "clear"\nwhen = [["qty", ">=", 10]]\nrecommendation = "Clear"\nprice_change_pct = -20\n'
+        '[default]\nrecommendation = "Hold"\nprice_change_pct = 0\n'
+    )
+    assert pricing.load_rules(str(tmp_path / "rules.json")) == ([rule], pricing.DEFAULT_RECOMMENDATION)
+    rules, default = pricing.load_rules(str(tmp_path / "rules.toml"))
+    assert rules == [rule] and default["recommendation"] == "Hold"
+    (tmp_path / "bad.json").write_text(json.dumps({"rules": [{**rule, "when": [["qty", "~", 1]]}]}))
+    with pytest.raises(ValueError, match="unknown operator"):
+        pricing.load_rules(str(tmp_path / "bad.json"))
+
+
+def test_recommendations_for_inventory():
+    today = pd.Timestamp.today().normalize()
+    inventory = pd.DataFrame(
+        {
+            "sku": ["A", "B", "C"],
+            "name": ["a", "b", "c"],
+            "qty": [0, 20, 200],
+            "expiry": [today + pd.Timedelta(days=30), today + pd.Timedelta(days=1), pd.NaT],
+        }
+    )
+    out = utils.dynamic_pricing_recommendations(inventory)
+    assert list(out["recommendation"]) == ["Out of stock", "Recommend 15% discount (near expiry)", "Recommend 5% discount (overstock)"]
+    assert list(out["price_change_pct"]) == [0, -15, -5]
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import math
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+import replenishment
+
+
+def sales(units_by_sku: dict, days: int = 10) -> pd.DataFrame:
+    dates = pd.date_range("2024-01-01", periods=days)
+    rows = [
+        {"date": d, "sku": sku, "units": units[i]}
+        for sku, units in units_by_sku.items()
+        for i, d in enumerate(dates)
+        if units[i]  # days without a sale have no row
+    ]
+    return pd.DataFrame(rows)
+
+
+def test_demand_stats_count_days_without_sales_as_zero():
+    stats = replenishment.demand_stats(sales({"A": [4] * 10, "B": [10, 0, 0, 0, 0, 0, 0, 0, 0, 10]})).set_index("sku")
+    assert stats.loc["A", "daily_demand"] == 4 and stats.loc["A", "demand_std"] == 0
+    assert stats.loc["B", "daily_demand"] == 2
+    assert np.isclose(stats.loc["B", "demand_std"], np.std([10] + [0] * 8 + [10], ddof=1))
+
+
+def test_plan_reorder_point_and_order_quantity():
+    inventory = pd.DataFrame(
+        {
+            "sku": ["A", "B", "C"],
+            "qty": [5, 500, 5],
+            "cost": [4000, 4000, 4000],
+            "supplier": ["Fast", "Fast", "Unknown"],
+        }
+    )
+    suppliers = pd.DataFrame({"name": ["Fast"], "avgLeadDays": [3]})
+    history = sales({"A": [10, 14] * 5, "B": [10, 14] * 5, "C": [10, 14] * 5})
+    out = replenishment.plan(inventory, suppliers, history).set_index("sku")
+
+    d, sd = 12.0, np.std([10, 14] * 5, ddof=1)
+    safety = NormalDist().inv_cdf(replenishment.SERVICE_LEVEL) * math.sqrt(3 * sd**2)
+    assert out.loc["A", "reorder_point"] == math.ceil(d * 3 + safety)
+    eoq = math.sqrt(2 * d * 365 * replenishment.ORDER_COST / (replenishment.HOLDING_RATE * 4000))
+    assert out.loc["A", "order_qty"] == math.ceil(eoq)
+    assert out.loc["B", "order_qty"] == 0  # well stocked
+    assert out.loc["C", "lead_days"] == replenishment.DEFAULT_LEAD_DAYS
+    assert out.loc["A", "days_of_cover"] == round(5 / d, 1)
+
+
+def test_on_order_stock_counts_towards_the_position():
+    inventory = pd.DataFrame({"sku": ["A"], "qty": [5], "on_order": [1_000], "cost": [4000], "supplier": ["Fast"]})
+    suppliers = pd.DataFrame({"name": ["Fast"], "avgLeadDays": [3]})
+    out = replenishment.plan(inventory, suppliers, sales({"A": [12] * 10}))
+    assert out["order_qty"].iloc[0] == 0
+
+
+def test_purchase_orders_group_lines_by_supplier_most_urgent_first():
+    planned = pd.DataFrame(
+        {
+            "sku": ["A", "B", "C", "D"],
+            "supplier": ["X", "X", "Y", "Y"],
+            "order_qty": [10, 5, 3, 0],
+            "order_value": [100.0, 50.0, 30.0, 0.0],
+            "days_of_cover": [4.0, 2.0, 1.0, 0.5],
+        }
+    )
+    orders = replenishment.purchase_orders(planned)
+    assert list(orders["supplier"]) == ["Y", "X"]
+    assert orders.set_index("supplier").loc["X", ["lines", "units", "value"]].tolist() == [2, 15, 150.0]
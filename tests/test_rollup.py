@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rollup import CHAIN, KpiCube, daily_totals, expense_shares
+
+
+def branches(shares) -> pd.DataFrame:
+    stores = [f"S{i}" for i in range(len(shares))]
+    return pd.DataFrame({"store": stores, "region": ["North", "North", "South", "South"][: len(shares)], "expense_share": shares})
+
+
+@pytest.mark.parametrize(
+    "shares, expected",
+    [
+        ([0.5, 0.3, np.nan, np.nan], [0.5, 0.3, 0.1, 0.1]),
+        ([0.7, 0.6, np.nan], [0.7 / 1.3, 0.6 / 1.3, 0.0]),
+        ([np.nan, np.nan], [0.5, 0.5]),
+        ([0.2, 0.2], [0.5, 0.5]),
+    ],
+)
+def test_expense_shares_sum_to_one(shares, expected):
+    np.testing.assert_allclose(expense_shares(branches(shares)), expected)
+
+
+def sales(days: int = 10) -> pd.DataFrame:
+    dates = pd.date_range("2026-01-01", periods=days, freq="D")
+    rows = [(d + pd.Timedelta(hours=h), s, 10.0 * (i + 1)) for d in dates for i, s in enumerate(["S0", "S1", "S2"]) for h in (9, 17)]
+    return pd.DataFrame(rows, columns=["date", "store", "revenue"])
+
+
+def test_daily_totals_adds_partitions():
+    frame = sales()
+    totals = daily_totals([frame.iloc[:25], frame.iloc[25:]], workers=1)
+    assert len(totals) == 30
+    assert totals["revenue"].sum() == frame["revenue"].sum()
+
+
+def test_windows_match_direct_sums():
+    frame = sales()
+    cube = KpiCube.build(frame, branches([0.5, np.nan, np.nan]), pd.DataFrame({"amount": [3000.0]}))
+    assert cube.window(3)["revenue"] == 3 * (20 + 40 + 60)
+    assert cube.window(3, "North")["revenue"] == 3 * (20 + 40)
+    assert cube.window(2, "S2", end=pd.Timestamp("2026-01-05"))["revenue"] == 2 * 60
+    # 3000 a month is 100 a day, allocated exactly once across the branches
+    assert cube.window(10)["expenses"] == pytest.approx(1000)
+    assert sum(cube.window(10, s)["expenses"] for s in ["S0", "S1", "S2"]) == pytest.approx(1000)
+    assert cube.series(4, "S0")["revenue"].tolist() == [20.0] * 4
+    assert cube.rollup(10, by="region")["region"].tolist() == ["North", "South"]
+    with pytest.raises(KeyError):
+        cube.window(3, "Nowhere")
+    assert CHAIN in cube.scopes()
+
+
+def test_no_sales_build_an_empty_cube():
+    empty = sales().iloc[:0]
+    cube = KpiCube.build(empty, branches([0.5, 0.5]), pd.DataFrame({"amount": [3000.0]}))
+    assert len(cube.dates) == 0
+    assert cube.window(30) == {"revenue": 0.0, "expenses": 0.0, "profit": 0.0}
+    assert cube.series(30, "S0").empty
+    assert cube.rollup(30)["revenue"].tolist() == [0.0, 0.0]
+    assert len(KpiCube.build([], branches([0.5, 0.5]), pd.DataFrame({"amount": [0.0]})).dates) == 0
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from schema import conform, to_minor_units, validate
+
+
+def sales(**overrides) -> pd.DataFrame:
+    frame = {
+        "date": ["2026-01-05 10:30", "2026-01-05 18:00", "2026-01-06 09:15"],
+        "store": ["Main", "Westlands", "Main"],
+        "sku": ["MILK-1L", "BREAD-WHT", "MILK-1L"],
+        "units": [2, 1, 3],
+        "revenue": [9950, 4525, 15075],
+    }
+    frame.update(overrides)
+    return pd.DataFrame(frame)
+
+
+def test_money_is_integer_minor_units():
+    out = conform("sales_detail", sales(revenue=[9950.0, 4525.0, 15075.0]))
+    assert out["revenue"].dtype == np.int32
+    assert out["revenue"].tolist() == [9950, 4525, 15075]
+    assert conform("sales_detail", sales(revenue=[1, 2, 3 * 10**10]))["revenue"].dtype == np.int64
+    suppliers = conform("suppliers", pd.DataFrame({"lastPrice": [7800, None], "avgLeadDays": [2, 3]}))
+    assert suppliers["lastPrice"].dtype == "Int32"
+    for bad in ([99.5, 45, 150], [1, 2, np.inf]):
+        with pytest.raises(ValueError, match="whole minor units"):
+            conform("sales_detail", sales(revenue=bad))
+    assert to_minor_units(pd.Series([99.5, 0.29, 1234.565])).tolist() == [9950, 29, 123456]
+
+
+def test_compact_dtypes():
+    out = conform("sales_detail", sales())
+    assert isinstance(out["sku"].dtype, pd.CategoricalDtype)
+    assert out["sku"].cat.categories.tolist() == ["BREAD-WHT", "MILK-1L"]
+    assert out["units"].dtype == np.int32
+    assert out["date"].dtype == "datetime64[s]"
+    assert out["date"].iloc[0] == pd.Timestamp("2026-01-05 10:30")
+
+
+def test_day_truncates_and_drops_timezone():
+    stamps = pd.Series(pd.to_datetime(["2026-01-05 23:30", None]).tz_localize("Africa/Nairobi"))
+    out = conform("branch_sales", pd.DataFrame({"date": stamps.fillna(stamps[0]), "store": ["Main"] * 2, "revenue": [1.0, 2.0]}))
+    assert out["date"].tolist() == [pd.Timestamp("2026-01-05")] * 2
+    inventory = pd.DataFrame(
+        {"sku": ["A"], "category": [None], "qty": [1], "expiry": [None], "cost": [150], "price": [200], "supplier": [None]}
+    )
+    assert conform("inventory", inventory)["expiry"].isna().all()
+
+
+def test_validate_reports_every_problem():
+    problems = validate("sales_detail", sales(units=[1, None, 2 ** 40]).drop(columns="store"))
+    assert any("store: missing column" in p for p in problems)
+    assert any("units: 1 missing values" in p for p in problems)
+    with pytest.raises(ValueError, match="do not fit int32"):
+        conform("sales_detail", sales(units=[1, 2, 2 ** 40]))
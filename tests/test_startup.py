@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import cache
+import loaders
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("module", ["data", "utils", "loaders", "charts"])
+def test_compute_modules_do_not_import_the_ui_stack(module):
+    code = f"import sys, {module}; print([m for m in ('streamlit', 'plotly') if m in sys.modules])"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+def test_warm_up_fills_the_caches_pages_read():
+    seconds = loaders.warm_up()
+    assert list(seconds) == [name for name, _ in loaders.WARM_UP]
+    misses = {name: stats["misses"] for name, stats in cache.cache_stats().items()}
+    # The pages' first calls are now hits
+    loaders.kpi_cube()
+    loaders.query_inventory(sort_by=("name",), page=0, page_size=25)
+    after = {name: stats["misses"] for name, stats in cache.cache_stats().items()}
+    assert after == misses
+
+
+def test_warm_up_tries_every_step_and_names_failures(monkeypatch):
+    calls = []
+
+    def broken():
+        raise OSError("store offline")
+
+    steps = [("first", lambda: calls.append("first")), ("broken", broken), ("last", lambda: calls.append("last"))]
+    monkeypatch.setattr(loaders, "WARM_UP", steps)
+    with pytest.raises(RuntimeError, match="broken") as error:
+        loaders.warm_up()
+    assert calls == ["first", "last"]
+    assert isinstance(error.value.__cause__, OSError)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from store import SQLiteSource
+
+
+@pytest.fixture
+def store(tmp_path) -> SQLiteSource:
+    source = SQLiteSource(str(tmp_path / "baraka.db"))
+    source.seed_demo(num_days=30)
+    return source
+
+
+def count(store: SQLiteSource, table: str) -> int:
+    return int(store.query(f"SELECT COUNT(*) AS n FROM {table}")["n"].iloc[0])
+
+
+def test_seed_demo_twice_replaces_rather_than_appends(store):
+    tables = ["sales", "inventory", "orders", "expenses"]
+    before = {t: count(store, t) for t in tables}
+    revenue = store.get_sales_by_day(30)["revenue"].sum()
+    store.seed_demo(num_days=30)
+    assert {t: count(store, t) for t in tables} == before
+    assert store.get_sales_by_day(30)["revenue"].sum() == revenue
+
+
+def test_load_frame_replaces_keyed_rows(store):
+    store.load_frame("orders", pd.DataFrame({"id": ["ORD-1001"], "customer": ["X"], "items": [1], "total": [950], "status": ["Delivered"]}))
+    orders = store.get_orders().set_index("id")
+    assert orders.loc["ORD-1001", "status"] == "Delivered"
+    assert count(store, "orders") == len(orders)
+
+
+def test_load_csv_stores_shillings_as_minor_units(store, tmp_path):
+    path = tmp_path / "expenses.csv"
+    path.write_text("type,amount\nInsurance,2500\nWater,1234.56\n")
+    store.load_csv("expenses", str(path))
+    amounts = store.get_expenses().set_index("type")["amount"]
+    assert amounts["Insurance"] == 250_000 and amounts["Water"] == 123_456
+    assert set(store.query("SELECT typeof(amount) AS t FROM expenses")["t"]) == {"integer"}
+
+
+def test_sales_detail_filters_by_catalogue_of_any_size(store):
+    inventory = store.get_inventory()
+    expected = store.get_sales_detail(30, skus=inventory)
+    assert len(expected) and set(expected["sku"].astype(str)) <= set(inventory["sku"])
+    # Builds differ (32766 by default, some raise it); hold this connection to the default
+    store.connect().setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 32766)
+    catalogue = pd.DataFrame({"sku": list(inventory["sku"]) + [f"X-{i}" for i in range(100_000)]})
+    out = store.get_sales_detail(30, skus=catalogue)
+    pd.testing.assert_frame_equal(out, expected)
+    one = store.get_sales_detail(30, stores=["Main"], skus=inventory.iloc[:1])
+    assert set(one["sku"].astype(str)) == {inventory["sku"].iloc[0]}
+    assert set(one["store"].astype(str)) == {"Main"}
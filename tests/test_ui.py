@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import os
+import shutil
+
+import pandas as pd
+from PIL import Image
+
+import ui
+
+
+def test_brand_css_follows_background_image_changes(tmp_path):
+    image = tmp_path / "bg.jpeg"
+    Image.new("RGB", (64, 48), "red").save(image)
+    first = ui.brand_css(str(image), True)
+    assert ui.brand_css(str(image), True) == first
+
+    Image.new("RGB", (64, 48), "blue").save(image)
+    stat = os.stat(image)
+    os.utime(image, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    second = ui.brand_css(str(image), True)
+    assert second != first
+    assert "app/static/" in second
+    shutil.rmtree(tmp_path / "static")
+
+
+def test_brand_css_without_image():
+    css = ui.brand_css(None)
+    assert "<style>" in css and "background-image" not in css
+    assert "background-image" not in ui.brand_css("missing.jpeg")
+
+
+def test_shillings_scales_only_the_money_columns():
+    assert ui.shillings(123456) == 1234.56
+    orders = pd.DataFrame({"items": [2], "total": [19999]})
+    shown = ui.shillings(orders, ["total", "value"])
+    assert shown["total"].tolist() == [199.99] and shown["items"].tolist() == [2]
+    assert orders["total"].tolist() == [19999]
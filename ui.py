@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import base64
+import functools
+import hashlib
+import io
+import os
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, Sequence, Tuple
+import pandas as pd
+import streamlit as st
+
+import perf
+from cache import cache_stats
+from export import FORMATS, export_file
+from schema import MINOR_UNITS
+
+
+def paged(fetch: Callable[[int, int], Tuple[pd.DataFrame, int]], key: str, page_size: int = 50) -> pd.DataFrame:
+    """Fetch and return only the current page, rendering a page picker and row count.
+
+    ``fetch(page, page_size)`` returns ``(rows, total)`` with a 0-based page, e.g. a
+    ``loaders.query_*`` call with the filters bound.
+    """
+    page = int(st.session_state.get(key, 1))
+    rows, total = fetch(page - 1, page_size)
+    pages = max(1, -(-total // page_size))
+    if page > pages:
+        # Filters shrank the result below the page we were on
+        page = pages
+        st.session_state[key] = page
+        rows, total = fetch(page - 1, page_size)
+
+    col1, col2 = st.columns([1, 4], vertical_alignment="bottom")
+    with col1:
+        st.number_input("Page", min_value=1, max_value=pages, step=1, key=key)
+    with col2:
+        first = (page - 1) * page_size + 1 if total else 0
+        st.caption(f"Showing {first:,}–{first + len(rows) - 1 if total else 0:,} of {total:,}")
+    return rows
+
+
+def export_button(label: str, chunks: Callable[[], Iterable[pd.DataFrame]], basename: str, key: str) -> None:
+    """Download control that builds the file only when asked, streamed chunk by chunk.
+
+    ``chunks`` is called on click (never on ordinary reruns) and should yield DataFrames,
+    e.g. ``lambda: export.frame_chunks(df)`` or ``lambda: export.query_chunks(fetch)``.
+    """
+    with st.popover(label):
+        fmt = st.radio("Format", list(FORMATS), key=f"{key}_format", horizontal=True)
+        if st.button("Prepare file", key=f"{key}_prepare"):
+            ext, mime = FORMATS[fmt]
+            with st.spinner("Preparing export…"):
+                data = export_file(chunks(), fmt)
+            st.download_button(f"Download {basename}.{ext}", data, f"{basename}.{ext}", mime, key=f"{key}_download")
+
+
+def begin_profile(page: str) -> None:
+    """Start timing this rerun; pair with ``debug_panel()`` at the end of the script."""
+    perf.begin_rerun(page, detailed=bool(st.session_state.get("perf_debug")))
+
+
+def fragment(page: str, name: str, run_every: float | timedelta | None = None) -> Callable[[Callable], Callable]:
+    """``st.experimental_fragment`` that is profiled on its own when it reruns alone.
+
+    Inside a full run the section is one span of the page's profile; when one of its
+    widgets reruns just the fragment, that rerun is logged as ``page:name`` and, with
+    timings toggled on, its duration is shown at the end of the section.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def body(*args, **kwargs):
+            if perf.in_rerun():
+                with perf.span(f"fragment.{name}"):
+                    return func(*args, **kwargs)
+            begin_profile(f"{page}:{name}")
+            try:
+                return func(*args, **kwargs)
+            finally:
+                rerun = perf.end_rerun()
+                if st.session_state.get("perf_debug") and rerun is not None:
+                    st.caption(f"⏱ {name} rerun: {rerun.seconds * 1000:,.0f} ms")
+
+        return st.experimental_fragment(body, run_every=run_every)
+
+    return decorator
+
+
+def shillings(money: Any, columns: Sequence[str] = ()) -> Any:
+    """Minor-unit amounts as shillings for display: a number or Series, or ``columns`` of a frame.
+
+    Money stays in integer minor units everywhere else; this is the one place it is scaled.
+    """
+    if isinstance(money, pd.DataFrame):
+        return money.assign(**{column: money[column] / MINOR_UNITS for column in columns if column in money})
+    return money / MINOR_UNITS
+
+
+def show_dataframe(df: Any, name: str, **kwargs) -> None:
+    """``st.dataframe`` with its serialization time and payload size recorded as ``name``."""
+    with perf.span(f"render.{name}"):
+        st.dataframe(df, **kwargs)
+    perf.payload(f"render.{name}", df)
+
+
+def show_chart(fig: Any, name: str, **kwargs) -> None:
+    """``st.plotly_chart`` with its serialization time and payload size recorded as ``name``."""
+    with perf.span(f"render.{name}"):
+        st.plotly_chart(fig, **kwargs)
+    perf.payload(f"render.{name}", fig)
+
+
+def debug_panel() -> None:
+    """Close the rerun profile and, when toggled on, show it with the cache counters."""
+    rerun = perf.end_rerun()
+    if not st.sidebar.toggle("Show timings", key="perf_debug") or rerun is None:
+        return
+    with st.sidebar.expander("Rerun profile", expanded=True):
+        st.caption(f"{rerun.page}: {rerun.seconds * 1000:,.0f} ms, {len(rerun.spans)} spans")
+        st.dataframe(perf.span_table(rerun), use_container_width=True, hide_index=True)
+        st.caption("Cache")
+        st.dataframe(pd.DataFrame.from_dict(cache_stats(), orient="index"), use_container_width=True)
+
+
+# Background variants: (suffix, max width px, JPEG quality). Mobile gets a smaller,
+# lower-quality file since it sits under a 85-92% white overlay anyway.
+BACKGROUND_VARIANTS = [("desktop", 1920, 75), ("mobile", 768, 60)]
+GRADIENT = "linear-gradient(rgba(255,255,255,0.85), rgba(255,255,255,0.92))"
+
+
+@functools.lru_cache(maxsize=8)
+def _background_assets(image_path: str, mtime_ns: int) -> Dict[str, str]:
+    """Write resized, recompressed variants of the background into ``./static``.
+
+    Files are named by content hash so browsers can cache them indefinitely; runs once per
+    process (and again only if the source image changes).
+    """
+    from PIL import Image
+
+    with open(image_path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()[:12]
+    static_dir = os.path.join(os.path.dirname(os.path.abspath(image_path)), "static")
+    os.makedirs(static_dir, exist_ok=True)
+    files = {}
+    for suffix, max_width, quality in BACKGROUND_VARIANTS:
+        name = f"bg-{digest}-{suffix}.jpg"
+        target = os.path.join(static_dir, name)
+        if not os.path.exists(target):
+            with Image.open(io.BytesIO(raw)) as img:
+                img = img.convert("RGB")
+                if img.width > max_width:
+                    img = img.resize((max_width, round(img.height * max_width / img.width)), Image.LANCZOS)
+                img.save(target, "JPEG", quality=quality, optimize=True, progressive=True)
+        files[suffix] = target
+    return files
+
+
+def brand_css(background_image_path: str | None = None, static_serving: bool = True) -> str:
+    """The theme's ``<style>`` block, built once per process and background image version.
+
+    With Streamlit static serving the background is referenced by URL (fetched once and
+    cached by the browser); otherwise the recompressed image is inlined as base64.
+    Replacing the image file rebuilds the block on the next call.
+    """
+    try:
+        mtime_ns = os.stat(background_image_path).st_mtime_ns if background_image_path else None
+    except OSError:
+        mtime_ns = None
+    return _brand_css(background_image_path, mtime_ns, static_serving)
+
+
+@functools.lru_cache(maxsize=8)
+def _brand_css(background_image_path: str | None, mtime_ns: int | None, static_serving: bool) -> str:
+    bg_css = ""
+    if background_image_path and mtime_ns is not None:
+        try:
+            assets = _background_assets(background_image_path, mtime_ns)
+        except Exception:
+            assets = None
+        if assets and static_serving:
+            desktop, mobile = (f"app/static/{os.path.basename(assets[k])}" for k in ("desktop", "mobile"))
+            bg_css = (
+                f".stApp {{ background-image: {GRADIENT}, url('{desktop}'); background-size: cover; "
+                "background-attachment: fixed; background-position: center; }\n"
+                f"@media (max-width: 768px) {{ .stApp {{ background-image: {GRADIENT}, url('{mobile}'); }} }}"
+            )
+        elif assets:
+            with open(assets["desktop"], "rb") as f:
+                b64_img = base64.b64encode(f.read()).decode()
+            bg_css = (
+                f".stApp {{ background-image: {GRADIENT}, url('data:image/jpeg;base64,{b64_img}'); "
+                "background-size: cover; background-attachment: fixed; background-position: center; }"
+            )
+
+    return f"""
+        <style>
+        {bg_css}
+        /* Card polish */
+        .stMetric, div[role='group'] > div {{ background: rgba(255,255,255,0.85); }}
+        .stDataFrame, .stPlotlyChart {{ background: rgba(255,255,255,0.92); border-radius: 12px; }}
+        /* Sidebar translucency */
+        section[data-testid='stSidebar'] > div {{ backdrop-filter: blur(4px); background: rgba(255,255,255,0.85); }}
+        </style>
+        """
+
+
+def apply_brand_theme(background_image_path: str | None = None) -> None:
+    """Apply a branded CSS theme with an optional background image.
+
+    Uses a subtle white gradient overlay so text remains readable on mobile and desktop.
+    """
+    static_serving = bool(st.get_option("server.enableStaticServing"))
+    st.markdown(brand_css(background_image_path, static_serving), unsafe_allow_html=True)